@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Benchmark the notice pipeline end to end, offline.
+
+Recorded Florida Public Notices API pages and sample PDFs are replayed from
+a fixture directory (benchmarks/fixtures/ by default) in place of the
+network, and every stage of the 6-hourly job is timed separately:
+
+    fetch       paging through the replayed API responses
+    parse       parse_notice over every notice (field extraction included)
+    classify    the meeting body classifier's share of `parse`
+    merge       merging into fresh per-category notice stores
+    thumbnails  download (replayed) and render of the sample PDFs
+    html        current and monthly archive pages for every category
+    rss         current and archive RSS/Atom/JSON feeds
+    search      the static search index
+    blog        a cold build of posts/, then a no-op rebuild (blog_noop)
+
+Everything is written to a temporary directory; the repository's data/ and
+docs/ are never touched. Results are emitted as JSON so runs can be compared
+between commits:
+
+    python benchmarks/bench_pipeline.py run --scale 10000 --output before.json
+    python benchmarks/bench_pipeline.py run --scale 10000 --output after.json
+    python benchmarks/bench_pipeline.py compare before.json after.json
+
+Fixtures:
+
+    fixtures/api_pages/*.json  API response bodies, replayed in name order
+    fixtures/pdfs/*.pdf        PDFs served for the notices' pdf_url, in turn
+
+Record them from the live API with `record`. Without recorded pages, the
+notices archived in the data/notices/ stores are turned back into API responses.
+With --scale N, the notices are repeated under fresh IDs and spread over
+earlier months until there are N of them, to simulate a long archive.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import generate_blog
+import http_client
+from instrumentation import peak_rss_mb
+import search_index
+import update_notices
+from notice_store import open_store
+from publicnotices import extract_raw_notices, get_kissimmee_planning_advisory_board_docs, iter_kissimmee_notices
+from thumbnails import generate_thumbnails
+
+
+FIXTURES_DIR = PROJECT_ROOT / "benchmarks" / "fixtures"
+PAGE_SIZE = 100
+
+
+def _response(url, status_code=200, content=b''):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+def load_raw_notices(fixtures_dir):
+    """Return the raw API notices of the recorded pages, or rebuilt from data/notices/ if there are none."""
+    pages_dir = Path(fixtures_dir) / "api_pages"
+    page_files = sorted(pages_dir.glob("*.json")) if pages_dir.exists() else []
+    if page_files:
+        raw_notices = []
+        for page_file in page_files:
+            with open(page_file, "r", encoding="utf-8") as f:
+                raw_notices.extend(extract_raw_notices(json.load(f)))
+        return raw_notices, "recorded"
+
+    raw_notices = []
+    for category in update_notices.KNOWN_CATEGORIES:
+        for notice in open_store(PROJECT_ROOT / "data" / "notices", category).iter_notices():
+            raw_notices.append({
+                "id": notice["id"],
+                "notice": notice.get("notice_text", ""),
+                "subcategory": notice.get("subcategory"),
+                "paper": notice.get("newspaper"),
+                "city": notice.get("city"),
+                "date": notice.get("pub_date"),
+                "image": "pdf",
+                "_links": {
+                    "self": {"href": (notice.get("link") or "").replace("https://floridapublicnotices.com", "")},
+                    "media": {"href": notice.get("pdf_url")},
+                },
+            })
+    raw_notices.sort(key=lambda n: n.get("date") or "", reverse=True)
+    return raw_notices, "archive"
+
+
+def _months_earlier(pub_date, months):
+    try:
+        day = date.fromisoformat(pub_date)
+    except (TypeError, ValueError):
+        return pub_date
+    month_index = day.year * 12 + day.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, min(day.day, 28)).isoformat()
+
+
+def scale_notices(raw_notices, count):
+    """Repeat `raw_notices` under fresh IDs, each copy a year further back, until there are `count`."""
+    if not raw_notices or count <= len(raw_notices):
+        return raw_notices[:count] if count else raw_notices
+    scaled = []
+    copy = 0
+    while len(scaled) < count:
+        for notice in raw_notices[:count - len(scaled)]:
+            scaled.append({
+                **notice,
+                "id": int(notice["id"]) + copy * 100_000_000 if copy else notice["id"],
+                "date": _months_earlier(notice.get("date"), copy * 12),
+            })
+        copy += 1
+    return scaled
+
+
+class Replay:
+    """Serve API pages and PDFs from memory in place of http_client.post/get."""
+
+    def __init__(self, raw_notices, pdfs):
+        self.raw_notices = raw_notices
+        self.pdfs = pdfs
+        self.pdf_urls = {}
+        self.requests = 0
+
+    def post(self, url, json=None, **kwargs):
+        self.requests += 1
+        offset = (json or {}).get("offset") or 0
+        limit = (json or {}).get("limit") or PAGE_SIZE
+        body = {"_embedded": {"notices": self.raw_notices[offset:offset + limit]}}
+        return _response(url, content=_dumps(body))
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        if url not in self.pdf_urls:
+            if not self.pdfs:
+                return _response(url, 404)
+            self.pdf_urls[url] = self.pdfs[len(self.pdf_urls) % len(self.pdfs)]
+        return _response(url, content=self.pdf_urls[url])
+
+
+def _dumps(value):
+    return json.dumps(value).encode("utf-8")
+
+
+class Stages:
+    """Collect per-stage wall-clock timings and counts."""
+
+    def __init__(self, quiet=True):
+        self.results = {}
+        self.quiet = quiet
+
+    @contextlib.contextmanager
+    def stage(self, name, **counts):
+        result = dict(counts)
+        sink = io.StringIO() if self.quiet else sys.stdout
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(sink):
+                yield result
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = round(time.perf_counter() - start, 4)
+        result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        self.results[name] = result
+        print(f"  {name:<11} {result['seconds']:9.3f} s{'  (' + result['error'] + ')' if 'error' in result else ''}",
+              file=sys.stderr)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(fixtures_dir, scale=None, max_pdfs=None, quiet=True):
+    """
+    Run every pipeline stage once against the fixtures.
+
+    Returns:
+        dict: Run metadata and {stage: {"seconds", "peak_rss_mb", counts...}}
+    """
+    raw_notices, source = load_raw_notices(fixtures_dir)
+    if scale:
+        raw_notices = scale_notices(raw_notices, scale)
+    pdf_dir = Path(fixtures_dir) / "pdfs"
+    pdfs = [path.read_bytes() for path in sorted(pdf_dir.glob("*.pdf"))] if pdf_dir.exists() else []
+    replay = Replay(raw_notices, pdfs)
+    http_client.post, http_client.get = replay.post, replay.get
+    update_notices.parse_notice.debug_printed = True
+
+    stages = Stages(quiet)
+    print(f"Benchmarking {len(raw_notices)} notices ({source}), {len(pdfs)} sample PDFs", file=sys.stderr)
+    work_dir = tempfile.mkdtemp(prefix="kissimmee-bench-")
+    try:
+        data_dir = os.path.join(work_dir, "data", "notices")
+        docs_dir = os.path.join(work_dir, "docs")
+        templates_dir = str(PROJECT_ROOT / "templates")
+        os.makedirs(data_dir)
+        updated_time = datetime.now(timezone.utc)
+        manifest = {"outputs": {}}
+
+        with stages.stage("fetch") as result:
+            fetched = list(iter_kissimmee_notices(page_size=PAGE_SIZE))
+            result.update(notices=len(fetched), requests=replay.requests)
+
+        timings = {}
+        with stages.stage("parse") as result:
+            notices = update_notices.parse_notices(fetched, timings)
+            result.update(notices=len(notices), extractors={k: round(v, 4) for k, v in timings.items()})
+        stages.results["classify"] = {"seconds": round(timings.get("meeting_body", 0.0), 4)}
+
+        with stages.stage("merge") as result:
+            categories = update_notices.group_notices_by_category(notices)
+            archives = {}
+            for key, data in categories.items():
+                store = open_store(data_dir, key)
+                update_notices.merge_notices(store, data["notices"])
+                archives[key] = {"name": data["name"], "current": data["notices"],
+                                 "all": sorted(store.iter_notices(), key=lambda n: n.get("pub_date") or "", reverse=True)}
+            result.update(categories=len(archives))
+
+        with stages.stage("thumbnails") as result:
+            sample = [n for n in notices if n.get("pdf_url")][:max_pdfs if max_pdfs is not None else len(pdfs)]
+            if sample:
+                report = generate_thumbnails(sample, os.path.join(docs_dir, "thumbnails"), cache={})
+                result.update(pdfs=len(sample), rendered=sum(r["status"] == "ok" for r in report.values()))
+            else:
+                result.update(pdfs=0, skipped="no fixture PDFs")
+
+        with stages.stage("html") as result:
+            pages = 0
+            for key, archive in archives.items():
+                category_dir = os.path.join(docs_dir, "notices", key)
+                os.makedirs(category_dir, exist_ok=True)
+                update_notices.generate_static_html(
+                    archive["current"], os.path.join(templates_dir, "pab.html"),
+                    os.path.join(category_dir, "index.html"), updated_time, archive["name"])
+                pages += 1 + len(update_notices.generate_archive_pages(
+                    archive["all"], category_dir, templates_dir, updated_time, archive["name"], manifest))
+            result.update(outputs=pages, bytes=_tree_size(os.path.join(docs_dir, "notices")))
+
+        with stages.stage("rss") as result:
+            for key, archive in archives.items():
+                category_dir = os.path.join(docs_dir, "notices", key)
+                update_notices.generate_rss(
+                    archive["current"], {fmt: os.path.join(category_dir, name) for fmt, name in update_notices.FEED_FILES.items()},
+                    updated_time, archive["name"])
+                update_notices.generate_rss(
+                    archive["all"], {fmt: os.path.join(category_dir, name) for fmt, name in update_notices.ARCHIVE_FEED_FILES.items()},
+                    updated_time, archive["name"], include_thumbnails=False, archive=True)
+            result.update(notices=sum(len(a["all"]) for a in archives.values()))
+
+        with stages.stage("search") as result:
+            result["documents"] = search_index.write_search_index(
+                [update_notices.notice_search_document(n, key, a["name"]) for key, a in archives.items() for n in a["all"]]
+                + list(search_index.transcript_documents()),
+                os.path.join(docs_dir, "search"))
+
+        # The blog's manifest and excerpt cache are kept in memory between the two builds
+        blog_manifest, blog_cache = {"outputs": {}}, {}
+        generate_blog.OUTPUT_DIR = Path(docs_dir) / "blog"
+        generate_blog.load_manifest = lambda: blog_manifest
+        generate_blog.save_manifest = lambda manifest: None
+        generate_blog.load_cache = lambda: blog_cache
+        generate_blog.save_cache = lambda cache: None
+        for name in ("blog", "blog_noop"):
+            with stages.stage(name) as result:
+                generate_blog.main()
+                result.update(posts=len(list(generate_blog.POSTS_DIR.glob("*.md"))))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "fixtures": source,
+        "notices": len(raw_notices),
+        "stages": stages.results,
+        "total_seconds": round(sum(s["seconds"] for k, s in stages.results.items() if k != "classify"), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _tree_size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+
+def record_fixtures(fixtures_dir, pages, pdf_count):
+    """Save live API pages and a few of their PDFs as fixtures."""
+    pages_dir = Path(fixtures_dir) / "api_pages"
+    pdf_dir = Path(fixtures_dir) / "pdfs"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+
+    pdf_urls = []
+    for page in range(pages):
+        response = get_kissimmee_planning_advisory_board_docs(offset=page * PAGE_SIZE, limit=PAGE_SIZE)
+        response.raise_for_status()
+        (pages_dir / f"{page:04d}.json").write_bytes(response.content)
+        raw_notices = extract_raw_notices(response.json())
+        print(f"Recorded page {page}: {len(raw_notices)} notices")
+        pdf_urls.extend(n["_links"]["media"]["href"] for n in raw_notices if n.get("_links", {}).get("media", {}).get("href"))
+        if len(raw_notices) < PAGE_SIZE:
+            break
+
+    for i, url in enumerate(pdf_urls[:pdf_count]):
+        response = http_client.get(url)
+        response.raise_for_status()
+        (pdf_dir / f"{i:03d}.pdf").write_bytes(response.content)
+        print(f"Recorded PDF {url}")
+
+
+def compare(before_path, after_path):
+    """Print each stage's time before and after, with the ratio."""
+    with open(before_path, "r", encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, "r", encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{'stage':<12}{before.get('commit') or 'before':>12}{after.get('commit') or 'after':>12}   ratio")
+    for name in list(dict.fromkeys([*before["stages"], *after["stages"]])):
+        old = before["stages"].get(name, {}).get("seconds")
+        new = after["stages"].get(name, {}).get("seconds")
+        ratio = f"{new / old:7.2f}x" if old and new is not None else "      -"
+        print(f"{name:<12}{_fmt(old):>12}{_fmt(new):>12}  {ratio}")
+    print(f"{'peak RSS MB':<12}{before.get('peak_rss_mb', '-'):>12}{after.get('peak_rss_mb', '-'):>12}")
+
+
+def _fmt(seconds):
+    return "-" if seconds is None else f"{seconds:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="fixture directory (default: benchmarks/fixtures)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time every pipeline stage")
+    run.add_argument("--scale", type=int, help="number of notices to simulate (e.g. 10000 or 100000)")
+    run.add_argument("--max-pdfs", type=int, help="thumbnail at most this many PDFs")
+    run.add_argument("--output", help="write the JSON results here instead of stdout")
+    run.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+
+    record = commands.add_parser("record", help="record fixtures from the live API")
+    record.add_argument("--pages", type=int, default=3)
+    record.add_argument("--pdfs", type=int, default=10)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_fixtures(args.fixtures, args.pages, args.pdfs)
+    elif args.command == "compare":
+        compare(args.before, args.after)
+    else:
+        results = run_benchmark(args.fixtures, args.scale, args.max_pdfs, quiet=not args.verbose)
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+        else:
+            print(output)
+
+
+if __name__ == "__main__":
+    main()
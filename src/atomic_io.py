@@ -0,0 +1,90 @@
+"""
+Crash-safe file writes.
+
+Files are written to a temporary file in the same directory, flushed and
+fsynced, then renamed over the target with os.replace. A reader (or the next
+run, after a crash or a killed runner) sees either the complete old file or
+the complete new one, never a truncated mix.
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def _umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Permissions a newly created file gets under the process umask (read once,
+# since querying the umask briefly changes it for every thread)
+NEW_FILE_MODE = 0o666 & ~_umask()
+
+# Called as hook(path, size) after each completed write (see add_write_hook)
+_write_hooks = []
+
+
+def add_write_hook(hook):
+    """Call `hook(path, size)` after every file atomic_write completes in this process."""
+    _write_hooks.append(hook)
+
+
+def fsync_directory(directory):
+    """Flush a directory entry (e.g. after a rename) to disk where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode='w', encoding='utf-8', buffering=-1):
+    """
+    Open a temporary file that replaces `path` when the block exits cleanly.
+
+    If the block raises, the temporary file is removed and `path` is untouched.
+
+    Args:
+        path: Destination file path
+        mode: 'w' for text or 'wb' for binary
+        encoding: Text encoding (ignored in binary mode)
+        buffering: Buffer size in bytes, as for open() (default: the system's)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        # mkstemp creates files readable only by their owner; keep the target's mode instead
+        try:
+            mode_bits = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode_bits = NEW_FILE_MODE
+        os.fchmod(fd, mode_bits)
+        with os.fdopen(fd, mode, buffering, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+    for hook in _write_hooks:
+        hook(path, size)
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Atomically write `data` as JSON; keyword arguments go to json.dump."""
+    with atomic_write(path) as f:
+        json.dump(data, f, **dump_kwargs)
@@ -0,0 +1,104 @@
+"""
+Track the inputs each generated file was built from.
+
+The manifest (data/build_manifest.json) maps every output path, relative to
+the project root, to a hash of everything that went into it: the records it
+renders, the template, and the version of the code that renders it. A page
+whose inputs hash the same as last time is left untouched, so no-op runs
+neither spend time rendering nor produce git diffs.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_PATH = PROJECT_ROOT / "data" / "build_manifest.json"
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the build manifest from JSON file."""
+    if not os.path.exists(manifest_path):
+        return {"outputs": {}}
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load build manifest from {manifest_path}: {e}")
+        return {"outputs": {}}
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Save the build manifest to JSON file."""
+    try:
+        atomic_write_json(manifest_path, manifest, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"Error: Could not save build manifest to {manifest_path}: {e}")
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_version(*paths):
+    """Return a digest identifying the current version of the given source files."""
+    return hash_inputs(*(file_digest(path) for path in paths))
+
+
+def hash_inputs(*parts):
+    """
+    Hash any mix of strings, bytes and JSON-serializable values.
+
+    Lists and tuples are hashed element by element, so large record lists
+    are never serialized into one big string.
+    """
+    h = hashlib.sha256()
+    _update(h, parts)
+    return h.hexdigest()
+
+
+def _update(h, value):
+    if isinstance(value, bytes):
+        h.update(b'b%d:' % len(value))
+        h.update(value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        h.update(b's%d:' % len(data))
+        h.update(data)
+    elif isinstance(value, (list, tuple)):
+        h.update(b'l%d:' % len(value))
+        for item in value:
+            _update(h, item)
+    else:
+        _update(h, json.dumps(value, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _output_key(output_path):
+    return os.path.relpath(os.path.abspath(output_path), PROJECT_ROOT)
+
+
+def is_current(manifest, output_path, digest):
+    """Return True if `output_path` exists and was built from inputs hashing to `digest`."""
+    return (
+        manifest.get('outputs', {}).get(_output_key(output_path)) == digest
+        and os.path.exists(output_path)
+    )
+
+
+def record(manifest, output_path, digest):
+    """Record that `output_path` was built from inputs hashing to `digest`."""
+    manifest.setdefault('outputs', {})[_output_key(output_path)] = digest
+
+
+def forget(manifest, output_path):
+    """Drop `output_path` from the manifest (e.g. after deleting it)."""
+    manifest.get('outputs', {}).pop(_output_key(output_path), None)
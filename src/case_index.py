@@ -0,0 +1,273 @@
+"""
+Index of land-use cases by reference number (e.g. ZMA-25-0009).
+
+A case moves through several public records: the legal notices for its
+hearings, the CivicClerk events of those hearings, and the meeting
+transcripts where it was discussed. The index (data/case_index.json) holds:
+
+    notices      {notice ID: summary} of every notice naming a case number:
+                 what a case page shows, the cases it names, and the date
+                 and board of its hearing
+    cases        {case number: [notice ID, ...]}, with a notice filed under
+                 every case it names
+    transcripts  {transcript file: {digest, date, video_url, mentions}}, where
+                 mentions maps each case number spoken in the meeting to the
+                 [start_ms, text] of the captions mentioning it
+
+Notices are filed as they are merged and a transcript is only scanned again
+when its file or video URL changes. Meetings are matched to a case through
+events_by_day(), a {date: [event]} table built once per run from
+data/events.json and data/pab_meetings.json, so assembling a case's timeline
+is a few dictionary lookups rather than a scan of every event and transcript.
+"""
+import json
+import os
+import re
+from pathlib import Path
+
+import inverted_index
+from build_manifest import code_version, file_digest
+from srt import iter_srt_file
+from transcript_index import discover_transcripts
+from transcripts import TRANSCRIPTS_DIR
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / 'data'
+INDEX_PATH = DATA_DIR / 'case_index.json'
+EVENT_PATHS = (DATA_DIR / 'events.json', DATA_DIR / 'pab_meetings.json')
+MEDIA_PATH = DATA_DIR / 'pab_meetings_media.json'
+
+CODE_VERSION = code_version(__file__, inverted_index.__file__)
+
+# Case prefixes seen in notices and hearings (land use, zoning map, planned
+# unit development, conditional use, variance and site plan cases)
+CASE_PREFIXES = ('LUPA', 'ZMA', 'PUD', 'CUP', 'CU', 'VAR', 'SPR')
+
+# "ZMA-25-0009" as written in a notice, or "ZMA 25-009" as captioned in a meeting
+CASE_NUMBER_PATTERN = re.compile(rf'\b({"|".join(CASE_PREFIXES)})[ -]?(\d{{2}})[ -](\d{{1,4}})\b')
+
+# The boards whose CivicClerk events are the hearings of each notice category
+CATEGORY_BOARDS = {
+    'pab': 'Planning Advisory Board',
+    'city-commission': 'City Commission',
+}
+
+CIVICCLERK_FILE_URL = 'https://kissimmeefl.api.civicclerk.com/v1/Meetings/GetMeetingFileStream(fileId={},plainText=false)'
+
+
+def case_numbers(text):
+    """Return the distinct case numbers in `text`, normalized to PREFIX-YY-NNNN, in order."""
+    return list(dict.fromkeys(
+        f'{prefix}-{year}-{int(number):04d}'
+        for prefix, year, number in CASE_NUMBER_PATTERN.findall((text or '').upper())
+    ))
+
+
+def notice_case_numbers(notice):
+    """
+    Return the case numbers a notice names, its reference number's first.
+
+    Some notices are filed under another reference (a City Commission notice
+    with reference number "DRC") and name their cases only in the notice text.
+    """
+    return case_numbers(f"{notice.get('reference_num') or ''}\n{notice.get('notice_text') or ''}")
+
+
+def notice_summary(notice, category):
+    """Return the index's summary of a notice, or None if it names no case number."""
+    cases = notice_case_numbers(notice)
+    if not cases:
+        return None
+    return {
+        'cases': cases,
+        'category': category,
+        'title': notice.get('title'),
+        'description': notice.get('description'),
+        'pub_date': notice.get('pub_date'),
+        'pub_epoch': notice.get('pub_epoch'),
+        'meeting_date': notice.get('meeting_date'),
+        'meeting_day': (notice.get('meeting_iso') or '')[:10] or None,
+        'property_address': notice.get('property_address'),
+    }
+
+
+def empty_index():
+    return {**inverted_index.empty_index(CODE_VERSION, 'cases'), 'transcripts': {}}
+
+
+def load_index(index_path=INDEX_PATH):
+    """Load the case index, or return None if it is missing or was built by other code."""
+    return inverted_index.load_index(index_path, CODE_VERSION, 'case index')
+
+
+def save_index(index, index_path=INDEX_PATH):
+    """Save the case index to JSON file."""
+    inverted_index.save_index(index, index_path, 'case index')
+
+
+def _keys(summary):
+    return {'cases': summary['cases']}
+
+
+def update(index, category, notices):
+    """
+    File `notices` (of one category) under every case number they name.
+
+    Returns:
+        int: Number of notices whose entry changed
+    """
+    return inverted_index.update(index, notices, lambda notice: notice_summary(notice, category), _keys)
+
+
+def scan_transcript(path):
+    """Return {case number: [[start_ms, caption text], ...]} for the cases mentioned in an SRT file."""
+    mentions = {}
+    for cue in iter_srt_file(path):
+        for case in case_numbers(cue.text):
+            mentions.setdefault(case, []).append([cue.start_ms, ' '.join(cue.text.split())])
+    return mentions
+
+
+def update_transcripts(index, transcripts_dir=TRANSCRIPTS_DIR):
+    """
+    Scan new or changed transcripts for case numbers, and drop deleted ones.
+
+    Returns:
+        int: Number of transcripts scanned or dropped
+    """
+    entries = index['transcripts']
+    meetings = discover_transcripts(transcripts_dir)
+    changed = 0
+    for meeting in meetings:
+        digest = file_digest(os.path.join(transcripts_dir, meeting['file']))
+        entry = entries.get(meeting['file'])
+        if entry and entry['digest'] == digest and entry['video_url'] == meeting['video_url']:
+            continue
+        entries[meeting['file']] = {
+            'digest': digest,
+            'date': meeting['date'],
+            'video_url': meeting['video_url'],
+            'mentions': scan_transcript(os.path.join(transcripts_dir, meeting['file'])),
+        }
+        changed += 1
+
+    current = {meeting['file'] for meeting in meetings}
+    for filename in [filename for filename in entries if filename not in current]:
+        del entries[filename]
+        changed += 1
+    return changed
+
+
+def rebuild(stores, transcripts_dir=TRANSCRIPTS_DIR):
+    """Build the index from every notice in `stores` ({category: NoticeStore}) and every transcript."""
+    index = empty_index()
+    for category, store in stores.items():
+        update(index, category, store.iter_notices())
+    update_transcripts(index, transcripts_dir)
+    print(f"Rebuilt case index: {len(all_cases(index))} cases from {len(index['notices'])} notices "
+          f"and {len(index['transcripts'])} transcripts")
+    return index
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load {path}: {e}")
+        return default
+
+
+def events_by_day(event_paths=EVENT_PATHS, media_path=MEDIA_PATH):
+    """
+    Return {date: [event, ...]} of the CivicClerk events on disk.
+
+    Each event is {id, name, date, files: [[name, url], ...], video_url}.
+    CivicClerk reports local meeting times with a "Z" suffix, so the date is
+    the first ten characters of eventDate as given.
+    """
+    media = _load_json(media_path, {})
+    events = {}
+    for path in event_paths:
+        events.update(_load_json(path, {}))
+
+    by_day = {}
+    for event_id, event in sorted(events.items(), key=lambda item: (item[1].get('eventDate') or '', item[0])):
+        day = (event.get('eventDate') or '')[:10]
+        if not day:
+            continue
+        by_day.setdefault(day, []).append({
+            'id': event['id'],
+            'name': (event.get('eventName') or '').strip(),
+            'date': day,
+            'files': [
+                [f['name'], CIVICCLERK_FILE_URL.format(f['fileId'])]
+                for f in event.get('publishedFiles') or []
+                if f.get('fileId')
+            ],
+            'video_url': media.get(event_id, {}).get('videoUrl') or None,
+        })
+    return by_day
+
+
+def all_cases(index):
+    """Return every case number with a notice or a transcript mention, sorted."""
+    cases = set(index['cases'])
+    for entry in index['transcripts'].values():
+        cases.update(entry['mentions'])
+    return sorted(cases)
+
+
+def transcript_mentions(index):
+    """Return {case number: [(transcript entry, mentions), ...]}, one lookup table for every case page."""
+    by_case = {}
+    for filename in sorted(index['transcripts']):
+        entry = index['transcripts'][filename]
+        for case, mentions in entry['mentions'].items():
+            by_case.setdefault(case, []).append((entry, mentions))
+    return by_case
+
+
+def case_timeline(index, case, events, mentions):
+    """
+    Return the timeline of a case, oldest first.
+
+    Args:
+        index: The case index
+        case: Case number
+        events: events_by_day() table
+        mentions: transcript_mentions() table
+
+    Returns:
+        list: {'date', 'kind' ('notice', 'meeting' or 'transcript'), ...} items
+    """
+    items = []
+    hearings = set()
+    for notice_id in index['cases'].get(case, []):
+        summary = index['notices'][notice_id]
+        items.append({'date': summary['pub_date'] or '', 'kind': 'notice', 'id': notice_id, **summary})
+        board = CATEGORY_BOARDS.get(summary['category'])
+        if board and summary['meeting_day']:
+            hearings.add((summary['meeting_day'], board))
+
+    # Transcripts are of Planning Advisory Board meetings
+    for entry, cues in mentions.get(case, []):
+        items.append({
+            'date': entry['date'],
+            'kind': 'transcript',
+            'video_url': entry['video_url'],
+            'cues': cues,
+        })
+        hearings.add((entry['date'], CATEGORY_BOARDS['pab']))
+
+    for day, board in sorted(hearings):
+        for event in events.get(day, []):
+            if event['name'].startswith(board):
+                items.append({'kind': 'meeting', **event})
+
+    kind_order = {'notice': 0, 'meeting': 1, 'transcript': 2}
+    items.sort(key=lambda item: (item['date'], kind_order[item['kind']]))
+    return items
@@ -1,28 +1,65 @@
 """The city uses a civicclerk portal for hosting the meeting agenda."""
 
+import asyncio
 import json
 import requests
-from datetime import datetime
-from typing import Literal
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Iterable, Literal
 from urllib.parse import urljoin
 
+import http_client
+
 BASE_URL = "https://kissimmeefl.api.civicclerk.com/v1"
 
+# Maximum number of CivicClerk requests in flight at once
+DEFAULT_CONCURRENCY = 8
+
+
+def _api_url(path: str) -> str:
+    # urljoin would drop the "v1" segment of a base URL without a trailing slash
+    return urljoin(BASE_URL + "/", path)
+
+
+def build_events_filter(
+    filter_date: str | None = None,
+    filter_operator: Literal["lt", "gt", "ge"] = "lt",
+    created_after: str | None = None,
+) -> str | None:
+    """
+    Build an OData $filter for the Events endpoint.
+
+    Args:
+        filter_date: Match events whose startDateTime compares to this date (YYYY-MM-DD)
+        filter_operator: Comparison operator for filter_date ('lt', 'gt' or 'ge')
+        created_after: Also match events created after this timestamp (ISO 8601)
+
+    Returns:
+        The filter expression, or None to match every event
+    """
+    clauses = []
+    if filter_date:
+        clauses.append(f"startDateTime {filter_operator} {filter_date}")
+    if created_after:
+        clauses.append(f"createdOn gt {created_after}")
+    return " or ".join(clauses) or None
+
 
 def get_civic_clerk_events(
     filter_date: str | None = None,
-    filter_operator: Literal["lt", "gt"] = "lt",
+    filter_operator: Literal["lt", "gt", "ge"] = "lt",
     order_by: str = "startDateTime desc, eventName desc",
     path: str = "Events",
+    created_after: str | None = None,
 ) -> requests.Response:
     """
     Make an API call to the CivicClerk portal to retrieve events.
 
     Args:
-        base_url: The base URL for the CivicClerk API endpoint
         filter_date: Filter events with startDateTime less than or greater than this date (format: YYYY-MM-DD)
-        filter_operator: Comparison operator for date filtering ('lt' for less than, 'gt' for greater than)
+        filter_operator: Comparison operator for date filtering ('lt' for less than, 'gt'/'ge' for greater than)
         order_by: Order by clause for sorting results
+        created_after: Also include events created after this timestamp
 
     Returns:
         Response object from the API call
@@ -31,15 +68,16 @@ def get_civic_clerk_events(
     if filter_date is None:
         filter_date = datetime.now().strftime("%Y-%m-%d")
 
-    if filter_date:
-        params["$filter"] = f"startDateTime {filter_operator} {filter_date}"
+    filter = build_events_filter(filter_date, filter_operator, created_after)
+    if filter:
+        params["$filter"] = filter
 
     if order_by:
         params["$orderby"] = order_by
 
-    url = urljoin(BASE_URL, path)
+    url = _api_url(path)
     print(f"{url=}")
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     return response
 
 
@@ -57,8 +95,8 @@ def get_civic_clerk_event(
     Returns:
         Response object from the API call
     """
-    url = urljoin(BASE_URL, f"{path}/{event_id}")
-    response = requests.get(url)
+    url = _api_url(f"{path}/{event_id}")
+    response = http_client.get(url)
     return response
 
 
@@ -76,11 +114,213 @@ def get_civic_clerk_event_media(
     Returns:
         Response object from the API call
     """
-    url = urljoin(BASE_URL, f"{path}/{event_id}")
-    response = requests.get(url)
+    url = _api_url(f"{path}/{event_id}")
+    response = http_client.get(url)
     return response
 
 
+@dataclass(frozen=True)
+class Event:
+    """A meeting on the CivicClerk portal."""
+
+    id: int
+    event_name: str
+    start_date_time: str
+    event_date: str
+    category_name: str | None
+    has_media: bool
+    raw: dict = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Event":
+        return cls(
+            id=data["id"],
+            event_name=data.get("eventName", ""),
+            start_date_time=data.get("startDateTime", ""),
+            event_date=data.get("eventDate", ""),
+            category_name=data.get("categoryName"),
+            has_media=bool(data.get("hasMedia")),
+            raw=data,
+        )
+
+
+@dataclass(frozen=True)
+class EventMedia:
+    """The video and closed captions of a meeting."""
+
+    event_id: int
+    video_url: str | None
+    closed_caption_url: str | None
+    raw: dict = field(repr=False, compare=False)
+
+    @classmethod
+    def from_json(cls, event_id: int, data: dict) -> "EventMedia":
+        return cls(
+            event_id=event_id,
+            video_url=data.get("videoUrl") or None,
+            closed_caption_url=data.get("closedCaptionUrl") or None,
+            raw=data,
+        )
+
+
+def next_month(day: date) -> date:
+    """Return the first day of the month after `day`."""
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def month_starts(start: date, end: date) -> list[date]:
+    """Return the first day of every month from `start`'s month through `end`'s month."""
+    months = []
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+class AsyncCivicClerkClient:
+    """
+    Asyncio client for bulk harvesting of CivicClerk events and media.
+
+    Requests run on worker threads through the shared http_client (so they
+    reuse its pooled connections, rate limit and retries), with at most
+    `concurrency` in flight at once. Event listings follow OData
+    `@odata.nextLink` paging until the last page.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, client: http_client.HttpClient | None = None):
+        self.client = client or http_client.get_client()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _get(self, url: str, params: dict | None = None) -> requests.Response:
+        async with self._semaphore:
+            return await asyncio.to_thread(self.client.get, url, params=params)
+
+    async def _get_json(self, url: str, params: dict | None = None) -> dict:
+        response = await self._get(url, params)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_events(
+        self,
+        filter: str | None = None,
+        order_by: str = "startDateTime asc, eventName asc",
+    ) -> list[Event]:
+        """
+        Fetch every event matching an OData filter, following pagination.
+
+        Args:
+            filter: OData $filter expression, e.g. "startDateTime ge 2025-01-01"
+            order_by: OData $orderby clause
+
+        Returns:
+            List of events across all pages
+        """
+        params = {}
+        if filter:
+            params["$filter"] = filter
+        if order_by:
+            params["$orderby"] = order_by
+
+        events = []
+        url, page_params = _api_url("Events"), params
+        while url:
+            page = await self._get_json(url, page_params)
+            events.extend(Event.from_json(item) for item in page.get("value", []))
+            # The next link already carries the query string
+            url, page_params = page.get("@odata.nextLink"), None
+        return events
+
+    async def get_events_between(self, start: date, end: date) -> list[Event]:
+        """Fetch events with start <= startDateTime < end."""
+        return await self.get_events(
+            f"startDateTime ge {start.isoformat()} and startDateTime lt {end.isoformat()}"
+        )
+
+    async def get_events_changed_since(self, start: date, created_after: str | None = None) -> list[Event]:
+        """Fetch events starting on or after `start`, or created after `created_after`."""
+        return await self.get_events(build_events_filter(start.isoformat(), "ge", created_after))
+
+    async def get_events_by_month(self, start: date, end: date) -> dict[int, Event]:
+        """
+        Fetch every event from `start`'s month through `end`'s month,
+        requesting all months concurrently.
+
+        Returns:
+            Dictionary mapping event ID to event, in start time order
+        """
+        results = await asyncio.gather(*(
+            self.get_events_between(month, next_month(month)) for month in month_starts(start, end)
+        ))
+        return {event.id: event for events in results for event in events}
+
+    async def get_event_media(self, event_id: int) -> EventMedia | None:
+        """Fetch an event's media, or None if the event has none."""
+        response = await self._get(_api_url(f"EventsMedia/{event_id}"))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return EventMedia.from_json(event_id, response.json())
+
+    async def get_events_media(self, event_ids: Iterable[int]) -> dict[int, EventMedia]:
+        """Fetch media for many events concurrently, skipping events without media."""
+        event_ids = list(event_ids)
+        results = await asyncio.gather(*(self.get_event_media(event_id) for event_id in event_ids))
+        return {event_id: media for event_id, media in zip(event_ids, results) if media is not None}
+
+
+def harvest_events(
+    start: date,
+    end: date | None = None,
+    with_media: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> tuple[dict[int, Event], dict[int, EventMedia]]:
+    """
+    Fetch every event (of every board) between two dates, and the media of
+    those that have any.
+
+    Args:
+        start: First month to fetch
+        end: Last month to fetch (default: today)
+        with_media: Whether to also fetch EventsMedia for events with media
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Tuple of (events by ID, media by event ID)
+    """
+    return asyncio.run(_harvest(
+        lambda client: client.get_events_by_month(start, end or date.today()), with_media, concurrency))
+
+
+def harvest_changed_events(
+    start: date,
+    created_after: str | None = None,
+    with_media: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> tuple[dict[int, Event], dict[int, EventMedia]]:
+    """
+    Fetch events starting on or after `start` or created after
+    `created_after`, and the media of those that have any.
+
+    Returns:
+        Tuple of (events by ID, media by event ID)
+    """
+    async def fetch(client):
+        events = await client.get_events_changed_since(start, created_after)
+        return {event.id: event for event in events}
+
+    return asyncio.run(_harvest(fetch, with_media, concurrency))
+
+
+async def _harvest(fetch_events, with_media, concurrency):
+    client = AsyncCivicClerkClient(concurrency)
+    events = await fetch_events(client)
+    media = {}
+    if with_media:
+        media = await client.get_events_media(event.id for event in events.values() if event.has_media)
+    return events, media
+
+
 # stream/KISSIMMEEFL/4ee3390e-3566-4e08-97ce-e752cfb95a3d.pdf
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Export every archived notice to a columnar file for analysis.
+
+Each notice becomes one row with typed columns (see COLUMNS), written to
+data/exports/notices.parquet with pyarrow, or, without pyarrow, to
+data/exports/notices.npz with NumPy. Both are in the project's "export"
+extra, which the pipeline doesn't need:
+
+    uv sync --extra export
+    python export_notices.py [parquet|npz] [output path]
+
+In the .npz file, a category column is stored as integer codes (-1 when
+missing) plus a `{name}.categories` array, a list column as
+`{name}.values` plus `{name}.offsets`, and missing strings as ''. Every array
+is plain (no pickled objects), so np.load works without allow_pickle.
+
+Rezonings per month by the district rezoned to, for example:
+
+    table = pyarrow.parquet.read_table('data/exports/notices.parquet')
+    table.group_by(['pub_month', 'zoning_to_district']).aggregate([('id', 'count')])
+
+or from the .npz export:
+
+    data = np.load('data/exports/notices.npz')
+    rezoned = data['zoning_to_district'] >= 0
+    months = data['pub_date'][rezoned].astype('datetime64[M]')
+    districts = data['zoning_to_district.categories'][data['zoning_to_district'][rezoned]]
+"""
+import os
+import sys
+from datetime import date, datetime, timezone
+
+from atomic_io import atomic_write
+from notice_store import open_store
+from property_index import parcel_numbers
+from update_notices import KNOWN_CATEGORIES, parse_meeting_datetime
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+NOTICES_DIR = os.path.join(PROJECT_ROOT, 'data', 'notices')
+EXPORT_DIR = os.path.join(PROJECT_ROOT, 'data', 'exports')
+
+# (column, type): 'int', 'string', 'category' (dictionary-encoded string),
+# 'date', 'datetime' (naive Eastern wall-clock time), 'timestamp' (UTC
+# instant) or 'list' (of strings)
+COLUMNS = [
+    ('id', 'int'),
+    ('category', 'category'),
+    ('pub_date', 'date'),
+    ('pub_month', 'category'),
+    ('meeting_datetime', 'datetime'),
+    ('amendment_type', 'category'),
+    ('reference_num', 'string'),
+    ('parcel_ids', 'list'),
+    ('property_address', 'string'),
+    ('zoning_from', 'string'),
+    ('zoning_to', 'string'),
+    ('zoning_from_district', 'category'),
+    ('zoning_to_district', 'category'),
+    ('first_seen', 'timestamp'),
+    ('last_seen', 'timestamp'),
+]
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_timestamp(value):
+    try:
+        timestamp = datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+    if timestamp is not None and timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def _district(zoning):
+    """The district code of one side of a zoning change ("RC-2 (Multiple Family ...)" -> "RC-2")."""
+    if not zoning:
+        return None
+    return zoning.split(' (', 1)[0].strip() or None
+
+
+def notice_row(notice, category):
+    """Flatten a stored notice into a {column: value} row of Python values."""
+    zoning_from, _, zoning_to = (notice.get('zoning_change') or '').partition(' → ')
+    pub_date = _parse_date(notice.get('pub_date'))
+    amendment_type = notice.get('amendment_type') or {}
+    return {
+        'id': int(notice['id']),
+        'category': category,
+        'pub_date': pub_date,
+        'pub_month': pub_date.strftime('%Y-%m') if pub_date else None,
+        'meeting_datetime': parse_meeting_datetime(notice.get('meeting_date')),
+        'amendment_type': amendment_type.get('code'),
+        'reference_num': notice.get('reference_num'),
+        'parcel_ids': parcel_numbers(notice.get('parcel_id')),
+        'property_address': notice.get('property_address'),
+        'zoning_from': zoning_from or None,
+        'zoning_to': zoning_to or None,
+        'zoning_from_district': _district(zoning_from),
+        'zoning_to_district': _district(zoning_to),
+        'first_seen': _parse_timestamp(notice.get('first_seen')),
+        'last_seen': _parse_timestamp(notice.get('last_seen')),
+    }
+
+
+def load_columns(notices_dir=NOTICES_DIR):
+    """Read every category store into {column: [values]}, in (category, id) order."""
+    columns = {name: [] for name, _ in COLUMNS}
+    for category in KNOWN_CATEGORIES:
+        store = open_store(notices_dir, category)
+        for notice in sorted(store.iter_notices(), key=lambda n: int(n['id'])):
+            for name, value in notice_row(notice, category).items():
+                columns[name].append(value)
+    return columns
+
+
+def write_parquet(columns, output_path):
+    """Write the columns as a zstd-compressed Parquet file."""
+    types = {
+        'int': pyarrow.int64(),
+        'string': pyarrow.string(),
+        'category': pyarrow.string(),
+        'date': pyarrow.date32(),
+        'datetime': pyarrow.timestamp('s'),
+        'timestamp': pyarrow.timestamp('us', tz='UTC'),
+        'list': pyarrow.list_(pyarrow.string()),
+    }
+    arrays = {}
+    for name, kind in COLUMNS:
+        array = pyarrow.array(columns[name], types[kind])
+        arrays[name] = array.dictionary_encode() if kind == 'category' else array
+    with atomic_write(output_path, 'wb') as f:
+        pyarrow.parquet.write_table(pyarrow.table(arrays), f, compression='zstd')
+
+
+def _numpy_datetimes(values, unit):
+    # NumPy has no time zones; timestamps are stored as UTC
+    return numpy.array(
+        [value.astimezone(timezone.utc).replace(tzinfo=None) if getattr(value, 'tzinfo', None) else value
+         for value in values],
+        dtype=f'datetime64[{unit}]',
+    )
+
+
+def write_npz(columns, output_path):
+    """Write the columns as plain NumPy arrays in a compressed .npz file."""
+    arrays = {}
+    for name, kind in COLUMNS:
+        values = columns[name]
+        if kind == 'int':
+            arrays[name] = numpy.array(values, dtype=numpy.int64)
+        elif kind == 'string':
+            arrays[name] = numpy.array([value or '' for value in values], dtype=str)
+        elif kind == 'category':
+            categories = sorted({value for value in values if value is not None})
+            codes = {value: code for code, value in enumerate(categories)}
+            arrays[name] = numpy.array([codes.get(value, -1) for value in values], dtype=numpy.int32)
+            arrays[f'{name}.categories'] = numpy.array(categories, dtype=str)
+        elif kind == 'date':
+            arrays[name] = numpy.array(values, dtype='datetime64[D]')
+        elif kind == 'datetime':
+            arrays[name] = _numpy_datetimes(values, 's')
+        elif kind == 'timestamp':
+            arrays[name] = _numpy_datetimes(values, 'us')
+        elif kind == 'list':
+            offsets = [0]
+            for value in values:
+                offsets.append(offsets[-1] + len(value))
+            arrays[f'{name}.values'] = numpy.array([item for value in values for item in value], dtype=str)
+            arrays[f'{name}.offsets'] = numpy.array(offsets, dtype=numpy.int64)
+    with atomic_write(output_path, 'wb') as f:
+        numpy.savez_compressed(f, **arrays)
+
+
+WRITERS = {'parquet': write_parquet, 'npz': write_npz}
+
+
+def export_notices(fmt=None, output_path=None, notices_dir=NOTICES_DIR):
+    """
+    Export every archived notice in columnar form.
+
+    Args:
+        fmt: 'parquet' or 'npz' (default: parquet if pyarrow is installed, else npz)
+        output_path: Output file (default: data/exports/notices.{fmt})
+        notices_dir: Directory of the category notice stores
+
+    Returns:
+        str: Path of the written file
+    """
+    available = [name for name, module in (('parquet', pyarrow), ('npz', numpy)) if module is not None]
+    if not available:
+        raise RuntimeError("Exporting notices needs pyarrow (Parquet) or numpy (.npz). Run: uv sync --extra export")
+    fmt = fmt or available[0]
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of: {', '.join(WRITERS)})")
+    if fmt not in available:
+        raise RuntimeError(f"Exporting {fmt} needs {'pyarrow' if fmt == 'parquet' else 'numpy'}, which is not installed. "
+                           "Run: uv sync --extra export")
+
+    output_path = output_path or os.path.join(EXPORT_DIR, f'notices.{fmt}')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    columns = load_columns(notices_dir)
+    WRITERS[fmt](columns, output_path)
+    print(f"Exported {len(columns['id'])} notices ({len(COLUMNS)} columns) to {output_path}")
+    return output_path
+
+
+def main():
+    """Export the notice archive: python export_notices.py [parquet|npz] [output path]"""
+    args = sys.argv[1:]
+    fmt = args.pop(0) if args and args[0] in WRITERS else None
+    if len(args) > 1:
+        print(main.__doc__)
+        sys.exit(1)
+    try:
+        export_notices(fmt, args[0] if args else None)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
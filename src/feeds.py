@@ -0,0 +1,234 @@
+"""
+Write RSS 2.0, Atom and JSON Feed files in a single streaming pass.
+
+A feed is described by a dict of channel fields and an iterable of item
+dicts. Each item is serialized to every requested format as soon as it is
+produced, so a feed covering a category's full history never has to be
+held in memory as a tree (or re-parsed just to indent it).
+
+Feed fields:
+    title, link, description   required
+    language                   optional, e.g. 'en-us'
+    updated                    optional aware datetime (RSS lastBuildDate, Atom updated)
+    urls                       optional {format: public URL of that feed file}
+
+Item fields:
+    id                         stable unique identifier (RSS guid)
+    title, link, description   description is plain text
+    pub_date                   optional datetime
+    permalink                  True if `id` is the item's URL
+    image                      optional absolute URL of a JPEG image
+"""
+import json
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import urlsplit
+from xml.sax.saxutils import XMLGenerator
+
+from atomic_io import atomic_write
+
+
+ATOM_NAMESPACE = 'http://www.w3.org/2005/Atom'
+JSON_FEED_VERSION = 'https://jsonfeed.org/version/1.1'
+
+# Date in tag: URIs used as Atom IDs for items whose ID is not a URL
+TAG_URI_DATE = '2025'
+
+
+def _utc(dt):
+    """Treat naive datetimes as UTC."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+class _IndentedXML:
+    """Thin wrapper over XMLGenerator that indents elements by two spaces per level."""
+
+    def __init__(self, out):
+        self._gen = XMLGenerator(out, encoding='utf-8', short_empty_elements=True)
+        self._depth = 0
+        self._gen.startDocument()
+
+    def _newline(self):
+        if self._depth:
+            self._gen.ignorableWhitespace('\n' + '  ' * self._depth)
+
+    def start(self, name, attrs=None):
+        self._newline()
+        self._gen.startElement(name, attrs or {})
+        self._depth += 1
+
+    def end(self, name):
+        self._depth -= 1
+        if self._depth:
+            self._newline()
+        else:
+            self._gen.ignorableWhitespace('\n')
+        self._gen.endElement(name)
+        if not self._depth:
+            self._gen.ignorableWhitespace('\n')
+            self._gen.endDocument()
+
+    def element(self, name, text=None, attrs=None):
+        self._newline()
+        self._gen.startElement(name, attrs or {})
+        if text:
+            self._gen.characters(text)
+        self._gen.endElement(name)
+
+
+class RssWriter:
+    """RSS 2.0"""
+
+    def __init__(self, out):
+        self.xml = _IndentedXML(out)
+
+    def start(self, feed):
+        self.xml.start('rss', {'version': '2.0'})
+        self.xml.start('channel')
+        self.xml.element('title', feed['title'])
+        self.xml.element('link', feed['link'])
+        self.xml.element('description', feed['description'])
+        if feed.get('language'):
+            self.xml.element('language', feed['language'])
+        if feed.get('updated'):
+            self.xml.element('lastBuildDate', format_datetime(_utc(feed['updated']).astimezone(timezone.utc), usegmt=True))
+
+    def add(self, item):
+        self.xml.start('item')
+        self.xml.element('title', item['title'])
+        self.xml.element('link', item['link'])
+        self.xml.element('description', item['description'])
+        if item.get('pub_date'):
+            self.xml.element('pubDate', format_datetime(_utc(item['pub_date'])))
+        self.xml.element('guid', item['id'], None if item.get('permalink') else {'isPermaLink': 'false'})
+        if item.get('image'):
+            self.xml.element('enclosure', attrs={'url': item['image'], 'type': 'image/jpeg'})
+        self.xml.end('item')
+
+    def end(self):
+        self.xml.end('channel')
+        self.xml.end('rss')
+
+
+class AtomWriter:
+    """Atom 1.0 (RFC 4287)"""
+
+    def __init__(self, out):
+        self.xml = _IndentedXML(out)
+
+    def start(self, feed):
+        self.updated = _utc(feed.get('updated') or datetime.now(timezone.utc))
+        self.host = urlsplit(feed['link']).netloc
+        self_url = feed.get('urls', {}).get('atom')
+
+        self.xml.start('feed', {'xmlns': ATOM_NAMESPACE})
+        self.xml.element('title', feed['title'])
+        self.xml.element('subtitle', feed['description'])
+        self.xml.element('link', attrs={'href': feed['link']})
+        if self_url:
+            self.xml.element('link', attrs={'rel': 'self', 'href': self_url})
+        self.xml.element('id', self_url or feed['link'])
+        self.xml.element('updated', self.updated.isoformat())
+        self.xml.start('author')
+        self.xml.element('name', self.host or feed['title'])
+        self.xml.end('author')
+
+    def add(self, item):
+        if item.get('permalink'):
+            entry_id = item['id']
+        else:
+            entry_id = f"tag:{self.host},{TAG_URI_DATE}:{item['id']}"
+        published = _utc(item['pub_date']).isoformat() if item.get('pub_date') else None
+
+        self.xml.start('entry')
+        self.xml.element('title', item['title'])
+        self.xml.element('link', attrs={'href': item['link']})
+        self.xml.element('id', entry_id)
+        self.xml.element('updated', published or self.updated.isoformat())
+        if published:
+            self.xml.element('published', published)
+        self.xml.element('summary', item['description'], {'type': 'text'})
+        if item.get('image'):
+            self.xml.element('link', attrs={'rel': 'enclosure', 'type': 'image/jpeg', 'href': item['image']})
+        self.xml.end('entry')
+
+    def end(self):
+        self.xml.end('feed')
+
+
+class JsonFeedWriter:
+    """JSON Feed 1.1, written one item per line."""
+
+    def __init__(self, out):
+        self.out = out
+        self.first = True
+
+    def start(self, feed):
+        header = {
+            'version': JSON_FEED_VERSION,
+            'title': feed['title'],
+            'home_page_url': feed['link'],
+            'feed_url': feed.get('urls', {}).get('json'),
+            'description': feed['description'],
+            'language': feed.get('language'),
+        }
+        self.out.write('{\n')
+        for key, value in header.items():
+            if value:
+                self.out.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+        self.out.write('  "items": [')
+
+    def add(self, item):
+        entry = {
+            'id': item['id'],
+            'url': item['link'],
+            'title': item['title'],
+            'content_text': item['description'],
+        }
+        if item.get('pub_date'):
+            entry['date_published'] = _utc(item['pub_date']).isoformat()
+        if item.get('image'):
+            entry['image'] = item['image']
+        self.out.write('\n    ' if self.first else ',\n    ')
+        self.out.write(json.dumps(entry, ensure_ascii=False))
+        self.first = False
+
+    def end(self):
+        self.out.write('\n  ]\n}\n' if not self.first else ']\n}\n')
+
+
+FEED_WRITERS = {
+    'rss': RssWriter,
+    'atom': AtomWriter,
+    'json': JsonFeedWriter,
+}
+
+
+def write_feeds(feed, items, paths):
+    """
+    Stream `items` into one feed file per format, each written atomically.
+
+    Args:
+        feed: Dictionary of channel fields (see module docstring)
+        items: Iterable of item dictionaries; consumed once
+        paths: Dictionary mapping a format ('rss', 'atom', 'json') to its output path
+
+    Returns:
+        int: Number of items written
+    """
+    count = 0
+    with ExitStack() as stack:
+        writers = [
+            FEED_WRITERS[fmt](stack.enter_context(atomic_write(path)))
+            for fmt, path in paths.items()
+        ]
+        for writer in writers:
+            writer.start(feed)
+        for item in items:
+            for writer in writers:
+                writer.add(item)
+            count += 1
+        for writer in writers:
+            writer.end()
+    return count
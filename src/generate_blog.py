@@ -2,14 +2,21 @@
 """
 Generate static blog pages from markdown files.
 """
+import functools
+import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
 import html
 
+from atomic_io import atomic_write, atomic_write_json
+from build_manifest import code_version, file_digest, hash_inputs, is_current, load_manifest, record, save_manifest
+import feeds
+import instrumentation
+import templating
+
 try:
     import markdown
 except ImportError:
@@ -22,6 +29,14 @@ POSTS_DIR = PROJECT_ROOT / "posts"
 OUTPUT_DIR = PROJECT_ROOT / "docs" / "blog"
 TEMPLATES_DIR = PROJECT_ROOT / "templates"
 
+# Excerpts of the posts already built, so unchanged posts are never re-rendered
+CACHE_PATH = PROJECT_ROOT / "data" / "blog_cache.json"
+
+# Processes rendering changed posts (only used when more than one post changed)
+RENDER_WORKERS = int(os.environ.get('BLOG_RENDER_WORKERS', os.cpu_count() or 1))
+
+CODE_VERSION = code_version(__file__, feeds.__file__, templating.__file__)
+
 
 def parse_frontmatter(content):
     """
@@ -65,14 +80,18 @@ def parse_frontmatter(content):
     return frontmatter, remaining_content
 
 
-def markdown_to_html(md_content):
-    """Convert markdown to HTML with extensions."""
-    md = markdown.Markdown(extensions=[
+@functools.cache
+def _markdown_parser():
+    return markdown.Markdown(extensions=[
         'extra',      # Tables, fenced code blocks, etc.
         'nl2br',      # Newlines to <br>
         'sane_lists', # Better list handling
     ])
-    return md.convert(md_content)
+
+
+def markdown_to_html(md_content):
+    """Convert markdown to HTML with extensions (the parser is built once per process)."""
+    return _markdown_parser().reset().convert(md_content)
 
 
 def generate_slug(filename):
@@ -118,10 +137,8 @@ def extract_excerpt(html_content, max_length=200):
 
 
 def load_template(template_name):
-    """Load HTML template."""
-    template_path = TEMPLATES_DIR / template_name
-    with open(template_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    """Load a compiled HTML template (parsed once per process)."""
+    return templating.load_template(TEMPLATES_DIR / template_name)
 
 
 def generate_post_page(post_data):
@@ -131,21 +148,55 @@ def generate_post_page(post_data):
     # Author line (optional)
     author_line = f" | {post_data['author']}" if post_data.get('author') else ""
 
-    # Replace placeholders
-    html_content = template.replace('{{TITLE}}', html.escape(post_data['title']))
-    html_content = html_content.replace('{{DESCRIPTION}}', html.escape(post_data.get('description', '')))
-    html_content = html_content.replace('{{DATE}}', post_data['formatted_date'])
-    html_content = html_content.replace('{{AUTHOR}}', author_line)
-    html_content = html_content.replace('{{CONTENT}}', post_data['html_content'])
-
-    # Write to file
+    # Fill placeholders and write to file
     output_file = OUTPUT_DIR / f"{post_data['slug']}.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with atomic_write(output_file) as f:
+        template.render_to(f, {
+            'TITLE': html.escape(post_data['title']),
+            'DESCRIPTION': html.escape(post_data.get('description', '')),
+            'DATE': post_data['formatted_date'],
+            'AUTHOR': author_line,
+            'CONTENT': post_data['html_content'],
+        })
 
     print(f"Generated: {output_file}")
 
 
+def render_post(post_data, md_content):
+    """
+    Render a post's markdown and write its page. Runs in a worker process.
+
+    Returns:
+        str: The post's excerpt
+    """
+    post_data['html_content'] = markdown_to_html(md_content)
+    if post_data['excerpt'] is None:
+        post_data['excerpt'] = extract_excerpt(post_data['html_content'])
+    generate_post_page(post_data)
+    return post_data['excerpt']
+
+
+def load_cache(cache_path=CACHE_PATH):
+    """Load the excerpt cache ({filename: {"digest", "excerpt"}}) from JSON file."""
+    if not os.path.exists(cache_path):
+        return {}
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load blog cache from {cache_path}: {e}")
+        return {}
+
+
+def save_cache(cache, cache_path=CACHE_PATH):
+    """Save the excerpt cache to JSON file."""
+    try:
+        atomic_write_json(cache_path, cache, indent=2, sort_keys=True, ensure_ascii=False)
+    except IOError as e:
+        print(f"Error: Could not save blog cache to {cache_path}: {e}")
+
+
 def generate_index_page(posts):
     """Generate blog index page with list of posts."""
     template = load_template('blog_index.html')
@@ -167,47 +218,51 @@ def generate_index_page(posts):
 
     posts_html = '\n'.join(post_items)
 
-    # Replace placeholder
-    html_content = template.replace('{{POSTS}}', posts_html)
-
-    # Write to file
+    # Fill placeholder and write to file
     output_file = OUTPUT_DIR / 'index.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with atomic_write(output_file) as f:
+        template.render_to(f, {'POSTS': posts_html})
 
     print(f"Generated: {output_file}")
 
 
 def generate_rss_feed(posts):
-    """Generate RSS feed for blog posts."""
-    # Create RSS feed
-    rss = Element('rss', version='2.0')
-    channel = SubElement(rss, 'channel')
-
-    # Channel info
-    SubElement(channel, 'title').text = 'kissimmee.fyi Blog'
-    SubElement(channel, 'link').text = 'https://kissimmee.fyi/blog/'
-    SubElement(channel, 'description').text = 'Civic education and insights about Kissimmee, Florida'
-    SubElement(channel, 'language').text = 'en-us'
-
-    # Add posts
-    for post in posts[:10]:  # Include last 10 posts in RSS
-        item = SubElement(channel, 'item')
-        SubElement(item, 'title').text = post['title']
-        SubElement(item, 'link').text = f"https://kissimmee.fyi/blog/{post['slug']}.html"
-        SubElement(item, 'description').text = post.get('description', post['excerpt'])
-        SubElement(item, 'pubDate').text = post['date_obj'].strftime('%a, %d %b %Y 00:00:00 GMT')
-        SubElement(item, 'guid').text = f"https://kissimmee.fyi/blog/{post['slug']}.html"
-
-    # Pretty print XML
-    xml_str = minidom.parseString(tostring(rss, encoding='unicode')).toprettyxml(indent='  ')
-
-    # Write to file
-    output_file = OUTPUT_DIR / 'rss.xml'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(xml_str)
+    """Generate RSS, Atom and JSON feeds for blog posts."""
+    feed = {
+        'title': 'kissimmee.fyi Blog',
+        'link': 'https://kissimmee.fyi/blog/',
+        'description': 'Civic education and insights about Kissimmee, Florida',
+        'language': 'en-us',
+        # Dated by the newest post so rebuilding unchanged posts doesn't change the feeds
+        'updated': posts[0]['date_obj'] if posts else None,
+        'urls': {
+            'atom': 'https://kissimmee.fyi/blog/atom.xml',
+            'json': 'https://kissimmee.fyi/blog/feed.json',
+        },
+    }
+
+    # Include last 10 posts in the feeds
+    items = (
+        {
+            'id': f"https://kissimmee.fyi/blog/{post['slug']}.html",
+            'permalink': True,
+            'title': post['title'],
+            'link': f"https://kissimmee.fyi/blog/{post['slug']}.html",
+            'description': post.get('description', post['excerpt']),
+            'pub_date': post['date_obj'],
+        }
+        for post in posts[:10]
+    )
 
-    print(f"Generated: {output_file}")
+    output_files = {
+        'rss': OUTPUT_DIR / 'rss.xml',
+        'atom': OUTPUT_DIR / 'atom.xml',
+        'json': OUTPUT_DIR / 'feed.json',
+    }
+    feeds.write_feeds(feed, items, output_files)
+
+    for output_file in output_files.values():
+        print(f"Generated: {output_file}")
 
 
 def main():
@@ -241,11 +296,14 @@ Your markdown content here...
 
     print(f"Found {len(md_files)} post(s)")
 
-    # Parse all posts
-    posts = []
-    for md_file in md_files:
-        print(f"Processing: {md_file.name}")
+    manifest = load_manifest()
+    cache = load_cache()
+    post_template = file_digest(TEMPLATES_DIR / 'blog_post.html')
 
+    # Parse all posts; only those whose source changed are rendered
+    posts = []
+    changed = []
+    for md_file in sorted(md_files):
         with open(md_file, 'r', encoding='utf-8') as f:
             content = f.read()
 
@@ -260,9 +318,6 @@ Your markdown content here...
             print(f"  Warning: No date in frontmatter, skipping {md_file.name}")
             continue
 
-        # Convert markdown to HTML
-        html_content = markdown_to_html(md_content)
-
         # Generate slug
         slug = frontmatter.get('slug', generate_slug(md_file.stem))
 
@@ -270,8 +325,16 @@ Your markdown content here...
         date_obj = parse_date(frontmatter['date'])
         formatted_date = format_date(frontmatter['date'])
 
-        # Extract excerpt
-        excerpt = frontmatter.get('description', extract_excerpt(html_content))
+        # The description doubles as the excerpt; otherwise it is taken from
+        # the rendered post, or from the cache if the post is unchanged
+        digest = hash_inputs(CODE_VERSION, post_template, content)
+        cached = cache.get(md_file.name, {})
+        if 'description' in frontmatter:
+            excerpt = frontmatter['description']
+        elif cached.get('digest') == digest:
+            excerpt = cached['excerpt']
+        else:
+            excerpt = None
 
         # Create post data
         post_data = {
@@ -282,30 +345,71 @@ Your markdown content here...
             'author': frontmatter.get('author'),
             'description': frontmatter.get('description', ''),
             'slug': slug,
-            'html_content': html_content,
             'excerpt': excerpt,
             'filename': md_file.name,
         }
-
         posts.append(post_data)
 
-        # Generate individual post page
-        generate_post_page(post_data)
+        output_file = OUTPUT_DIR / f"{slug}.html"
+        if excerpt is None or not is_current(manifest, output_file, digest):
+            print(f"Processing: {md_file.name}")
+            changed.append((post_data, md_content, output_file, digest))
+
+    if changed:
+        args = ([post_data for post_data, *_ in changed], [md_content for _, md_content, *_ in changed])
+        if len(changed) > 1 and RENDER_WORKERS > 1:
+            with ProcessPoolExecutor(max_workers=min(RENDER_WORKERS, len(changed))) as pool:
+                excerpts = list(pool.map(render_post, *args))
+            # Writes in the worker processes don't reach this process's counters
+            for _, _, output_file, _ in changed:
+                instrumentation.count_write(output_file, os.path.getsize(output_file))
+        else:
+            excerpts = list(map(render_post, *args))
+
+        for (post_data, _, output_file, digest), excerpt in zip(changed, excerpts):
+            post_data['excerpt'] = excerpt
+            cache[post_data['filename']] = {'digest': digest, 'excerpt': excerpt}
+            record(manifest, output_file, digest)
+    print(f"Unchanged: {len(posts) - len(changed)} post(s)")
+
+    # Drop posts that no longer exist
+    for filename in set(cache) - {post['filename'] for post in posts}:
+        del cache[filename]
 
     if not posts:
         print("No valid posts to generate.")
+        save_manifest(manifest)
+        save_cache(cache)
         return
 
     # Sort posts by date (newest first)
     posts.sort(key=lambda p: p['date_obj'], reverse=True)
 
-    # Generate index page
-    generate_index_page(posts)
-
-    # Generate RSS feed
-    generate_rss_feed(posts)
-
-    print(f"\nBlog generation complete! Generated {len(posts)} post(s).")
+    # The index and feeds only show each post's metadata and excerpt
+    listing = hash_inputs(
+        CODE_VERSION,
+        file_digest(TEMPLATES_DIR / 'blog_index.html'),
+        [[post['slug'], post['title'], post['date'], post['author'], post['description'], post['excerpt']]
+         for post in posts],
+    )
+    index_file = OUTPUT_DIR / 'index.html'
+    feed_files = [OUTPUT_DIR / name for name in ('rss.xml', 'atom.xml', 'feed.json')]
+    if all(is_current(manifest, path, listing) for path in [index_file, *feed_files]):
+        print("Unchanged: index and feeds")
+    else:
+        # Generate index page
+        generate_index_page(posts)
+
+        # Generate RSS feed
+        generate_rss_feed(posts)
+
+        for path in [index_file, *feed_files]:
+            record(manifest, path, listing)
+
+    save_manifest(manifest)
+    save_cache(cache)
+
+    print(f"\nBlog generation complete! Generated {len(changed)} of {len(posts)} post(s).")
     print(f"View at: docs/blog/index.html")
 
 
@@ -0,0 +1,249 @@
+"""
+Shared HTTP client for every scraper in the project.
+
+All requests go through one requests.Session per host, so TCP and TLS
+connections are kept alive and reused across calls (and across the
+thumbnail download threads). On top of that the client provides:
+
+- a default (connect, read) timeout on every request
+- a token-bucket rate limit per host, so bulk backfills stay polite
+- retries with exponential backoff and jitter on connection errors,
+  timeouts, 429 and 5xx responses, honoring Retry-After when given
+- per-host metrics (requests, retries, errors, bytes, latency), printed by
+  `print_stats()` at the end of a run
+
+Modules use the module-level `get()`/`post()` helpers, which share a
+lazily created default client.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# (connect, read) timeout in seconds, used when a caller doesn't pass one
+DEFAULT_TIMEOUT = (10, 60)
+
+MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', 4))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Connections kept open per host (enough for the thumbnail download pool)
+POOL_SIZE = 16
+
+USER_AGENT = 'kissimmee.fyi (+https://kissimmee.fyi)'
+
+# Requests per second and burst size, per host
+DEFAULT_RATE_LIMIT = (20, 40)
+HOST_RATE_LIMITS = {
+    'floridapublicnotices.com': (2, 4),
+    'kissimmeefl.api.civicclerk.com': (20, 40),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts of `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (possibly going negative) so waiters queue up in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class HostStats:
+    """Counters for the requests made to one host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.throttled_seconds = 0.0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def retry_after_seconds(response):
+    """Return the delay requested by a Retry-After header, or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class HttpClient:
+    """Pooled, rate-limited, retrying HTTP client."""
+
+    def __init__(self, rate_limits=None, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES):
+        self.rate_limits = {**HOST_RATE_LIMITS, **(rate_limits or {})}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                self._sessions[host] = session
+                self._buckets[host] = TokenBucket(*self.rate_limits.get(host, DEFAULT_RATE_LIMIT))
+                self._stats[host] = HostStats()
+            return self._sessions[host], self._buckets[host], self._stats[host]
+
+    def request(self, method, url, retry=True, **kwargs):
+        """
+        Send a request through the host's pooled session.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            retry: Whether to retry on connection errors, 429 and 5xx responses
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The final response (which may still be an error status)
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlsplit(url).netloc
+        session, bucket, stats = self._host_state(host)
+        max_retries = self.max_retries if retry else 0
+
+        for attempt in range(max_retries + 1):
+            waited = bucket.acquire()
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    stats.requests += 1
+                    stats.errors += 1
+                    stats.seconds += elapsed
+                    stats.throttled_seconds += waited
+                if attempt == max_retries:
+                    raise
+                delay = backoff_seconds(attempt)
+                logging.warning("%s %s failed (%s), retrying in %.1fs", method, url, e, delay)
+            else:
+                elapsed = time.perf_counter() - start
+                size = int(response.headers.get('Content-Length', 0)) if kwargs.get('stream') else len(response.content)
+                with self._lock:
+                    stats.requests += 1
+                    stats.bytes += size
+                    stats.seconds += elapsed
+                    stats.max_seconds = max(stats.max_seconds, elapsed)
+                    stats.throttled_seconds += waited
+                    if response.status_code >= 400:
+                        stats.errors += 1
+                logging.debug("%s %s -> %d, %d bytes in %.2fs", method, url, response.status_code, size, elapsed)
+
+                if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_seconds(attempt)
+                delay = min(delay, BACKOFF_MAX)
+                response.close()
+                logging.warning("%s %s returned %d, retrying in %.1fs", method, url, response.status_code, delay)
+
+            with self._lock:
+                stats.retries += 1
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """Return a {host: counters} snapshot of the requests made so far."""
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._buckets.clear()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared default client, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def get(url, **kwargs):
+    """GET `url` through the shared client (see HttpClient.request)."""
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST to `url` through the shared client (see HttpClient.request)."""
+    return get_client().post(url, **kwargs)
+
+
+def print_stats():
+    """Print per-host request metrics for the shared client."""
+    stats = get_client().stats()
+    if not stats:
+        return
+    print("HTTP requests:")
+    for host, s in sorted(stats.items()):
+        average = s['seconds'] / s['requests'] if s['requests'] else 0
+        print(f"  {host}: {s['requests']} requests, {s['retries']} retries, {s['errors']} errors, "
+              f"{s['bytes'] / 1024:.0f} KB, avg {average * 1000:.0f} ms, max {s['max_seconds'] * 1000:.0f} ms, "
+              f"throttled {s['throttled_seconds']:.1f}s")
@@ -0,0 +1,234 @@
+"""
+Lightweight timing and resource instrumentation for pipeline runs.
+
+    with instrumentation.span('thumbnails'):
+        ...
+    instrumentation.count('notices_parsed', len(notices))
+    instrumentation.write_report()
+
+Spans nest (a span opened inside 'pages' is reported as 'pages/pab'), and
+each records its start offset, duration and the peak RSS of the process so
+far. Counters are plain sums; every file written through atomic_write is
+counted (with its bytes) by a write hook. Files written in worker processes
+are counted by their callers with count_write(), since a child's counters
+never reach the parent. write_report() saves all of it, with any extra sections (e.g. HTTP
+stats), to run_report.json (or RUN_REPORT_PATH), so reports from successive
+runs can be compared.
+
+A single stage can be profiled without touching the code by naming its span
+path in PROFILE_SPANS (comma-separated, e.g. "thumbnails,pages/pab"). Its
+profile is written to profiles/ (or PROFILE_DIR) and summarized on stdout.
+PROFILER=pyinstrument uses pyinstrument instead of cProfile, if installed.
+"""
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from atomic_io import add_write_hook, atomic_write_json
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = Path(os.environ.get('RUN_REPORT_PATH', PROJECT_ROOT / 'run_report.json'))
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', PROJECT_ROOT / 'profiles'))
+PROFILE_SPANS = frozenset(name.strip() for name in os.environ.get('PROFILE_SPANS', '').split(',') if name.strip())
+PROFILER = os.environ.get('PROFILER', 'cprofile')
+
+_lock = threading.Lock()
+_local = threading.local()
+_started_at = datetime.now(timezone.utc)
+_start = time.perf_counter()
+_spans = []
+_counters = {}
+_profiling = False
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """Peak resident set size so far, in MB (RUSAGE_CHILDREN for terminated child processes)."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _record(path, start, seconds, **fields):
+    entry = {
+        'name': path,
+        'start': round(start - _start, 4),
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        **fields,
+    }
+    with _lock:
+        _spans.append(entry)
+
+
+@contextmanager
+def span(name, **fields):
+    """Time a block as a span named `name` (nested under any open span); extra fields go into its record."""
+    stack = _stack()
+    stack.append(name)
+    path = '/'.join(stack)
+    start = time.perf_counter()
+    error = None
+    try:
+        with _profiled(path):
+            yield
+    except BaseException as e:
+        error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        stack.pop()
+        if error:
+            fields['error'] = error
+        _record(path, start, time.perf_counter() - start, **fields)
+
+
+def timed(iterable, name):
+    """
+    Yield from `iterable`, recording the time spent waiting on it as a span.
+
+    Useful for lazy sources (like the paged notice feed) whose cost is
+    otherwise folded into whatever consumes them.
+    """
+    path = '/'.join(_stack() + [name])
+    first = time.perf_counter()
+    waited = 0.0
+    items = 0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                waited += time.perf_counter() - start
+            items += 1
+            yield item
+    finally:
+        _record(path, first, waited, items=items)
+
+
+def count(name, n=1):
+    """Add `n` to the counter `name`."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def count_write(path, size):
+    """Count a written file of `size` bytes (as files_written and bytes_written)."""
+    with _lock:
+        _counters['files_written'] = _counters.get('files_written', 0) + 1
+        _counters['bytes_written'] = _counters.get('bytes_written', 0) + size
+
+
+add_write_hook(count_write)
+
+
+@contextmanager
+def _profiled(path):
+    global _profiling
+    if path not in PROFILE_SPANS and path.rsplit('/', 1)[-1] not in PROFILE_SPANS:
+        yield
+        return
+    with _lock:
+        # Only one profiler can run at a time
+        if _profiling:
+            nested = True
+        else:
+            nested = False
+            _profiling = True
+    if nested:
+        yield
+        return
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    filename = path.replace('/', '.')
+    try:
+        if PROFILER == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("Warning: pyinstrument is not installed; using cProfile")
+            else:
+                profiler = Profiler()
+                profiler.start()
+                try:
+                    yield
+                finally:
+                    profiler.stop()
+                    output_path = PROFILE_DIR / f'{filename}.html'
+                    output_path.write_text(profiler.output_html(), encoding='utf-8')
+                    print(profiler.output_text(unicode=True, color=False))
+                    print(f"Profile of {path} written to {output_path}")
+                return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            output_path = PROFILE_DIR / f'{filename}.prof'
+            profiler.dump_stats(output_path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(20)
+            print(summary.getvalue())
+            print(f"Profile of {path} written to {output_path}")
+    finally:
+        with _lock:
+            _profiling = False
+
+
+def report(error=None, **extra):
+    """Return the run report: spans in start order, counters, peak RSS and any `extra` sections."""
+    with _lock:
+        # Parents first where a child starts within the same rounded instant
+        spans = sorted(_spans, key=lambda s: (s['start'], s['name'].count('/')))
+        counters = dict(sorted(_counters.items()))
+    return {
+        'script': os.path.basename(sys.argv[0]) or None,
+        'started_at': _started_at.isoformat(timespec='seconds'),
+        'seconds': round(time.perf_counter() - _start, 3),
+        'status': 'error' if error else 'ok',
+        'error': f'{type(error).__name__}: {error}' if error else None,
+        'python': sys.version.split()[0],
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_rss_children_mb': round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        'spans': spans,
+        'counters': counters,
+        **extra,
+    }
+
+
+def write_report(path=REPORT_PATH, error=None, **extra):
+    """Write the run report (see `report`) to `path` and print a per-span summary."""
+    run_report = report(error, **extra)
+    try:
+        atomic_write_json(path, run_report, indent=2, ensure_ascii=False)
+    except IOError as e:
+        print(f"Error: Could not write run report to {path}: {e}")
+        return run_report
+
+    # Spans repeated per category are summed
+    totals = {}
+    for entry in run_report['spans']:
+        totals[entry['name']] = totals.get(entry['name'], 0.0) + entry['seconds']
+    print(f"Run report ({run_report['seconds']:.1f}s, peak RSS {run_report['peak_rss_mb']:.0f} MB) written to {path}")
+    for name, seconds in totals.items():
+        print(f"  {'  ' * name.count('/')}{name.rsplit('/', 1)[-1]}: {seconds:.2f}s")
+    return run_report
@@ -0,0 +1,104 @@
+"""
+Versioned inverted indexes from keys (parcels, addresses, case numbers) to notices.
+
+An index is a JSON object:
+
+    version    code_version() of the modules that built it
+    notices    {notice ID: summary} of every indexed notice, including the
+               keys it is filed under
+    <table>    {key: [notice ID, ...]} for each kind of key, IDs in numeric order
+
+plus whatever else the owning module keeps alongside (e.g. the case index's
+transcripts). property_index and case_index build theirs with these helpers:
+update() removes a notice's old keys before adding its new ones, so re-merging
+a notice is idempotent, and load_index() discards an index built by other code
+so that it is rebuilt from the stores.
+"""
+import json
+import os
+
+from atomic_io import atomic_write_json
+
+
+def empty_index(version, *tables):
+    """Return an index with no notices and an empty {key: [notice ID, ...]} table per name in `tables`."""
+    return {'version': version, 'notices': {}, **{table: {} for table in tables}}
+
+
+def load_index(index_path, version, name):
+    """
+    Load an index, or return None if it is missing or was built by other code.
+
+    Args:
+        index_path: Path to the index JSON file
+        version: The version the index must have been built with
+        name: What the index is called in warnings (e.g. 'case index')
+    """
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load {name} from {index_path}: {e}")
+        return None
+    return index if index.get('version') == version else None
+
+
+def save_index(index, index_path, name):
+    """Save an index to JSON file."""
+    try:
+        atomic_write_json(index_path, index, indent=1, sort_keys=True, ensure_ascii=False)
+    except IOError as e:
+        print(f"Error: Could not save {name} to {index_path}: {e}")
+
+
+def _remove(postings, key, notice_id):
+    ids = postings.get(key)
+    if ids and notice_id in ids:
+        ids.remove(notice_id)
+        if not ids:
+            del postings[key]
+
+
+def _add(postings, key, notice_id):
+    ids = postings.setdefault(key, [])
+    if notice_id not in ids:
+        ids.append(notice_id)
+        ids.sort(key=int)
+
+
+def update(index, notices, summarize, keys):
+    """
+    File `notices` under their keys, replacing any earlier entries.
+
+    Args:
+        index: The index
+        notices: Iterable of notices
+        summarize: Function returning the summary of a notice, or None to leave it out
+        keys: Function returning {table: [key, ...]} of the keys a summary is filed under
+
+    Returns:
+        int: Number of notices whose entry changed
+    """
+    changed = 0
+    for notice in notices:
+        notice_id = str(notice['id'])
+        summary = summarize(notice)
+        old = index['notices'].get(notice_id)
+        if old == summary:
+            continue
+
+        if old is not None:
+            for table, table_keys in keys(old).items():
+                for key in table_keys:
+                    _remove(index[table], key, notice_id)
+            del index['notices'][notice_id]
+
+        if summary is not None:
+            index['notices'][notice_id] = summary
+            for table, table_keys in keys(summary).items():
+                for key in table_keys:
+                    _add(index[table], key, notice_id)
+        changed += 1
+    return changed
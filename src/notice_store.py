@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Append-only storage for archived notices.
+
+Each category is stored in data/notices/ as two files:
+
+    {category}.jsonl     a log with one JSON notice record per line
+    {category}.idx.json  an index mapping notice IDs to the byte offset and
+                         length of their latest record, plus their pub_date,
+                         pub_epoch and last_seen, one notice per line
+
+Upserting a notice appends a line only when its content changed. `last_seen`,
+which changes every time a notice is seen again, is kept in the index, so a
+run that only re-sees notices never touches the log, and only the index
+lines of the notices it saw change. Superseded records are dropped by
+`compact()` once they outweigh the live ones.
+
+Merges go through `apply()`, which first writes the batch to
+{category}.journal.json. If the process dies before the index is updated, the
+journal is replayed the next time the store is opened (upserts are
+idempotent). Writers take an exclusive lock on {category}.lock, so the
+pipeline can run alongside other jobs touching the same store.
+
+Archives in the original {category}.json format ({"last_updated": ...,
+"notices": {id: notice}}) are imported automatically when a category has no
+log yet. The stores are the only committed copy of the archive; the old
+format can be reproduced at any time with:
+
+    python notice_store.py export [category ...]
+"""
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+from atomic_io import atomic_write, atomic_write_json, fsync_directory
+
+
+# Compact the log once superseded records take more space than this and than the live records
+COMPACT_MIN_GARBAGE_BYTES = 1024 * 1024
+
+
+class NoticeStore:
+    """Append-only notice log for one category, with an in-memory index."""
+
+    def __init__(self, directory, category):
+        self.directory = directory
+        self.category = category
+        self.log_path = os.path.join(directory, f'{category}.jsonl')
+        self.index_path = os.path.join(directory, f'{category}.idx.json')
+        self.legacy_path = os.path.join(directory, f'{category}.json')
+        self.journal_path = os.path.join(directory, f'{category}.journal.json')
+        self.lock_path = os.path.join(directory, f'{category}.lock')
+        self.last_updated = None
+        self._index = {}
+        self._log_size = 0
+        self._dirty = False
+        self._load_index()
+
+    @contextmanager
+    def locked(self):
+        """Hold the store's exclusive write lock, picking up any changes made by other writers."""
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+                if log_size != self._log_size:
+                    self._load_index()
+                yield self
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        self._index = {}
+        self._log_size = 0
+        if not os.path.exists(self.log_path):
+            return
+
+        log_size = os.path.getsize(self.log_path)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load index {self.index_path}: {e}")
+            index = None
+
+        # An index that doesn't describe the whole log is stale; rebuild it
+        if index is None or index.get('log_size') != log_size:
+            print(f"Rebuilding index for {self.log_path}")
+            self._rebuild_index()
+            return
+
+        self.last_updated = index.get('last_updated')
+        self._index = index['notices']
+        self._log_size = log_size
+
+    def _rebuild_index(self):
+        self._index = {}
+        offset = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if line.endswith(b'\n'):
+                    record = json.loads(line)
+                    self._index[str(record['id'])] = self._index_entry(record, offset, len(line))
+                else:
+                    break
+                offset += len(line)
+        # Drop a torn final record left by an interrupted append
+        if offset != os.path.getsize(self.log_path):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(offset)
+        self._log_size = offset
+        self._dirty = True
+
+    @staticmethod
+    def _index_entry(record, offset, length):
+        entry = {
+            'offset': offset,
+            'length': length,
+            'pub_date': record.get('pub_date'),
+            'last_seen': record.get('last_seen'),
+        }
+        # Only records with normalized dates have the key (see update_notices.backfill_normalized_dates)
+        if 'pub_epoch' in record:
+            entry['pub_epoch'] = record['pub_epoch']
+        return entry
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, notice_id):
+        return str(notice_id) in self._index
+
+    def ids(self):
+        """Return the IDs (as strings) of every stored notice."""
+        return set(self._index)
+
+    def index_entries(self):
+        """Return {id: index entry} (offset, length, pub_date, pub_epoch, last_seen), without reading the log."""
+        return dict(self._index)
+
+    def _read(self, f, entry):
+        f.seek(entry['offset'])
+        record = json.loads(f.read(entry['length']))
+        record['last_seen'] = entry['last_seen']
+        return record
+
+    def get(self, notice_id):
+        """Return the stored notice with this ID, or None."""
+        entry = self._index.get(str(notice_id))
+        if entry is None:
+            return None
+        with open(self.log_path, 'rb') as f:
+            return self._read(f, entry)
+
+    def iter_notices(self, notice_ids=None):
+        """Yield stored notices (all of them, or those in `notice_ids`) in log order."""
+        if notice_ids is None:
+            entries = list(self._index.values())
+        else:
+            entries = [self._index[str(i)] for i in notice_ids if str(i) in self._index]
+        if not entries:
+            return
+        entries.sort(key=lambda entry: entry['offset'])
+        with open(self.log_path, 'rb') as f:
+            for entry in entries:
+                yield self._read(f, entry)
+
+    def iter_by_date(self, start=None, end=None):
+        """
+        Yield notices whose pub_date falls within [start, end).
+
+        Args:
+            start: Inclusive lower bound as "YYYY-MM-DD" (default: unbounded)
+            end: Exclusive upper bound as "YYYY-MM-DD" (default: unbounded)
+        """
+        matching = [
+            notice_id for notice_id, entry in self._index.items()
+            if entry['pub_date']
+            and (start is None or entry['pub_date'] >= start)
+            and (end is None or entry['pub_date'] < end)
+        ]
+        return self.iter_notices(matching)
+
+    def upsert(self, notice, seen_at=None):
+        """
+        Insert or update a notice.
+
+        The record is appended to the log only if anything other than
+        `last_seen` differs from the stored version.
+
+        Returns:
+            str: 'new', 'updated' or 'unchanged'
+        """
+        notice_id = str(notice['id'])
+        seen_at = seen_at or notice.get('last_seen')
+        entry = self._index.get(notice_id)
+
+        if entry is not None:
+            stored = self.get(notice_id)
+            stored.pop('last_seen', None)
+            candidate = {k: v for k, v in notice.items() if k != 'last_seen'}
+            if candidate == stored:
+                if seen_at and entry['last_seen'] != seen_at:
+                    entry['last_seen'] = seen_at
+                    self._dirty = True
+                return 'unchanged'
+
+        record = dict(notice)
+        record['last_seen'] = seen_at
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with open(self.log_path, 'ab') as f:
+            f.write(line)
+        self._index[notice_id] = self._index_entry(record, self._log_size, len(line))
+        self._log_size += len(line)
+        self._dirty = True
+        return 'new' if entry is None else 'updated'
+
+    def garbage_bytes(self):
+        """Return the number of log bytes held by superseded records."""
+        return self._log_size - sum(entry['length'] for entry in self._index.values())
+
+    def compact(self):
+        """Rewrite the log keeping only the latest record of each notice."""
+        new_index = {}
+        offset = 0
+        with open(self.log_path, 'rb') as src, atomic_write(self.log_path, 'wb') as dst:
+            for notice_id, entry in sorted(self._index.items(), key=lambda item: item[1]['offset']):
+                src.seek(entry['offset'])
+                line = src.read(entry['length'])
+                dst.write(line)
+                new_index[notice_id] = dict(entry, offset=offset)
+                offset += len(line)
+        self._index = new_index
+        self._log_size = offset
+        self._dirty = True
+
+    def flush(self, last_updated=None):
+        """Write the index (compacting the log first if it is mostly garbage)."""
+        if last_updated:
+            self.last_updated = last_updated
+            self._dirty = True
+
+        garbage = self.garbage_bytes()
+        if garbage > COMPACT_MIN_GARBAGE_BYTES and garbage > self._log_size - garbage:
+            print(f"Compacting {self.log_path} ({garbage} bytes superseded)")
+            self.compact()
+
+        if not self._dirty:
+            return
+
+        # Appended records must be durable before an index that points at them
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb+') as f:
+                os.fsync(f.fileno())
+
+        self._write_index()
+        self._dirty = False
+
+    def _write_index(self):
+        # One notice per line, in ID order, so a commit's diff shows exactly the notices that changed
+        with atomic_write(self.index_path) as f:
+            f.write('{\n')
+            f.write(f'"last_updated": {json.dumps(self.last_updated)},\n')
+            f.write(f'"log_size": {self._log_size},\n')
+            f.write('"notices": {')
+            separator = '\n'
+            for notice_id in sorted(self._index, key=int):
+                entry = json.dumps(self._index[notice_id], sort_keys=True, separators=(',', ':'))
+                f.write(f'{separator}{json.dumps(notice_id)}: {entry}')
+                separator = ',\n'
+            f.write('\n}\n}\n')
+
+    def apply(self, records, seen_at=None, last_updated=None):
+        """
+        Journal and upsert a batch of notices, then flush the index.
+
+        Returns:
+            dict: Counts of 'new', 'updated' and 'unchanged' notices
+        """
+        records = list(records)
+        counts = {'new': 0, 'updated': 0, 'unchanged': 0}
+        with self.locked():
+            atomic_write_json(self.journal_path, {
+                'seen_at': seen_at,
+                'last_updated': last_updated,
+                'records': records,
+            }, ensure_ascii=False)
+            for record in records:
+                counts[self.upsert(record, seen_at=seen_at)] += 1
+            self.flush(last_updated)
+            os.remove(self.journal_path)
+            fsync_directory(self.directory)
+        return counts
+
+    def replay_journal(self):
+        """Re-apply a merge that was interrupted before it completed."""
+        if not os.path.exists(self.journal_path):
+            return
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # The journal is written atomically, so this only happens if it was damaged externally
+            print(f"Warning: Discarding unreadable journal {self.journal_path}: {e}")
+            os.remove(self.journal_path)
+            return
+        print(f"Replaying {len(journal['records'])} pending notices from {self.journal_path}")
+        self.apply(journal['records'], journal.get('seen_at'), journal.get('last_updated'))
+
+    def import_json(self, archive_path=None):
+        """Load every notice from a {category}.json archive into the store."""
+        archive_path = archive_path or self.legacy_path
+        with open(archive_path, 'r', encoding='utf-8') as f:
+            archive = json.load(f)
+        notices = archive.get('notices', {})
+        with self.locked():
+            for notice in notices.values():
+                self.upsert(notice)
+            self.flush(archive.get('last_updated'))
+        print(f"Imported {len(notices)} notices from {archive_path}")
+
+    def to_archive(self):
+        """Return the store contents in the {category}.json archive format."""
+        notices = {str(notice['id']): notice for notice in self.iter_notices()}
+        return {'last_updated': self.last_updated, 'notices': notices}
+
+    def export_json(self, archive_path=None):
+        """Write the store contents to a {category}.json archive."""
+        archive_path = archive_path or self.legacy_path
+        archive = self.to_archive()
+        atomic_write_json(archive_path, archive, indent=2, ensure_ascii=False)
+        print(f"Exported {len(archive['notices'])} notices to {archive_path}")
+
+
+def open_store(directory, category):
+    """Open a category's store, importing its legacy JSON archive on first use
+    and replaying any merge left unfinished by a previous run."""
+    store = NoticeStore(directory, category)
+    if not os.path.exists(store.log_path) and os.path.exists(store.legacy_path):
+        store.import_json()
+    store.replay_journal()
+    return store
+
+
+def main():
+    """Export stores to {category}.json: python notice_store.py export [category ...]"""
+    if len(sys.argv) < 2 or sys.argv[1] != 'export':
+        print(main.__doc__)
+        sys.exit(1)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    notices_dir = os.path.join(script_dir, '..', 'data', 'notices')
+    categories = sys.argv[2:] or sorted(
+        filename[:-len('.jsonl')] for filename in os.listdir(notices_dir) if filename.endswith('.jsonl')
+    )
+    for category in categories:
+        open_store(notices_dir, category).export_json()
+
+
+if __name__ == '__main__':
+    main()
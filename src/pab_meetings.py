@@ -1,74 +1,172 @@
+"""
+Harvest meeting events, media and closed captions from the CivicClerk portal.
+
+Every board's events are kept in data/events.json and their media in
+data/events_media.json. Planning Advisory Board meetings are also kept in
+data/pab_meetings.json and data/pab_meetings_media.json, and their closed
+captions are downloaded to data/pab_meetings/ by the transcripts module and
+indexed for search by transcript_index.
+
+By default only events that may have changed since the last run are
+fetched: those starting within LOOKBACK_DAYS of today or of the latest
+start time seen (whichever is earlier), or later, plus any created after
+the latest creation time seen. These high-water marks are kept in
+data/civicclerk_sync.json. Run with --full (or without a state file) to
+backfill everything since START_DATE. Either way the results are merged
+into the existing files, which are only rewritten when something other
+than a volatile field (VOLATILE_FIELDS) changed.
+"""
 import json
-import requests
-import calendar
-from datetime import date
-import tqdm
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
 
+import http_client
+from atomic_io import atomic_write_json
+from civicclerk import harvest_changed_events, harvest_events
+from transcript_index import build_index
+from transcripts import fetch_transcripts
 
-def get_events_for_month(year: int = 2025, month: int = 1):
-    start_date = f"{year}-{month:02d}-01"
 
-    last_day = calendar.monthrange(year, month)[1]
-    end_date = f"{year}-{month:02d}-{last_day:02d}"
-    response = requests.get(
-        f"https://kissimmeefl.api.civicclerk.com/v1/Events?$filter=startDateTime+ge+{start_date}+and+startDateTime+lt+{end_date}&$orderby=startDateTime+asc,+eventName+asc"
-    )
-    return response.json()["value"]
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+SYNC_STATE_PATH = DATA_DIR / "civicclerk_sync.json"
 
+# The portal's history starts in June 2023
+START_DATE = date(2023, 6, 1)
 
-all_events = {}
+# Recent meetings keep changing after they happen (cancellations, minutes,
+# video and captions are posted days or weeks later), so each sync
+# re-fetches everything that started up to this long ago
+LOOKBACK_DAYS = 60
+
+# CivicClerk fields that change between fetches without anything happening
+# to the meeting (play counts and live-stream state). They are ignored when
+# deciding whether a stored record changed.
+VOLATILE_FIELDS = ("mediaTotalPlay", "isLive", "liveIsCurrentlyStreaming", "streamingStatus")
 
-# For every month from June 2023 to now.
-startDate = "2023-06-01"
-endDate = date.today().strftime("%Y-%m-%d")
-for year in tqdm.trange(2023, 2025):
-    for month in tqdm.trange(1, 13):
-        current_date = f"{year}-{month:02d}-01"
-        if current_date < startDate or current_date > endDate:
-            continue
-        events = get_events_for_month(year, month)
-        all_events |= {event["id"]: event for event in events}
 
-print(f"Found {len(all_events)} events")
+def is_pab_meeting(event):
+    """Return True if a CivicClerk event is a Planning Advisory Board meeting."""
+    return event.event_name.startswith("Planning")
 
 
-with open("data/events.json", "w") as f:
-    json.dump(all_events, f, indent=2)
+def load_sync_state(path=SYNC_STATE_PATH):
+    """Load the sync high-water marks, or None if there has been no sync yet."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load sync state from {path}: {e}")
+        return None
 
-pab_meetings = {
-    id: event
-    for id, event in all_events.items()
-    if event["eventName"].startswith("Planning")
-}
 
-with open("data/pab_meetings.json", "w") as f:
-    json.dump(pab_meetings, f, indent=2)
+def save_sync_state(state, path=SYNC_STATE_PATH):
+    atomic_write_json(path, state, indent=2)
 
-print(f"Number of PAB meetings: {len(pab_meetings)}")
 
+def sync_window_start(state, today=None):
+    """Return the earliest start date whose events must be re-fetched."""
+    today = (today or date.today()).isoformat()
+    max_start = (state.get("max_start_date_time") or today)[:10]
+    return date.fromisoformat(min(today, max_start)) - timedelta(days=LOOKBACK_DAYS)
 
-def get_event_media(event_id: str) -> dict:
-    response = requests.get(
-        f"https://kissimmeefl.api.civicclerk.com/v1/EventsMedia/{event_id}"
-    )
-    return response.json()
 
+def _stable(record):
+    return {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
 
-medias = {}
 
-for id in pab_meetings:
-    print(f"Processing PAB meeting {id}")
-    media = get_event_media(id)
-    medias[id] = media
+def merge_records(path, records):
+    """
+    Merge {id: record} into the JSON object stored at `path`.
 
-with open("data/pab_meetings_media.json", "w") as f:
-    json.dump(medias, f, indent=2)
+    The file is only rewritten if a record was added or changed in a field
+    other than VOLATILE_FIELDS; a stored record differing only in those is
+    kept as it is.
 
+    Returns:
+        tuple: (merged records, number new, number updated)
+    """
+    existing = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
 
-for id, item in medias.items():
-    if url := item.get("closedCaptionUrl"):
-        response = requests.get(url)
-        filename = f"data/pab_meetings/{pab_meetings[id]['eventDate'][:10]}.srt"
-        print(f"Downloading transcript for {filename}")
-        with open(filename, "wb") as f:
-            f.write(response.content)
+    new = updated = 0
+    for id, record in records.items():
+        id = str(id)
+        if id not in existing:
+            new += 1
+        elif _stable(existing[id]) != _stable(record):
+            updated += 1
+        else:
+            continue
+        existing[id] = record
+
+    if new or updated:
+        atomic_write_json(path, existing, indent=2)
+    return existing, new, updated
+
+
+def merge_events(events, media):
+    """Merge fetched events and media into every board's files and the PAB subsets."""
+    all_events, new, updated = merge_records(DATA_DIR / "events.json", {id: event.raw for id, event in events.items()})
+    print(f"Events: {new} new, {updated} updated, {len(all_events)} total")
+    _, new, updated = merge_records(DATA_DIR / "events_media.json", {id: item.raw for id, item in media.items()})
+    print(f"Event media: {new} new, {updated} updated")
+
+    pab_meetings = {id: event for id, event in events.items() if is_pab_meeting(event)}
+    print(f"Number of PAB meetings fetched: {len(pab_meetings)}")
+    all_pab_meetings, _, _ = merge_records(
+        DATA_DIR / "pab_meetings.json", {id: event.raw for id, event in pab_meetings.items()})
+    all_pab_media, _, _ = merge_records(
+        DATA_DIR / "pab_meetings_media.json", {id: item.raw for id, item in media.items() if id in pab_meetings})
+    return all_events, all_pab_meetings, all_pab_media
+
+
+def updated_sync_state(all_events):
+    """Compute new high-water marks from every stored event."""
+    return {
+        "max_start_date_time": max((e.get("startDateTime", "") for e in all_events.values()), default=None),
+        "max_created_on": max((e.get("createdOn", "") for e in all_events.values()), default=None),
+    }
+
+
+def transcript_jobs(pab_meetings, pab_media):
+    """List the stored PAB meetings that have closed captions, for fetch_transcripts."""
+    return [
+        {"event_id": int(id), "event_date": pab_meetings[id]["eventDate"], "url": item.get("closedCaptionUrl")}
+        for id, item in pab_media.items()
+        if id in pab_meetings and item.get("closedCaptionUrl")
+    ]
+
+
+def main():
+    """Sync events changed since the last run, or backfill everything with --full."""
+    state = load_sync_state()
+    start = time.perf_counter()
+
+    if state is None or "--full" in sys.argv[1:]:
+        print(f"Backfilling every event since {START_DATE}")
+        events, media = harvest_events(START_DATE, date.today())
+    else:
+        window_start = sync_window_start(state)
+        print(f"Syncing events starting on or after {window_start} or created after {state.get('max_created_on')}")
+        events, media = harvest_changed_events(window_start, state.get("max_created_on"))
+    print(f"Fetched {len(events)} events ({len(media)} with media) in {time.perf_counter() - start:.1f}s")
+
+    all_events, pab_meetings, pab_media = merge_events(events, media)
+
+    # Every stored transcript is checked, but unchanged ones cost no requests
+    fetch_transcripts(transcript_jobs(pab_meetings, pab_media))
+    build_index()
+    save_sync_state(updated_sync_state(all_events))
+    http_client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
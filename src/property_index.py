@@ -0,0 +1,157 @@
+"""
+Inverted index from parcels and street addresses to the notices that mention them.
+
+The index (data/property_index.json) holds:
+
+    notices    {notice ID: summary} of every notice with a parcel or address:
+               what a history page shows (category, title, dates, reference
+               number, description) and the keys it is filed under
+    parcels    {parcel number: [notice ID, ...]}
+    addresses  {normalized street address: [notice ID, ...]}
+
+so following one property from the Planning Advisory Board to the City
+Commission is a dictionary lookup rather than a scan of every archive.
+
+update() is called with the notices of each merge (see inverted_index for
+how entries are replaced). The index is only rebuilt from the stores when it
+is missing or this module changed.
+"""
+import re
+from pathlib import Path
+
+import inverted_index
+from build_manifest import code_version
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+INDEX_PATH = PROJECT_ROOT / 'data' / 'property_index.json'
+
+CODE_VERSION = code_version(__file__, inverted_index.__file__)
+
+# Osceola/Orange County parcel numbers, e.g. 19-25-30-00U0-0050-0000 or
+# 12-22-30-3378-01-6802. Extracted parcel strings often run on into the
+# following text, so numbers are searched for rather than split out.
+PARCEL_NUMBER_PATTERN = re.compile(r'\d{2}-\d{2}-\d{2}-[0-9A-Z]{4}-[0-9A-Z]{2,4}-[0-9A-Z]{4}')
+
+# Street addresses start with a house number
+ADDRESS_PATTERN = re.compile(r'^\d+[A-Z]?(?: [A-Z0-9]+)+$')
+
+ADDRESS_ABBREVIATIONS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'AVENUE': 'AVE', 'BOULEVARD': 'BLVD', 'CIRCLE': 'CIR', 'COURT': 'CT',
+    'DRIVE': 'DR', 'HIGHWAY': 'HWY', 'LANE': 'LN', 'PARKWAY': 'PKWY',
+    'PLACE': 'PL', 'ROAD': 'RD', 'STREET': 'ST', 'TERRACE': 'TER',
+    'TRAIL': 'TRL',
+}
+
+STREET_DIRECTIONS = frozenset(['N', 'S', 'E', 'W', 'NE', 'NW', 'SE', 'SW'])
+
+
+def parcel_numbers(parcel_id_string):
+    """
+    Return the distinct parcel numbers in an extracted parcel ID string, in order.
+
+    This is the one parcel number extractor: the parcel index, the parcel
+    history links and the columnar export (export_notices.py) all use it.
+    """
+    text = re.sub(r'\s+', '', (parcel_id_string or '').upper())
+    return list(dict.fromkeys(PARCEL_NUMBER_PATTERN.findall(text)))
+
+
+def normalize_address(address):
+    """
+    Normalize a street address for matching ("2220 Fortune Road" -> "2220 FORTUNE RD").
+
+    Returns None for extracted "addresses" that don't start with a house number,
+    or that are cut off before the street name ("211 E").
+    """
+    words = re.sub(r'[^A-Z0-9 ]', ' ', (address or '').upper()).split()
+    if words[:2] == ['OR', 'ABOUT']:
+        words = words[2:]
+    words = [ADDRESS_ABBREVIATIONS.get(word, word) for word in words]
+    if not any(word not in STREET_DIRECTIONS for word in words[1:]):
+        return None
+    normalized = ' '.join(words)
+    return normalized if ADDRESS_PATTERN.match(normalized) else None
+
+
+def notice_summary(notice, category):
+    """Return the index's summary of a notice, or None if it has no parcel or address."""
+    address = normalize_address(notice.get('property_address'))
+    parcels = parcel_numbers(notice.get('parcel_id'))
+    if not parcels and not address:
+        return None
+    return {
+        'category': category,
+        'title': notice.get('title'),
+        'description': notice.get('description'),
+        'pub_date': notice.get('pub_date'),
+        'pub_epoch': notice.get('pub_epoch'),
+        'meeting_date': notice.get('meeting_date'),
+        'reference_num': notice.get('reference_num'),
+        'property_address': notice.get('property_address') if address else None,
+        'parcels': parcels,
+        'address': address,
+    }
+
+
+def _keys(summary):
+    return {'parcels': summary['parcels'], 'addresses': [summary['address']] if summary['address'] else []}
+
+
+def empty_index():
+    return inverted_index.empty_index(CODE_VERSION, 'parcels', 'addresses')
+
+
+def load_index(index_path=INDEX_PATH):
+    """Load the property index, or return None if it is missing or was built by other code."""
+    return inverted_index.load_index(index_path, CODE_VERSION, 'property index')
+
+
+def save_index(index, index_path=INDEX_PATH):
+    """Save the property index to JSON file."""
+    inverted_index.save_index(index, index_path, 'property index')
+
+
+def update(index, category, notices):
+    """
+    File `notices` (of one category) under their parcels and address.
+
+    Returns:
+        int: Number of notices whose entry changed
+    """
+    return inverted_index.update(index, notices, lambda notice: notice_summary(notice, category), _keys)
+
+
+def rebuild(stores):
+    """Build the index from every notice in `stores` ({category: NoticeStore})."""
+    index = empty_index()
+    for category, store in stores.items():
+        update(index, category, store.iter_notices())
+    print(f"Rebuilt property index: {len(index['parcels'])} parcels, {len(index['addresses'])} addresses")
+    return index
+
+
+def _by_date(index, notice_ids):
+    return sorted(
+        ((notice_id, index['notices'][notice_id]) for notice_id in notice_ids),
+        key=lambda item: (item[1]['pub_epoch'] or 0, int(item[0])),
+    )
+
+
+def parcel_history(index, parcel):
+    """Return [(notice ID, summary), ...] of the notices about `parcel`, oldest first."""
+    return _by_date(index, index['parcels'].get(parcel, []))
+
+
+def related_by_address(index, parcel):
+    """Return notices at the same address as `parcel`'s notices that don't name the parcel, oldest first."""
+    own = set(index['parcels'].get(parcel, []))
+    addresses = {index['notices'][notice_id]['address'] for notice_id in own} - {None}
+    related = {
+        notice_id
+        for address in addresses
+        for notice_id in index['addresses'].get(address, [])
+        if notice_id not in own
+    }
+    return _by_date(index, related)
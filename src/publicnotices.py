@@ -1,6 +1,7 @@
-import requests
 import logging
 
+import http_client
+
 
 def get_kissimmee_planning_advisory_board_docs(
     offset=None, limit=12, keywords="meeting OR board OR commission OR workshop"
@@ -33,8 +34,77 @@ def get_kissimmee_planning_advisory_board_docs(
     logging.debug(
         f"Requesting documents from Florida Public Notices at {url=}, {headers=}, {data=}"
     )
-    response = requests.post(url, headers=headers, json=data)
-    import json
-
-    logging.debug("Got response:", json.dumps(response.json(), indent=2))
+    response = http_client.post(url, headers=headers, json=data)
+    logging.debug("Got response: %s %d bytes", response.status_code, len(response.content))
     return response
+
+
+def extract_raw_notices(data):
+    """
+    Pull the list of raw notices out of a Florida Public Notices response body.
+
+    The API has returned notices under `_embedded.notices`, under `results`,
+    and as a bare list, so all three shapes are accepted.
+    """
+    if isinstance(data, list):
+        return data
+    raw_notices = data.get('_embedded', {}).get('notices', [])
+    if not raw_notices:
+        raw_notices = data.get('results', [])
+    return raw_notices
+
+
+def iter_kissimmee_notices(
+    known_ids=None,
+    page_size=100,
+    max_notices=None,
+    keywords="meeting OR board OR commission OR workshop",
+):
+    """
+    Walk the Florida Public Notices feed page by page, yielding raw notices.
+
+    Pages are requested with an increasing `offset` until the feed runs dry,
+    `max_notices` have been yielded, or a whole page consists of notices
+    whose IDs are already in `known_ids`. The feed is sorted newest first, so
+    a fully known page means everything after it has been archived on an
+    earlier run and only the delta needs to be transferred.
+
+    Args:
+        known_ids: Collection of notice IDs (as strings) already archived
+        page_size: Number of notices to request per page (default: 100)
+        max_notices: Optional cap on the total number of notices yielded
+        keywords: Search keywords passed through to the API
+
+    Yields:
+        Raw notice dictionaries, in feed order, as each page arrives
+    """
+    known_ids = known_ids or set()
+    offset = 0
+    yielded = 0
+
+    while True:
+        response = get_kissimmee_planning_advisory_board_docs(
+            offset=offset, limit=page_size, keywords=keywords
+        )
+        response.raise_for_status()
+        page = extract_raw_notices(response.json())
+        logging.info("Fetched page at offset %d: %d notices", offset, len(page))
+
+        if not page:
+            return
+
+        all_known = True
+        for raw_notice in page:
+            if str(raw_notice.get('id')) not in known_ids:
+                all_known = False
+            yield raw_notice
+            yielded += 1
+            if max_notices is not None and yielded >= max_notices:
+                return
+
+        if all_known and known_ids:
+            logging.info("Page at offset %d is already archived, stopping", offset)
+            return
+        if len(page) < page_size:
+            return
+        offset += len(page)
@@ -0,0 +1,219 @@
+"""
+Static full-text search index for the site, served from docs/search/.
+
+Documents (notices, and meeting transcripts in chunks of a few dozen
+captions) are numbered as described below and written as:
+
+    meta.json            document count, chunk size, stopwords and the list of term shards
+    ids.json             the ID of every document, by "{kind}:{key}" (not read by the page)
+    ranks.json           the date rank of every document, by ID (0 for the oldest,
+                         null for a removed document), so the page can show the
+                         most recent matches whatever their IDs
+    docs/{n}.json        DOCS_PER_CHUNK documents each: [kind, title, url, date, snippet],
+                         or null for the ID of a removed document
+    terms/{prefix}.json  every term starting with `prefix` (its first PREFIX_LENGTH
+                         characters) mapped to the delta-encoded IDs of the
+                         documents containing it
+
+The search page (docs/search/index.html) only downloads meta.json, the
+shards of the query's terms, ranks.json and the document chunks of the
+results it shows, so a query costs a few small requests however large the archive
+grows. The last query term is matched as a prefix, which needs nothing
+beyond its own shard.
+
+A document keeps its ID across builds (ids.json is read back on every
+build), and new documents take the next free IDs, oldest first. A new
+notice, a backfilled one or a newly downloaded old transcript therefore
+never renumbers existing documents, and only the shards and chunks whose
+content changed are rewritten. IDs of removed documents are not reused.
+"""
+import json
+import os
+import re
+
+from atomic_io import atomic_write
+from srt import format_timestamp, iter_srt_file
+from transcript_index import discover_transcripts
+from transcripts import TRANSCRIPTS_DIR
+
+
+PREFIX_LENGTH = 2
+DOCS_PER_CHUNK = 100
+SNIPPET_LENGTH = 200
+
+# Captions per transcript document (roughly a minute of a meeting)
+CUES_PER_TRANSCRIPT_DOC = 20
+
+TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Terms too common to be worth indexing (the client drops them from queries too)
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or that the
+    this to was were will with
+""".split())
+
+
+def index_terms(text):
+    """Return the set of indexable terms in `text`."""
+    return {
+        term for term in TERM_PATTERN.findall(text.lower())
+        if len(term) >= PREFIX_LENGTH and term not in STOPWORDS
+    }
+
+
+def snippet(text, length=SNIPPET_LENGTH):
+    """Collapse whitespace and cut `text` to about `length` characters."""
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0] + '…'
+
+
+def transcript_documents(transcripts_dir=TRANSCRIPTS_DIR):
+    """Yield search documents for every transcript, one per CUES_PER_TRANSCRIPT_DOC captions."""
+    for meeting in discover_transcripts(transcripts_dir):
+        cues = []
+
+        def document():
+            start_ms = cues[0].start_ms
+            text = ' '.join(cue.text for cue in cues)
+            video_url = meeting['video_url']
+            return {
+                'kind': 'transcript',
+                'key': f"{meeting['file']}:{cues[0].index}",
+                'title': f"Planning Advisory Board meeting, {meeting['date']} at {format_timestamp(start_ms)}",
+                'url': f"{video_url}#t={start_ms // 1000}" if video_url else None,
+                'date': meeting['date'],
+                'snippet': snippet(text),
+                'text': text,
+            }
+
+        for cue in iter_srt_file(os.path.join(transcripts_dir, meeting['file'])):
+            cues.append(cue)
+            if len(cues) == CUES_PER_TRANSCRIPT_DOC:
+                yield document()
+                cues = []
+        if cues:
+            yield document()
+
+
+def _write_if_changed(path, content):
+    """Write `content` to `path` unless it already holds exactly that. Returns True if written."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    with atomic_write(path) as f:
+        f.write(content)
+    return True
+
+
+def _sync_directory(directory, files):
+    """Make `directory` hold exactly `files` ({name: content}). Returns (written, deleted) counts."""
+    os.makedirs(directory, exist_ok=True)
+    written = sum(_write_if_changed(os.path.join(directory, name), content) for name, content in files.items())
+    deleted = 0
+    for name in os.listdir(directory):
+        if name.endswith('.json') and name not in files:
+            os.remove(os.path.join(directory, name))
+            deleted += 1
+    return written, deleted
+
+
+def load_doc_ids(search_dir):
+    """Return the persisted {"next_id": n, "ids": {"{kind}:{key}": id}} of a search index."""
+    path = os.path.join(search_dir, 'ids.json')
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load search document IDs from {path}: {e}")
+    return {'next_id': 0, 'ids': {}}
+
+
+def assign_doc_ids(documents, doc_ids):
+    """
+    Give every document its persisted ID, and new documents the next free ones.
+
+    Args:
+        documents: Documents in (date, kind, key) order
+        doc_ids: load_doc_ids() state, updated in place (IDs of documents no
+                 longer present are dropped, but never reused)
+
+    Returns:
+        dict: {id: document}
+    """
+    ids = doc_ids['ids']
+    by_id = {}
+    for document in documents:
+        key = f"{document['kind']}:{document['key']}"
+        if key not in ids:
+            ids[key] = doc_ids['next_id']
+            doc_ids['next_id'] += 1
+        by_id[ids[key]] = document
+    live = {f"{d['kind']}:{d['key']}" for d in documents}
+    for key in [key for key in ids if key not in live]:
+        del ids[key]
+    return by_id
+
+
+def write_search_index(documents, search_dir):
+    """
+    Write the sharded search index for `documents`.
+
+    Args:
+        documents: Iterable of dicts with `kind`, `key` (unique within the
+                   kind), `title`, `url`, `date`, `snippet` and `text`
+        search_dir: Output directory (docs/search)
+
+    Returns:
+        int: Number of documents indexed
+    """
+    documents = sorted(documents, key=lambda d: (d['date'] or '', d['kind'], d['key']))
+    id_state = load_doc_ids(search_dir)
+    by_id = assign_doc_ids(documents, id_state)
+
+    postings = {}
+    for doc_id in sorted(by_id):
+        document = by_id[doc_id]
+        for term in index_terms(f"{document['title']} {document['text']}"):
+            postings.setdefault(term, []).append(doc_id)
+
+    shards = {}
+    for term in sorted(postings):
+        # Postings are built in ID order; store gaps, which are mostly small numbers
+        doc_ids = postings[term]
+        shards.setdefault(term[:PREFIX_LENGTH], {})[term] = [doc_ids[0]] + [b - a for a, b in zip(doc_ids, doc_ids[1:])]
+
+    term_files = {f'{prefix}.json': json.dumps(shard, separators=(',', ':')) for prefix, shard in shards.items()}
+    doc_files = {}
+    for chunk in sorted({doc_id // DOCS_PER_CHUNK for doc_id in by_id}):
+        rows = []
+        for doc_id in range(chunk * DOCS_PER_CHUNK, min((chunk + 1) * DOCS_PER_CHUNK, id_state['next_id'])):
+            d = by_id.get(doc_id)
+            rows.append([d['kind'], d['title'], d['url'], d['date'], d['snippet']] if d else None)
+        doc_files[f'{chunk}.json'] = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))
+
+    term_written, term_deleted = _sync_directory(os.path.join(search_dir, 'terms'), term_files)
+    doc_written, doc_deleted = _sync_directory(os.path.join(search_dir, 'docs'), doc_files)
+    # `documents` is in date order; IDs are not
+    ranks = [None] * id_state['next_id']
+    for rank, document in enumerate(documents):
+        ranks[id_state['ids'][f"{document['kind']}:{document['key']}"]] = rank
+    meta = {
+        'version': 1,
+        'doc_count': id_state['next_id'],
+        'docs_per_chunk': DOCS_PER_CHUNK,
+        'prefix_length': PREFIX_LENGTH,
+        'stopwords': sorted(STOPWORDS),
+        'shards': sorted(shards),
+    }
+    # One document per line, so a commit's diff shows only the documents added or removed
+    _write_if_changed(os.path.join(search_dir, 'ids.json'), json.dumps(id_state, indent=0, sort_keys=True) + '\n')
+    _write_if_changed(os.path.join(search_dir, 'ranks.json'), json.dumps(ranks, separators=(',', ':')))
+    _write_if_changed(os.path.join(search_dir, 'meta.json'), json.dumps(meta, separators=(',', ':')))
+
+    print(f"  Search index: {len(documents)} documents, {len(postings)} terms in {len(shards)} shards "
+          f"({term_written + doc_written} files written, {term_deleted + doc_deleted} deleted)")
+    return len(documents)
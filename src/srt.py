@@ -0,0 +1,80 @@
+"""
+Streaming parser for SubRip (.srt) caption files.
+
+Files are read line by line and cues are yielded as they are completed, so a
+transcript is never loaded whole. The CivicClerk captions start with a BOM
+and mix \\n and \\r\\n line endings; both are handled.
+"""
+import re
+
+
+TIMING_PATTERN = re.compile(
+    r'(\d+):(\d{2}):(\d{2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{1,3})'
+)
+
+
+class Cue:
+    """One caption: its sequence number, start/end time in milliseconds, and text."""
+
+    __slots__ = ('index', 'start_ms', 'end_ms', 'text')
+
+    def __init__(self, index, start_ms, end_ms, text):
+        self.index = index
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.text = text
+
+    def __repr__(self):
+        return f"Cue({self.index}, {format_timestamp(self.start_ms)}, {self.text!r})"
+
+
+def _to_ms(hours, minutes, seconds, millis):
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis.ljust(3, '0'))
+
+
+def format_timestamp(ms):
+    """Format milliseconds as H:MM:SS."""
+    seconds = ms // 1000
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def iter_cues(lines):
+    """
+    Yield a Cue for every block in an iterable of SRT lines.
+
+    Blocks without a timing line are skipped; a missing or non-numeric
+    sequence number is tolerated (the running count is used instead).
+    """
+    count = 0
+    block = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            block.append(line)
+            continue
+        if block:
+            cue = _parse_block(block, count + 1)
+            if cue is not None:
+                count += 1
+                yield cue
+            block = []
+    if block:
+        cue = _parse_block(block, count + 1)
+        if cue is not None:
+            yield cue
+
+
+def _parse_block(block, default_index):
+    for i, line in enumerate(block[:2]):
+        match = TIMING_PATTERN.search(line)
+        if match:
+            index = int(block[0]) if i == 1 and block[0].isdigit() else default_index
+            groups = match.groups()
+            return Cue(index, _to_ms(*groups[:4]), _to_ms(*groups[4:]), ' '.join(block[i + 1:]))
+    return None
+
+
+def iter_srt_file(path):
+    """Stream the cues of an .srt file."""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        yield from iter_cues(f)
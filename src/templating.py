@@ -0,0 +1,76 @@
+"""
+Precompiled page templates.
+
+A template from templates/ is parsed once into literal text and named
+slots, written either as HTML comments (<!-- NOTICES_PLACEHOLDER -->, slot
+"NOTICES") or as {{TITLE}} markers (slot "TITLE"). Rendering walks those
+segments once instead of copying the whole page for every placeholder, and
+render_to() writes them straight to a file, so even an archive page with
+thousands of notices is never assembled in memory.
+
+A slot's value is a string or an iterable of strings, which is written
+piece by piece. Slots without a value keep their placeholder text.
+"""
+import os
+import re
+
+
+SLOT_PATTERN = re.compile(r'<!-- ([A-Z_]+)_PLACEHOLDER -->|\{\{([A-Z_]+)\}\}')
+
+# Compiled templates by path, with the modification time they were read at
+_templates = {}
+
+
+class Template:
+    """A page template split into literal text and named slots."""
+
+    def __init__(self, source):
+        self.literals = []
+        self.slots = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.slots.append((match.group(1) or match.group(2), match.group(0)))
+            position = match.end()
+        self.literals.append(source[position:])
+
+    def pieces(self, values):
+        """Yield the rendered page in pieces, filling slots from `values` ({name: value})."""
+        counts = {}
+        for name, _ in self.slots:
+            counts[name] = counts.get(name, 0) + 1
+        # An iterator can only be consumed once; join it if its slot repeats
+        values = {
+            name: value if isinstance(value, str) or counts.get(name, 0) < 2 else ''.join(value)
+            for name, value in values.items()
+        }
+
+        for literal, (name, placeholder) in zip(self.literals, self.slots):
+            yield literal
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+        yield self.literals[-1]
+
+    def render(self, values):
+        """Return the rendered page as a string."""
+        return ''.join(self.pieces(values))
+
+    def render_to(self, f, values):
+        """Write the rendered page to the open text file `f`."""
+        for piece in self.pieces(values):
+            f.write(piece)
+
+
+def load_template(path):
+    """Return the compiled template at `path`, parsing it again only if the file changed."""
+    path = os.fspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _templates.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = (mtime, Template(f.read()))
+        _templates[path] = cached
+    return cached[1]
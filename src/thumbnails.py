@@ -0,0 +1,328 @@
+"""
+Generate JPEG thumbnails of the first page of notice PDFs.
+
+Downloads are I/O bound and run on a thread pool, while rasterizing through
+poppler and resizing with PIL is CPU bound and runs on a process pool. Each
+finished download is handed straight to the render pool, so the two stages
+overlap instead of running one notice at a time.
+
+A persistent cache (data/thumbnail_cache.json) records the PDF URL, ETag,
+Last-Modified and SHA-256 of the PDF each thumbnail was rendered from.
+Downloads are conditional on those validators, and a 304 or an unchanged
+content hash reuses the existing JPEG without rasterizing. Only the
+thumbnails of notices on the current pages are kept; archive pages show
+none, so every other thumbnail is evicted.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import http_client
+import instrumentation
+from atomic_io import atomic_write, atomic_write_json
+
+
+THUMBNAIL_DPI = 150
+THUMBNAIL_MAX_WIDTH = 400
+DOWNLOAD_TIMEOUT = 60
+
+# Worker counts can be tuned per environment (e.g. the GitHub Actions runner)
+DOWNLOAD_WORKERS = int(os.environ.get('THUMBNAIL_DOWNLOAD_WORKERS', 8))
+RENDER_WORKERS = int(os.environ.get('THUMBNAIL_RENDER_WORKERS', os.cpu_count() or 1))
+
+
+def thumbnail_filename(notice_id):
+    """Return the file name used for a notice's thumbnail."""
+    return f"{notice_id}.jpg"
+
+
+def download_pdf(pdf_url, timeout=DOWNLOAD_TIMEOUT):
+    """Download a PDF and return its bytes."""
+    response = http_client.get(pdf_url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def download_pdf_if_changed(pdf_url, etag=None, last_modified=None, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Conditionally download a PDF using cached validators.
+
+    Returns:
+        requests.Response: A 304 response if the server reports the PDF is
+                           unchanged, otherwise the full 200 response
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    response = http_client.get(pdf_url, headers=headers, timeout=timeout)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def load_thumbnail_cache(cache_path):
+    """Load the thumbnail cache manifest from JSON file."""
+    if not os.path.exists(cache_path):
+        return {"entries": {}}
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load thumbnail cache from {cache_path}: {e}")
+        return {"entries": {}}
+
+
+def save_thumbnail_cache(cache, cache_path):
+    """Save the thumbnail cache manifest to JSON file."""
+    try:
+        atomic_write_json(cache_path, cache, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"Error: Could not save thumbnail cache to {cache_path}: {e}")
+
+
+def render_thumbnail(pdf_bytes, thumbnail_path):
+    """
+    Rasterize the first page of a PDF and save it as a JPEG thumbnail.
+
+    Runs inside a worker process, so it only takes picklable arguments.
+
+    Returns:
+        float: Seconds spent rendering
+    """
+    from pdf2image import convert_from_bytes
+    from PIL import Image
+
+    start = time.perf_counter()
+
+    # Convert first page to image
+    images = convert_from_bytes(pdf_bytes, first_page=1, last_page=1, dpi=THUMBNAIL_DPI)
+    if not images:
+        raise ValueError("PDF has no pages")
+
+    # Resize to thumbnail (max width 400px, maintain aspect ratio)
+    img = images[0]
+    if img.width > THUMBNAIL_MAX_WIDTH:
+        ratio = THUMBNAIL_MAX_WIDTH / img.width
+        new_height = int(img.height * ratio)
+        img = img.resize((THUMBNAIL_MAX_WIDTH, new_height), Image.Resampling.LANCZOS)
+
+    # Save as JPEG
+    with atomic_write(thumbnail_path, 'wb') as f:
+        img.save(f, "JPEG", quality=85, optimize=True)
+
+    return time.perf_counter() - start
+
+
+def generate_pdf_thumbnail(pdf_url, notice_id, thumbnails_dir):
+    """Download PDF and generate thumbnail from first page."""
+    try:
+        pdf_bytes = download_pdf(pdf_url)
+        os.makedirs(thumbnails_dir, exist_ok=True)
+        render_thumbnail(pdf_bytes, os.path.join(thumbnails_dir, thumbnail_filename(notice_id)))
+
+        # Return relative path for HTML
+        return f"thumbnails/{thumbnail_filename(notice_id)}"
+
+    except Exception as e:
+        print(f"Warning: Failed to generate thumbnail for notice {notice_id}: {e}")
+        return None
+
+
+def _timed_download(pdf_url, etag=None, last_modified=None):
+    start = time.perf_counter()
+    response = download_pdf_if_changed(pdf_url, etag, last_modified)
+    return response, time.perf_counter() - start
+
+
+def generate_thumbnails(notices, thumbnails_dir, cache=None, download_workers=None, render_workers=None):
+    """
+    Generate thumbnails for many notices concurrently.
+
+    Args:
+        notices: Iterable of parsed notices; those without a `pdf_url` are skipped
+        thumbnails_dir: Directory to write `{id}.jpg` files into
+        cache: Thumbnail cache manifest from `load_thumbnail_cache`, updated in
+               place (default: no caching)
+        download_workers: Size of the download thread pool (default: DOWNLOAD_WORKERS)
+        render_workers: Size of the render process pool (default: RENDER_WORKERS)
+
+    Returns:
+        dict: {notice_id: report} where each report has `status` ('ok',
+              'cached', 'download_failed' or 'render_failed'), `thumbnail_url`,
+              `error`, `bytes`, `download_seconds` and `render_seconds`
+    """
+    download_workers = download_workers or DOWNLOAD_WORKERS
+    render_workers = render_workers or RENDER_WORKERS
+    entries = cache.setdefault('entries', {}) if cache is not None else {}
+    os.makedirs(thumbnails_dir, exist_ok=True)
+
+    report = {}
+    pending = {}
+    for notice in notices:
+        if notice.get('pdf_url'):
+            pending[notice['id']] = notice['pdf_url']
+            report[notice['id']] = {
+                'status': None,
+                'thumbnail_url': None,
+                'error': None,
+                'bytes': 0,
+                'download_seconds': None,
+                'render_seconds': None,
+            }
+
+    if not pending:
+        return report
+
+    with ThreadPoolExecutor(max_workers=download_workers) as downloads, \
+            ProcessPoolExecutor(max_workers=render_workers) as renders:
+        download_futures = {}
+        for notice_id, pdf_url in pending.items():
+            entry = entries.get(str(notice_id))
+            thumbnail_path = os.path.join(thumbnails_dir, thumbnail_filename(notice_id))
+            # Only send validators when the thumbnail they describe is still on disk
+            if entry and entry.get('pdf_url') == pdf_url and os.path.exists(thumbnail_path):
+                future = downloads.submit(_timed_download, pdf_url, entry.get('etag'), entry.get('last_modified'))
+            else:
+                future = downloads.submit(_timed_download, pdf_url)
+            download_futures[future] = notice_id
+
+        # Hand each changed PDF to the render pool as soon as it arrives
+        render_futures = {}
+        for future in as_completed(download_futures):
+            notice_id = download_futures[future]
+            item = report[notice_id]
+            try:
+                response, item['download_seconds'] = future.result()
+            except Exception as e:
+                item['status'] = 'download_failed'
+                item['error'] = str(e)
+                continue
+
+            thumbnail_path = os.path.join(thumbnails_dir, thumbnail_filename(notice_id))
+            entry = entries.get(str(notice_id))
+            validators = {
+                'pdf_url': pending[notice_id],
+                'etag': response.headers.get('ETag') or (entry or {}).get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or (entry or {}).get('last_modified'),
+            }
+
+            if response.status_code == 304:
+                item['status'] = 'cached'
+                entries[str(notice_id)] = {**(entry or {}), **validators}
+                continue
+
+            pdf_bytes = response.content
+            item['bytes'] = len(pdf_bytes)
+            validators['sha256'] = hashlib.sha256(pdf_bytes).hexdigest()
+
+            # Same PDF content as last time (or a pre-cache thumbnail being
+            # adopted): keep the existing JPEG
+            if os.path.exists(thumbnail_path) and (entry is None or entry.get('sha256') == validators['sha256']):
+                if cache is not None:
+                    item['status'] = 'cached'
+                    entries[str(notice_id)] = {**(entry or {}), **validators}
+                    continue
+
+            entries[str(notice_id)] = {**(entry or {}), **validators, 'pending': True}
+            render_futures[renders.submit(render_thumbnail, pdf_bytes, thumbnail_path)] = notice_id
+
+        for future in as_completed(render_futures):
+            notice_id = render_futures[future]
+            item = report[notice_id]
+            entry = entries[str(notice_id)]
+            del entry['pending']
+            try:
+                item['render_seconds'] = future.result()
+            except Exception as e:
+                item['status'] = 'render_failed'
+                item['error'] = str(e)
+                # Forget the validators so the next run retries the render
+                del entries[str(notice_id)]
+                continue
+            item['status'] = 'ok'
+            # Written in a worker process, whose counters don't reach this one
+            thumbnail_path = os.path.join(thumbnails_dir, thumbnail_filename(notice_id))
+            instrumentation.count_write(thumbnail_path, os.path.getsize(thumbnail_path))
+
+    for notice_id, item in report.items():
+        if item['status'] in ('ok', 'cached'):
+            item['thumbnail_url'] = f"thumbnails/{thumbnail_filename(notice_id)}"
+            thumbnail_path = os.path.join(thumbnails_dir, thumbnail_filename(notice_id))
+            if str(notice_id) in entries:
+                entries[str(notice_id)]['size'] = os.path.getsize(thumbnail_path)
+
+    return report
+
+
+def evict_thumbnails(thumbnails_dir, cache, keep_ids=()):
+    """
+    Delete every thumbnail except those of `keep_ids` (the notices on the current pages).
+
+    Archive pages don't show thumbnails, so nothing else in the directory is
+    ever displayed. Cache entries of deleted or missing thumbnails are dropped.
+
+    Args:
+        thumbnails_dir: Directory containing `{id}.jpg` files
+        cache: Thumbnail cache manifest, updated in place
+        keep_ids: Notice IDs whose thumbnails must be kept
+
+    Returns:
+        list: Paths of the deleted thumbnails
+    """
+    if not os.path.exists(thumbnails_dir):
+        return []
+
+    entries = cache.setdefault('entries', {})
+    keep_ids = {str(notice_id) for notice_id in keep_ids}
+
+    evicted = []
+    kept = set()
+    total_bytes = 0
+    for filename in sorted(os.listdir(thumbnails_dir)):
+        if not filename.endswith('.jpg'):
+            continue
+        notice_id = filename[:-4]  # Remove .jpg extension
+        filepath = os.path.join(thumbnails_dir, filename)
+        if notice_id in keep_ids:
+            kept.add(notice_id)
+            total_bytes += os.path.getsize(filepath)
+            continue
+        try:
+            os.remove(filepath)
+        except OSError as e:
+            print(f"  Warning: Could not delete {filepath}: {e}")
+            continue
+        evicted.append(filepath)
+
+    # Drop cache entries whose thumbnail is gone
+    for notice_id in list(entries):
+        if notice_id not in kept:
+            del entries[notice_id]
+
+    if evicted:
+        print(f"Evicted {len(evicted)} thumbnails of notices no longer on the current pages")
+    else:
+        print("No thumbnails to evict")
+    print(f"Thumbnails of current notices take {total_bytes / (1024 * 1024):.1f} MB")
+
+    return evicted
+
+
+def summarize_thumbnail_report(report):
+    """Print a per-notice summary of a `generate_thumbnails` report."""
+    counts = {}
+    for notice_id, entry in report.items():
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        if entry['status'] == 'ok':
+            print(f"  Generated thumbnail for notice {notice_id} "
+                  f"({entry['bytes']} bytes, download {entry['download_seconds']:.2f}s, "
+                  f"render {entry['render_seconds']:.2f}s)")
+        elif entry['status'] != 'cached':
+            print(f"  Warning: Failed to generate thumbnail for notice {notice_id} "
+                  f"({entry['status']}): {entry['error']}")
+    print("  " + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Inverted index over the meeting transcripts in data/pab_meetings/.
+
+The index lives in data/transcript_index/:
+
+    index.json     the meetings (event ID, date, video URL, and where their
+                   cues start in the files below) and the term dictionary,
+                   mapping each term to a slice of postings.bin
+    postings.bin   for each term, the sorted global IDs of the cues it
+                   appears in (uint32)
+    times.bin      the start time in milliseconds of every cue (uint32)
+    text.jsonl     the cue texts, one JSON list per meeting
+
+A query only reads the postings of its own terms and the text of the
+meetings that matched, so phrase searches across every meeting answer in
+milliseconds. Each hit links to the meeting video at the cue's timestamp.
+
+The index is rebuilt (in well under a second) whenever a transcript or
+video URL changes:
+
+    python transcript_index.py build
+    python transcript_index.py search "fortune road"
+"""
+import bisect
+import json
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+
+from atomic_io import atomic_write, atomic_write_json
+from build_manifest import code_version, file_digest, hash_inputs
+from srt import format_timestamp, iter_srt_file
+from transcripts import TRANSCRIPTS_DIR
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+INDEX_DIR = DATA_DIR / "transcript_index"
+
+TRANSCRIPT_NAME_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})(?:-(\d+))?\.srt$')
+TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+CODE_VERSION = code_version(__file__)
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric terms."""
+    return TERM_PATTERN.findall(text.lower())
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def discover_transcripts(transcripts_dir=TRANSCRIPTS_DIR):
+    """
+    List the transcripts on disk with their meeting's event ID, date and video URL.
+
+    Files named {date}.srt (from before transcripts were keyed by event ID)
+    are matched to the only PAB meeting on that date, if there is one.
+    """
+    pab_meetings = _load_json(DATA_DIR / "pab_meetings.json", {})
+    media = _load_json(DATA_DIR / "pab_meetings_media.json", {})
+    ids_by_date = {}
+    for event_id, event in pab_meetings.items():
+        ids_by_date.setdefault(event.get("eventDate", "")[:10], []).append(event_id)
+
+    meetings = []
+    for filename in sorted(os.listdir(transcripts_dir)):
+        match = TRANSCRIPT_NAME_PATTERN.match(filename)
+        if not match:
+            continue
+        day, event_id = match.groups()
+        if event_id is None and len(ids_by_date.get(day, [])) == 1:
+            event_id = ids_by_date[day][0]
+        meetings.append({
+            "event_id": int(event_id) if event_id else None,
+            "date": day,
+            "file": filename,
+            "video_url": media.get(event_id, {}).get("videoUrl") if event_id else None,
+        })
+    return meetings
+
+
+def build_index(transcripts_dir=TRANSCRIPTS_DIR, index_dir=INDEX_DIR, force=False):
+    """
+    Build the transcript index, unless it is already up to date.
+
+    Returns:
+        bool: True if the index was (re)built
+    """
+    meetings = discover_transcripts(transcripts_dir)
+    inputs = hash_inputs(
+        CODE_VERSION,
+        [(m["file"], file_digest(os.path.join(transcripts_dir, m["file"])), m["video_url"] or "") for m in meetings],
+    )
+    index_path = os.path.join(index_dir, "index.json")
+    if not force and _load_json(index_path, {}).get("inputs") == inputs:
+        print(f"Transcript index is up to date ({len(meetings)} meetings)")
+        return False
+
+    os.makedirs(index_dir, exist_ok=True)
+    postings = {}
+    times = array('I')
+    with atomic_write(os.path.join(index_dir, "text.jsonl")) as text_file:
+        text_offset = 0
+        for meeting in meetings:
+            meeting["cue_offset"] = len(times)
+            texts = []
+            for cue in iter_srt_file(os.path.join(transcripts_dir, meeting["file"])):
+                cue_id = len(times)
+                times.append(cue.start_ms)
+                texts.append(cue.text)
+                for term in set(tokenize(cue.text)):
+                    postings.setdefault(term, []).append(cue_id)
+            meeting["cue_count"] = len(texts)
+
+            line = json.dumps(texts, ensure_ascii=False) + '\n'
+            meeting["text_offset"] = text_offset
+            meeting["text_length"] = len(line.encode('utf-8'))
+            text_offset += meeting["text_length"]
+            text_file.write(line)
+
+    terms = {}
+    offset = 0
+    with atomic_write(os.path.join(index_dir, "postings.bin"), 'wb') as f:
+        for term in sorted(postings):
+            cue_ids = array('I', postings[term])
+            cue_ids.tofile(f)
+            terms[term] = [offset, len(cue_ids)]
+            offset += len(cue_ids)
+
+    with atomic_write(os.path.join(index_dir, "times.bin"), 'wb') as f:
+        times.tofile(f)
+
+    # Written last: its inputs digest marks the other files as complete
+    atomic_write_json(index_path, {"inputs": inputs, "meetings": meetings, "terms": terms}, separators=(',', ':'))
+    print(f"Indexed {len(times)} cues from {len(meetings)} meetings ({len(terms)} terms)")
+    return True
+
+
+class TranscriptIndex:
+    """Read-only access to a built transcript index."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        index = _load_json(os.path.join(index_dir, "index.json"), None)
+        if index is None:
+            raise FileNotFoundError(f"No transcript index in {index_dir}; run: python transcript_index.py build")
+        self.meetings = index["meetings"]
+        self.terms = index["terms"]
+        self._meeting_starts = [meeting["cue_offset"] for meeting in self.meetings]
+        self.times = array('I')
+        with open(os.path.join(index_dir, "times.bin"), 'rb') as f:
+            self.times.frombytes(f.read())
+        self._texts = {}
+
+    def postings(self, term):
+        """Return the sorted global cue IDs containing `term`."""
+        entry = self.terms.get(term)
+        cue_ids = array('I')
+        if entry is None:
+            return cue_ids
+        offset, count = entry
+        with open(os.path.join(self.index_dir, "postings.bin"), 'rb') as f:
+            f.seek(offset * cue_ids.itemsize)
+            cue_ids.frombytes(f.read(count * cue_ids.itemsize))
+        return cue_ids
+
+    def meeting_of(self, cue_id):
+        """Return (meeting index, cue index within the meeting) of a global cue ID."""
+        meeting_index = bisect.bisect_right(self._meeting_starts, cue_id) - 1
+        return meeting_index, cue_id - self._meeting_starts[meeting_index]
+
+    def cue_text(self, cue_id):
+        meeting_index, cue_index = self.meeting_of(cue_id)
+        if meeting_index not in self._texts:
+            meeting = self.meetings[meeting_index]
+            with open(os.path.join(self.index_dir, "text.jsonl"), 'rb') as f:
+                f.seek(meeting["text_offset"])
+                self._texts[meeting_index] = json.loads(f.read(meeting["text_length"]))
+        return self._texts[meeting_index][cue_index]
+
+    def _same_meeting(self, cue_id, other_id):
+        return other_id < len(self.times) and self.meeting_of(cue_id)[0] == self.meeting_of(other_id)[0]
+
+    def search(self, phrase):
+        """
+        Find every cue where `phrase` was said.
+
+        Captions often break a phrase across two cues, so a match may span a
+        cue and the one after it. Each match is reported once, at the cue
+        where it starts.
+
+        Returns:
+            list: Hits in meeting order, each with the meeting's `event_id`,
+                  `date` and `video_url`, the cue's `start_ms`, `timestamp`
+                  and `text`, and a `link` to the video at that moment
+        """
+        terms = tokenize(phrase)
+        if not terms:
+            return []
+
+        term_postings = [set(self.postings(term)) for term in terms]
+        candidates = sorted(
+            cue_id for cue_id in term_postings[0]
+            if all(cue_id in p or cue_id + 1 in p for p in term_postings[1:])
+        )
+
+        hits = []
+        for cue_id in candidates:
+            text = self.cue_text(cue_id)
+            window = tokenize(text)
+            own_terms = len(window)
+            if self._same_meeting(cue_id, cue_id + 1):
+                window += tokenize(self.cue_text(cue_id + 1))
+            # A match lying wholly in the next cue is that cue's hit, not this one's
+            if not any(window[i:i + len(terms)] == terms for i in range(min(own_terms, len(window) - len(terms) + 1))):
+                continue
+
+            meeting = self.meetings[self.meeting_of(cue_id)[0]]
+            start_ms = self.times[cue_id]
+            link = f"{meeting['video_url']}#t={start_ms // 1000}" if meeting["video_url"] else None
+            hits.append({
+                "event_id": meeting["event_id"],
+                "date": meeting["date"],
+                "video_url": meeting["video_url"],
+                "start_ms": start_ms,
+                "timestamp": format_timestamp(start_ms),
+                "text": text,
+                "link": link,
+            })
+        return hits
+
+
+def main():
+    """Build or query the transcript index: python transcript_index.py build | search PHRASE"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "search") or (sys.argv[1] == "search" and len(sys.argv) < 3):
+        print(main.__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "build":
+        build_index(force="--force" in sys.argv[2:])
+        return
+
+    build_index()
+    hits = TranscriptIndex().search(" ".join(sys.argv[2:]))
+    for hit in hits:
+        print(f"{hit['date']} {hit['timestamp']}  {hit['text']}")
+        if hit["link"]:
+            print(f"    {hit['link']}")
+    print(f"{len(hits)} matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Download meeting closed captions (SRT transcripts) from CivicClerk.
+
+Transcripts are saved as data/pab_meetings/{date}-{event_id}.srt, so two
+meetings on the same day no longer overwrite each other. Downloads run on a
+thread pool and every file is written atomically.
+
+A manifest (data/transcript_manifest.json) records, per event, the caption
+URL, its ETag/Last-Modified validators and the SHA-256 of the saved file.
+A transcript whose URL is unchanged and whose file still matches its hash is
+never fetched again (with `revalidate`, a conditional request is sent
+instead). The manifest is saved after every completed download, so an
+interrupted run resumes where it stopped.
+
+Files saved under the old {date}.srt names are renamed and adopted into the
+manifest the first time their meeting is seen, if it is the only meeting
+with captions on that date.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+import http_client
+from atomic_io import atomic_write, atomic_write_json
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TRANSCRIPTS_DIR = PROJECT_ROOT / "data" / "pab_meetings"
+MANIFEST_PATH = PROJECT_ROOT / "data" / "transcript_manifest.json"
+
+DOWNLOAD_WORKERS = int(os.environ.get("TRANSCRIPT_DOWNLOAD_WORKERS", 8))
+
+
+def transcript_filename(event_date, event_id):
+    """Return the file name of a meeting's transcript ("2024-08-07T18:00:00Z", 2079 -> "2024-08-07-2079.srt")."""
+    return f"{event_date[:10]}-{event_id}.srt"
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the transcript manifest from JSON file."""
+    if not os.path.exists(manifest_path):
+        return {"entries": {}}
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load transcript manifest from {manifest_path}: {e}")
+        return {"entries": {}}
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Save the transcript manifest to JSON file."""
+    try:
+        atomic_write_json(manifest_path, manifest, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"Error: Could not save transcript manifest to {manifest_path}: {e}")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def download_caption(url, etag=None, last_modified=None):
+    """
+    Download a caption file, conditionally if validators are given.
+
+    Returns:
+        requests.Response: A 304 response if unchanged, otherwise the 200 response
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = http_client.get(url, headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def adopt_legacy_transcripts(meetings, transcripts_dir, entries):
+    """
+    Rename {date}.srt files from before transcripts were keyed by event ID.
+
+    A legacy file is only adopted when exactly one meeting with captions
+    falls on its date; otherwise it is left for the meetings to re-download.
+    """
+    per_date = Counter(meeting["event_date"][:10] for meeting in meetings)
+    for meeting in meetings:
+        day = meeting["event_date"][:10]
+        legacy_path = os.path.join(transcripts_dir, f"{day}.srt")
+        path = os.path.join(transcripts_dir, transcript_filename(meeting["event_date"], meeting["event_id"]))
+        if per_date[day] != 1 or not os.path.exists(legacy_path) or os.path.exists(path):
+            continue
+        os.replace(legacy_path, path)
+        entries[str(meeting["event_id"])] = {
+            "url": meeting["url"],
+            "path": os.path.basename(path),
+            "sha256": file_sha256(path),
+            "size": os.path.getsize(path),
+            "downloaded_at": None,
+        }
+        print(f"Adopted legacy transcript {legacy_path} as {path}")
+
+
+def fetch_transcripts(meetings, transcripts_dir=TRANSCRIPTS_DIR, manifest_path=MANIFEST_PATH,
+                      workers=None, revalidate=False):
+    """
+    Download the transcripts of many meetings in parallel.
+
+    Args:
+        meetings: Iterable of {"event_id", "event_date", "url"} dictionaries
+        transcripts_dir: Directory to write transcripts into
+        manifest_path: Path of the transcript manifest
+        workers: Size of the download thread pool (default: DOWNLOAD_WORKERS)
+        revalidate: Send conditional requests for transcripts already on disk
+                    instead of skipping them
+
+    Returns:
+        dict: {event_id: status}, where status is 'skipped' (no request made),
+              'unchanged' (304 or identical content), 'downloaded' or 'failed'
+    """
+    meetings = [meeting for meeting in meetings if meeting.get("url")]
+    os.makedirs(transcripts_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    entries = manifest.setdefault("entries", {})
+    adopt_legacy_transcripts(meetings, transcripts_dir, entries)
+
+    report = {}
+    pending = {}
+    for meeting in meetings:
+        event_id = str(meeting["event_id"])
+        path = os.path.join(transcripts_dir, transcript_filename(meeting["event_date"], meeting["event_id"]))
+        entry = entries.get(event_id)
+        intact = (
+            entry is not None
+            and entry.get("url") == meeting["url"]
+            and os.path.exists(path)
+            and os.path.getsize(path) == entry.get("size")
+            and file_sha256(path) == entry.get("sha256")
+        )
+        if intact and not revalidate:
+            report[meeting["event_id"]] = "skipped"
+            continue
+        pending[event_id] = (meeting, path, entry if intact else None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or DOWNLOAD_WORKERS) as pool:
+        futures = {
+            pool.submit(download_caption, meeting["url"],
+                        (entry or {}).get("etag"), (entry or {}).get("last_modified")): event_id
+            for event_id, (meeting, path, entry) in pending.items()
+        }
+        # Results are handled (and the manifest saved) on this thread as each download completes
+        for future in as_completed(futures):
+            event_id = futures[future]
+            meeting, path, entry = pending[event_id]
+            try:
+                response = future.result()
+            except Exception as e:
+                print(f"Warning: Failed to download transcript for event {event_id}: {e}")
+                report[meeting["event_id"]] = "failed"
+                continue
+
+            if response.status_code == 304:
+                report[meeting["event_id"]] = "unchanged"
+                continue
+
+            content = response.content
+            sha256 = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry.get("sha256") == sha256:
+                report[meeting["event_id"]] = "unchanged"
+            else:
+                with atomic_write(path, "wb") as f:
+                    f.write(content)
+                print(f"Downloaded transcript {path}")
+                report[meeting["event_id"]] = "downloaded"
+
+            entries[event_id] = {
+                "url": meeting["url"],
+                "path": os.path.basename(path),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": sha256,
+                "size": len(content),
+                "downloaded_at": _now_iso(),
+            }
+            save_manifest(manifest, manifest_path)
+
+    save_manifest(manifest, manifest_path)
+    counts = Counter(report.values())
+    print(f"Transcripts: {', '.join(f'{status}: {n}' for status, n in sorted(counts.items()))} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return report
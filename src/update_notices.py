@@ -2,14 +2,44 @@
 """
 Fetch public notices from Florida Public Notices and generate static HTML and RSS feed.
 """
+import functools
+import heapq
 import json
 import os
-from datetime import datetime
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+import re
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 import html
 
-from publicnotices import get_kissimmee_planning_advisory_board_docs
+from atomic_io import atomic_write, atomic_write_json
+import case_index
+import feeds
+import http_client
+import instrumentation
+import property_index
+import search_index
+import templating
+from build_manifest import (
+    code_version,
+    file_digest,
+    forget,
+    hash_inputs,
+    is_current,
+    load_manifest,
+    record,
+    save_manifest,
+)
+from notice_store import open_store
+from publicnotices import iter_kissimmee_notices
+from srt import format_timestamp
+from thumbnails import (
+    generate_thumbnails,
+    summarize_thumbnail_report,
+    evict_thumbnails,
+    load_thumbnail_cache,
+    save_thumbnail_cache,
+)
 
 
 # Zoning code mapping (from https://www.kissimmee.gov/Business-Development/Development/Planning-Zoning/Find-Your-Propertys-Zoning-Category/Zoning-Classifications)
@@ -79,38 +109,121 @@ ACRONYMS = {
     'MUPUD': 'Mixed Use Planned Urban Development',
 }
 
+# Categories that always get pages, even when the current fetch has no notices for them
+KNOWN_CATEGORIES = {
+    'pab': 'Planning Advisory Board',
+    'city-commission': 'City Commission',
+    'osceola-bcc': 'Osceola County BCC',
+    'other-boards': 'Other Boards & Committees',
+    'other': 'Other Notices',
+}
+
+# Upper bound on notices pulled from the feed in one run (the old single-request limit)
+MAX_FETCHED_NOTICES = 500
+
+# The newest archived notices (across all categories) shown on the current
+# pages and feeds and whose thumbnails are kept: the window a full fetch of
+# MAX_FETCHED_NOTICES covered, however few notices this run fetched
+CURRENT_WINDOW = MAX_FETCHED_NOTICES
+# ...plus at least this many of each category's newest, so low-volume
+# categories (like pab) never get an empty current page or feed
+CURRENT_MIN_PER_CATEGORY = 20
+
+# Notice fields that change on every run without affecting any rendered output
+VOLATILE_NOTICE_FIELDS = ('first_seen', 'last_seen')
+
+# Archived notices are sharded into one page per publication month ("2025-11-01" -> "2025-11")
+ARCHIVE_MONTH_PATTERN = re.compile(r'\d{4}-\d{2}')
+
+SITE_URL = 'https://kissimmee.fyi'
+
+# Notices' dates and meeting times are Kissimmee (Eastern) local times
+EASTERN = ZoneInfo('America/New_York')
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docs')
+
+# Feed files written to each category directory: recent notices, and the full history
+FEED_FILES = {'rss': 'rss.xml', 'atom': 'atom.xml', 'json': 'feed.json'}
+ARCHIVE_FEED_FILES = {'rss': 'archive-rss.xml', 'atom': 'archive-atom.xml', 'json': 'archive-feed.json'}
+# The notice fields an archive feed item is made of. Archive feeds leave out
+# the full text (it is on the archive pages), so they stay small and are
+# rebuilt only when one of these changes.
+ARCHIVE_FEED_FIELDS = (
+    'id', 'title', 'pub_date', 'description', 'amendment_type', 'meeting_date',
+    'property_address', 'zoning_change', 'parcel_id', 'reference_num',
+)
+
+# Pages are streamed to disk notice by notice; buffer them into large writes
+PAGE_WRITE_BUFFER = 1 << 20
+
+# Version of the rendering code, part of every generated page's input hash
+CODE_VERSION = code_version(__file__, feeds.__file__, templating.__file__)
+SEARCH_CODE_VERSION = code_version(search_index.__file__)
+
+
+# Combine all code mappings
+ABBR_CODES = {**ZONING_CODES, **LAND_USE_CODES, **ACRONYMS}
+
+# One alternation over every code, longest first so e.g. "MU-FR" wins over "MU".
+# A code must start at a word boundary and be followed by space/paren/comma/end
+# or a dash that isn't part of a longer code.
+ABBR_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(code) for code in sorted(ABBR_CODES, key=len, reverse=True)) + r')'
+    r'(?=\s|\(|\)|,|$|-(?!\w))'
+)
+
+# Precomputed <abbr> tags for each code
+ABBR_TAGS = {
+    code: f'<abbr title="{html.escape(title)}">{code}</abbr>'
+    for code, title in ABBR_CODES.items()
+}
+
 
+@functools.lru_cache(maxsize=8192)
 def wrap_codes_with_abbr(text):
     """Wrap zoning codes, land use codes, and acronyms with HTML abbr tags."""
-    import re
-
     if not text:
         return text
 
-    # Combine all code mappings
-    all_codes = {**ZONING_CODES, **LAND_USE_CODES, **ACRONYMS}
+    return ABBR_PATTERN.sub(lambda match: ABBR_TAGS[match.group(1)], text)
+
+
+def current_notices_by_category(stores, limit=CURRENT_WINDOW, min_per_category=CURRENT_MIN_PER_CATEGORY):
+    """
+    Return the newest `limit` archived notices across all categories, plus
+    the newest `min_per_category` of each category.
 
-    # Sort by length (descending) to match longer codes first (e.g., "MU-FR" before "MU")
-    sorted_codes = sorted(all_codes.keys(), key=len, reverse=True)
+    Notices are ranked by pub_epoch, then last_seen, using the store indexes,
+    so only the chosen notices are read from the logs.
 
-    # Create pattern that matches codes as whole words or with specific boundaries
-    # Match codes that are surrounded by word boundaries, parentheses, or dashes
-    for code in sorted_codes:
-        # Escape special regex characters in the code
-        escaped_code = re.escape(code)
-        # Pattern: code must be at word boundary or followed by space/paren/dash/end
-        pattern = r'\b(' + escaped_code + r')(?=\s|\(|\)|,|$|-(?!\w))'
-        replacement = f'<abbr title="{html.escape(all_codes[code])}">{code}</abbr>'
-        text = re.sub(pattern, replacement, text)
+    Args:
+        stores: {category_key: NoticeStore}
+        limit: Number of notices in the window across all categories
+        min_per_category: Number of each category's newest notices always included
 
-    return text
+    Returns:
+        dict: {category_key: [notice, ...]}, newest first
+    """
+    def rank(entry, notice_id):
+        return (entry.get('pub_epoch') or 0, entry.get('last_seen') or '', int(notice_id))
 
+    ranked = {
+        category_key: [(rank(entry, notice_id), category_key, notice_id)
+                       for notice_id, entry in store.index_entries().items()]
+        for category_key, store in stores.items()
+    }
+    newest = set(heapq.nlargest(limit, (item for items in ranked.values() for item in items)))
+    for items in ranked.values():
+        newest.update(heapq.nlargest(min_per_category, items))
+    ids_by_category = {}
+    for _, category_key, notice_id in newest:
+        ids_by_category.setdefault(category_key, []).append(notice_id)
 
-def prettify_xml(elem):
-    """Return a pretty-printed XML string for the Element."""
-    rough_string = tostring(elem, encoding='utf-8')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ", encoding='utf-8').decode('utf-8')
+    current = {}
+    for category_key, notice_ids in ids_by_category.items():
+        notices = list(stores[category_key].iter_notices(notice_ids))
+        notices.sort(key=lambda n: rank(n, n['id']), reverse=True)
+        current[category_key] = notices
+    return current
 
 
 def group_notices_by_category(notices):
@@ -140,22 +253,13 @@ def group_notices_by_category(notices):
     return categories
 
 
-def load_archive(archive_path):
-    """Load the historical notices archive from JSON file."""
-    if not os.path.exists(archive_path):
-        return {"last_updated": None, "notices": {}}
-
-    try:
-        with open(archive_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Warning: Could not load archive from {archive_path}: {e}")
-        return {"last_updated": None, "notices": {}}
-
+def merge_notices(store, new_notices):
+    """
+    Merge new notices into a category's store, preserving all historical data.
 
-def merge_notices(archive, new_notices):
-    """Merge new notices into archive, preserving all historical data."""
-    archive_notices = archive.get("notices", {})
+    Returns:
+        dict: Counts of 'new', 'updated' and 'unchanged' notices
+    """
     # Use timezone-aware datetime
     current_date = datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else None)
     if current_date.tzinfo is None:
@@ -163,94 +267,159 @@ def merge_notices(archive, new_notices):
         current_date = datetime.now(timezone.utc)
     current_date = current_date.isoformat()
 
+    merged_notices = []
     for notice in new_notices:
-        notice_id = str(notice['id'])
-
-        if notice_id in archive_notices:
+        existing = store.get(notice['id'])
+        if existing:
             # Update existing notice
-            archive_notices[notice_id].update(notice)
-            archive_notices[notice_id]['last_seen'] = current_date
+            merged_notices.append({**existing, **notice})
         else:
             # Add new notice
-            notice['first_seen'] = current_date
-            notice['last_seen'] = current_date
-            archive_notices[notice_id] = notice
+            merged_notices.append({**notice, 'first_seen': current_date})
+
+    # Journaled, so an interrupted merge is replayed on the next run
+    return store.apply(merged_notices, seen_at=current_date, last_updated=current_date)
+
+
+# Field extraction patterns, compiled once at import.
+# Pattern: "Wednesday, November 19, 2025 at 6:00 p.m." (with or without "on" before it)
+# This handles both "on Wednesday..." and "on this request, Wednesday..."
+# (the leading \b only skips start positions inside a word, which can never be the first match)
+MEETING_DATE_PATTERN = re.compile(
+    r'\b(\w+),\s+(\w+)\s+(\d{1,2}),\s+(\d{4})\s+at\s+([\d:]+\s*[ap]\.?m\.?)', re.IGNORECASE
+)
+# The display string built by extract_meeting_date: "Wednesday, November 19, 2025 at 6:00 p.m."
+MEETING_DATETIME_PATTERN = re.compile(r'\w+, (\w+)\.? (\d{1,2}), (\d{4}) at (\d{1,2})(?::(\d{2}))?\s*([ap])', re.IGNORECASE)
+DAY_NAMES = frozenset(['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'])
+
+# Pattern: "located at approximately 2220 Fortune Road" or "located at 2220 Fortune Road"
+PROPERTY_ADDRESS_PATTERN = re.compile(
+    r'located at(?:\s+approximately)?\s+([^,\n\.]+?)(?:,|\s+Parcel|\.|\s+Legal)', re.IGNORECASE
+)
+
+# Pattern: "FROM: RC-1 (description) TO: RC-2 (description)"
+ZONING_FROM_PATTERN = re.compile(r'FROM:\s*([^\n]+?)\s+(?:City|TO:)', re.IGNORECASE)
+ZONING_TO_PATTERN = re.compile(r'TO:\s*([^\n]+?)\s+(?:City|The)', re.IGNORECASE)
+
+# Pattern: "Reference # ZMA-25-0009"
+REFERENCE_NUMBER_PATTERN = re.compile(r'Reference\s*#\s*([^\s\n]+)', re.IGNORECASE)
+
+# Pattern: "Parcel ID: 19-25-30-00U0-0050-0000" or "Parcel IDs: ..."
+PARCEL_ID_PATTERN = re.compile(r'Parcel IDs?:\s*([^\n]+?)(?:\s+Legal|$)', re.IGNORECASE)
+# Alternative format: "Parcel 1: ... Together with Parcel 2: ..."
+NUMBERED_PARCEL_PATTERN = re.compile(
+    r'Parcel\s+\d+:\s*([0-9\-]+)(?:.*?Parcel\s+\d+:\s*([0-9\-]+))?', re.IGNORECASE
+)
+PARCEL_SEPARATOR_PATTERN = re.compile(r'\s+and\s+|,\s*')
+
+# Meeting body classification patterns (matched against lowercased text).
+# Each group is a single alternation so the text is scanned once per group.
+PAB_PATTERN = re.compile(
+    # PAB notices typically say "Planning Advisory Board will make a recommendation"
+    r'planning\s+advisory\s+board\s+will\s+(hold|make\s+a\s+recommendation)'
+    r'|pab\s+will\s+(hold|make\s+a\s+recommendation)'
+)
+COMMISSION_PATTERN = re.compile(
+    # City Commission notices say "City Commission will/to consider/hold"
+    r'city\s+commission\s+(will|to)\s+(hold|consider)'
+    r'|city\s+commission\s+of\s+the\s+city\s+of\s+kissimmee'
+    r'|reference\s*#\s*[^\s]*\s+city\s+commission'  # "Reference # ... CITY COMMISSION"
+)
+OTHER_CITY_PATTERN = re.compile(r'casselberry|city\s+of\s+casselberry')
+KISSIMMEE_PATTERN = re.compile(r'kissimmee|101\s+church\s+street')
+OSCEOLA_BCC_PATTERN = re.compile(
+    r'osceola\s+county\s+board\s+of\s+county\s+commissioners'
+    r'|osceola\s+(?:county\s+)?(?:bcc|bocc)'
+)
+GENERIC_BOARD_PATTERN = re.compile(
+    # Generic patterns to catch any board/committee/commission meetings not explicitly listed above
+    r'\b(?:board|committee|commission)\s+(?:will|to|shall)\s+(?:meet|hold|consider)'
+    r'|(?:meeting|hearing)\s+of\s+the\s+.+?\s+(?:board|committee|commission)'
+    r'|public\s+(?:hearing|meeting)\s+.+?\s+(?:board|committee|commission)'
+    r'|notice\s+of\s+(?:public\s+)?(?:hearing|meeting)'
+    # "<some name> board/committee (of the city of kissimmee) will hold/consider/make".
+    # Only whether it matches matters, so one [a-z\s] character stands in for the
+    # whole lazily-matched name (which made this pattern quadratic in text length).
+    r'|[a-z\s]\s+(?:board|committee)\s+(?:of\s+the\s+city\s+of\s+kissimmee\s+)?will\s+(?:hold|consider|make)'
+)
 
-    archive['notices'] = archive_notices
-    archive['last_updated'] = current_date
 
-    return archive
+def extract_meeting_date(text):
+    """Extract the meeting date and time from notice text."""
+    match = MEETING_DATE_PATTERN.search(text)
+    if match:
+        day, month, date, year, time = match.groups()
+        # Verify the first word is actually a day name
+        if day.lower() in DAY_NAMES:
+            return f"{day}, {month} {date}, {year} at {time}"
+    return None
 
 
-def save_archive(archive, archive_path):
-    """Save the notices archive to JSON file."""
+def parse_meeting_datetime(meeting_date):
+    """Parse an extracted meeting date ("Wednesday, November 19, 2025 at 6:00 p.m.") into a naive local datetime."""
+    match = MEETING_DATETIME_PATTERN.match(meeting_date or '')
+    if not match:
+        return None
+    month, day, year, hour, minute, meridiem = match.groups()
+    hour = int(hour) % 12 + (12 if meridiem.lower() == 'p' else 0)
     try:
-        with open(archive_path, 'w', encoding='utf-8') as f:
-            json.dump(archive, f, indent=2, ensure_ascii=False)
-        print(f"Saved archive with {len(archive['notices'])} total notices")
-    except IOError as e:
-        print(f"Error: Could not save archive to {archive_path}: {e}")
+        # Full or abbreviated month names ("November", "Nov.", "Sept.") all start with the abbreviation
+        month_number = datetime.strptime(month[:3].title(), '%b').month
+        return datetime(int(year), month_number, int(day), hour, int(minute or 0))
+    except ValueError:
+        return None
 
 
-def get_orphaned_thumbnails(thumbnails_dir, current_notices):
-    """Find thumbnail files that are not referenced in current notices."""
-    if not os.path.exists(thumbnails_dir):
-        return []
+def normalized_date_fields(pub_date, meeting_date):
+    """
+    Parse a notice's publication date and meeting date once into sortable values.
 
-    # Get all notice IDs that should have thumbnails (only current notices)
-    valid_ids = set()
-    for notice in current_notices:
-        valid_ids.add(str(notice['id']))
-
-    # Find thumbnails that don't match any valid ID
-    orphaned = []
-    for filename in os.listdir(thumbnails_dir):
-        if filename.endswith('.jpg'):
-            notice_id = filename[:-4]  # Remove .jpg extension
-            if notice_id not in valid_ids:
-                orphaned.append(os.path.join(thumbnails_dir, filename))
-
-    return orphaned
-
-
-def cleanup_thumbnails(thumbnails_dir, current_notices):
-    """Delete thumbnail files that are not referenced in current notices."""
-    orphaned = get_orphaned_thumbnails(thumbnails_dir, current_notices)
-
-    if orphaned:
-        print(f"Cleaning up {len(orphaned)} orphaned thumbnails...")
-        for filepath in orphaned:
-            try:
-                os.remove(filepath)
-                print(f"  Deleted {os.path.basename(filepath)}")
-            except OSError as e:
-                print(f"  Warning: Could not delete {filepath}: {e}")
-    else:
-        print("No orphaned thumbnails to clean up")
+    Returns:
+        dict: `pub_epoch` (Unix time of local midnight on the publication
+              date), `meeting_iso` (ISO 8601 with UTC offset) and
+              `meeting_epoch` (Unix time); each None if unparseable
+    """
+    pub_epoch = None
+    if pub_date:
+        try:
+            pub_epoch = int(datetime.fromisoformat(pub_date[:10]).replace(tzinfo=EASTERN).timestamp())
+        except ValueError:
+            pass
+
+    meeting = parse_meeting_datetime(meeting_date)
+    meeting = meeting.replace(tzinfo=EASTERN) if meeting else None
+    return {
+        'pub_epoch': pub_epoch,
+        'meeting_iso': meeting.isoformat() if meeting else None,
+        'meeting_epoch': int(meeting.timestamp()) if meeting else None,
+    }
 
 
-def extract_meeting_date(text):
-    """Extract the meeting date and time from notice text."""
-    import re
-    # Pattern: "Wednesday, November 19, 2025 at 6:00 p.m." (with or without "on" before it)
-    # This handles both "on Wednesday..." and "on this request, Wednesday..."
-    pattern = r'(\w+),\s+(\w+)\s+(\d{1,2}),\s+(\d{4})\s+at\s+([\d:]+\s*[ap]\.?m\.?)'
-    match = re.search(pattern, text, re.IGNORECASE)
-    if match:
-        day, month, date, year, time = match.groups()
-        # Verify the first word is actually a day name
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        if day.lower() in days:
-            return f"{day}, {month} {date}, {year} at {time}"
-    return None
+def backfill_normalized_dates(store):
+    """
+    Add the normalized date fields to stored notices archived before they existed.
+
+    Only notices whose index entry lacks `pub_epoch` are read, so once a
+    store has been backfilled this costs a scan of its index.
+
+    Returns:
+        int: Number of notices updated
+    """
+    missing = [notice_id for notice_id, entry in store.index_entries().items() if 'pub_epoch' not in entry]
+    if not missing:
+        return 0
+    with store.locked():
+        for notice in list(store.iter_notices(missing)):
+            notice.update(normalized_date_fields(notice.get('pub_date'), notice.get('meeting_date')))
+            # Keeps the notice's stored last_seen
+            store.upsert(notice)
+        store.flush()
+    return len(missing)
 
 
 def extract_property_address(text):
     """Extract property address from notice text."""
-    import re
-    # Pattern: "located at approximately 2220 Fortune Road" or "located at 2220 Fortune Road"
-    pattern = r'located at(?:\s+approximately)?\s+([^,\n\.]+?)(?:,|\s+Parcel|\.|\s+Legal)'
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = PROPERTY_ADDRESS_PATTERN.search(text)
     if match:
         return match.group(1).strip()
     return None
@@ -258,13 +427,8 @@ def extract_property_address(text):
 
 def extract_zoning_change(text):
     """Extract zoning change (FROM/TO) from notice text."""
-    import re
-    # Pattern: "FROM: RC-1 (description) TO: RC-2 (description)"
-    from_pattern = r'FROM:\s*([^\n]+?)\s+(?:City|TO:)'
-    to_pattern = r'TO:\s*([^\n]+?)\s+(?:City|The)'
-
-    from_match = re.search(from_pattern, text, re.IGNORECASE)
-    to_match = re.search(to_pattern, text, re.IGNORECASE)
+    from_match = ZONING_FROM_PATTERN.search(text)
+    to_match = ZONING_TO_PATTERN.search(text) if from_match else None
 
     if from_match and to_match:
         from_zone = from_match.group(1).strip()
@@ -275,10 +439,7 @@ def extract_zoning_change(text):
 
 def extract_reference_number(text):
     """Extract reference number from notice text."""
-    import re
-    # Pattern: "Reference # ZMA-25-0009"
-    pattern = r'Reference\s*#\s*([^\s\n]+)'
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = REFERENCE_NUMBER_PATTERN.search(text)
     if match:
         return match.group(1).strip()
     return None
@@ -310,17 +471,13 @@ def extract_amendment_type(ref_num):
 
 def extract_parcel_id(text):
     """Extract parcel ID from notice text."""
-    import re
-    # Pattern: "Parcel ID: 19-25-30-00U0-0050-0000" or "Parcel IDs: ..." or "Parcel 1: ... Parcel 2: ..."
     # First try standard format
-    pattern = r'Parcel IDs?:\s*([^\n]+?)(?:\s+Legal|$)'
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = PARCEL_ID_PATTERN.search(text)
     if match:
         return match.group(1).strip()
 
     # Try alternative format: "Parcel 1: ... Together with Parcel 2: ..."
-    alt_pattern = r'Parcel\s+\d+:\s*([0-9\-]+)(?:.*?Parcel\s+\d+:\s*([0-9\-]+))?'
-    alt_matches = re.findall(alt_pattern, text, re.IGNORECASE)
+    alt_matches = NUMBERED_PARCEL_PATTERN.findall(text)
     if alt_matches:
         parcels = []
         for match_tuple in alt_matches:
@@ -348,8 +505,7 @@ def split_parcel_ids(parcel_id_string):
         return []
 
     # Split by " and " or comma
-    import re
-    parcels = re.split(r'\s+and\s+|,\s*', parcel_id_string)
+    parcels = PARCEL_SEPARATOR_PATTERN.split(parcel_id_string)
     return [p.strip() for p in parcels if p.strip()]
 
 
@@ -362,16 +518,27 @@ def generate_parcel_links(parcel_id_string):
 
     links = []
     for parcel in parcels:
-        parcel_url_format = format_parcel_id_for_url(parcel)
-        if parcel_url_format:
-            parcel_url = f'https://search.property-appraiser.org/Search/MainSearch?pin={parcel_url_format}'
-            links.append(f'<a href="{parcel_url}" target="_blank">{html.escape(parcel)}</a>')
+        parcel_url = property_appraiser_url(parcel)
+        if parcel_url:
+            link = f'<a href="{parcel_url}" target="_blank">{html.escape(parcel)}</a>'
         else:
-            links.append(html.escape(parcel))
+            link = html.escape(parcel)
+        # Every parcel number in the archive has a history page (see generate_parcel_pages)
+        for number in property_index.parcel_numbers(parcel)[:1]:
+            link += f' (<a href="/parcels/{number}.html">history</a>)'
+        links.append(link)
 
     return ', '.join(links)
 
 
+def property_appraiser_url(parcel_id):
+    """Return the Osceola County Property Appraiser search URL for a parcel ID, or None."""
+    parcel_url_format = format_parcel_id_for_url(parcel_id)
+    if not parcel_url_format:
+        return None
+    return f'https://search.property-appraiser.org/Search/MainSearch?pin={parcel_url_format}'
+
+
 def generate_short_description(notice_text, address, zoning, ref_num):
     """Generate a concise description from extracted fields."""
     parts = []
@@ -405,46 +572,8 @@ def generate_short_description(notice_text, address, zoning, ref_num):
     return parts[0] if parts else ""
 
 
-def generate_pdf_thumbnail(pdf_url, notice_id, thumbnails_dir):
-    """Download PDF and generate thumbnail from first page."""
-    try:
-        from pdf2image import convert_from_bytes
-        from PIL import Image
-        import requests
-
-        # Download PDF
-        response = requests.get(pdf_url, timeout=60)
-        response.raise_for_status()
-
-        # Convert first page to image
-        images = convert_from_bytes(response.content, first_page=1, last_page=1, dpi=150)
-
-        if images:
-            # Resize to thumbnail (max width 400px, maintain aspect ratio)
-            img = images[0]
-            max_width = 400
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-            # Ensure thumbnails directory exists
-            os.makedirs(thumbnails_dir, exist_ok=True)
-
-            # Save as JPEG
-            thumbnail_path = os.path.join(thumbnails_dir, f"{notice_id}.jpg")
-            img.save(thumbnail_path, "JPEG", quality=85, optimize=True)
-
-            # Return relative path for HTML
-            return f"thumbnails/{notice_id}.jpg"
-
-    except Exception as e:
-        print(f"Warning: Failed to generate thumbnail for notice {notice_id}: {e}")
-        return None
-
-
-def generate_rss_description(notice):
-    """Generate a rich RSS description with structured fields and full text."""
+def generate_rss_description(notice, full_text=True):
+    """Generate a rich RSS description with structured fields and (unless `full_text` is false) full text."""
     parts = []
 
     # Add short description
@@ -472,7 +601,7 @@ def generate_rss_description(notice):
         parts.append(f"Reference: {notice['reference_num']}")
 
     # Add full notice text
-    if notice.get('notice_text'):
+    if full_text and notice.get('notice_text'):
         parts.append('')  # Blank line
         parts.append('--- Full Notice Text ---')
         parts.append(notice['notice_text'])
@@ -480,59 +609,71 @@ def generate_rss_description(notice):
     return '\n'.join(parts)
 
 
-def generate_rss(notices, output_path):
-    """Generate RSS 2.0 feed from notices data."""
-    from datetime import timezone
-
-    rss = Element('rss', version='2.0')
-    channel = SubElement(rss, 'channel')
-
-    # Channel info
-    title = SubElement(channel, 'title')
-    title.text = 'Kissimmee Planning Advisory Board - Public Notices'
-
-    link = SubElement(channel, 'link')
-    link.text = 'https://kissimmee.fyi'
-
-    description = SubElement(channel, 'description')
-    description.text = 'Public notices for Kissimmee Planning Advisory Board meetings and proceedings'
-
-    last_build = SubElement(channel, 'lastBuildDate')
-    now_utc = datetime.now(timezone.utc)
-    last_build.text = now_utc.strftime('%a, %d %b %Y %H:%M:%S GMT')
+def notice_feed_item(notice, include_thumbnail=True, archive_url=None):
+    """
+    Convert a notice into a feed item for feeds.write_feeds.
 
-    # Add items
-    for notice in notices:
-        item = SubElement(channel, 'item')
+    With `archive_url` (the category's archive directory URL), the item is a
+    summary linking to the notice on its archive page, which has the full text.
+    """
+    pub_date = None
+    if notice.get('pub_date'):
+        try:
+            pub_date = datetime.fromisoformat(notice['pub_date'][:10]).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    item = {
+        'id': f"kissimmee-notice-{notice.get('id', hash(notice.get('title', '')))}",
+        'title': notice.get('title', 'Untitled Notice'),
+        'link': notice.get('pdf_url') or notice.get('link') or SITE_URL,
+        'description': generate_rss_description(notice, full_text=archive_url is None),
+        'pub_date': pub_date,
+    }
 
-        item_title = SubElement(item, 'title')
-        item_title.text = notice.get('title', 'Untitled Notice')
+    if archive_url:
+        item['link'] = f"{archive_url}/{archive_shard_key(notice)}.html#notice-{notice['id']}"
 
-        item_link = SubElement(item, 'link')
-        item_link.text = notice.get('pdf_url') or notice.get('link') or 'https://kissimmee.fyi'
+    # Add thumbnail as enclosure if available (full URL for feed readers)
+    if include_thumbnail and notice.get('thumbnail_url'):
+        item['image'] = f"{SITE_URL}/{notice['thumbnail_url']}"
 
-        item_desc = SubElement(item, 'description')
-        item_desc.text = generate_rss_description(notice)
+    return item
 
-        if notice.get('pub_date_rfc822'):
-            pub_date = SubElement(item, 'pubDate')
-            pub_date.text = notice['pub_date_rfc822']
 
-        guid = SubElement(item, 'guid', isPermaLink='false')
-        guid.text = f"kissimmee-notice-{notice.get('id', hash(notice.get('title', '')))}"
+def generate_rss(notices, output_paths, updated_time, category_name='Planning Advisory Board',
+                 include_thumbnails=True, archive=False):
+    """
+    Generate RSS 2.0, Atom and JSON Feed files from notices data in one pass.
 
-        # Add thumbnail as enclosure if available
-        if notice.get('thumbnail_url'):
-            # Use full URL for RSS
-            thumbnail_full_url = f"https://kissimmee.fyi/{notice['thumbnail_url']}"
-            enclosure = SubElement(item, 'enclosure',
-                                  url=thumbnail_full_url,
-                                  type='image/jpeg')
+    Args:
+        notices: Iterable of notices, newest first
+        output_paths: Dictionary mapping feed format ('rss', 'atom', 'json') to output path
+        updated_time: Build time, used as the feeds' last-updated date
+        category_name: Display name of the meeting body
+        include_thumbnails: Whether to attach thumbnails as enclosures
+        archive: Whether this is the full-history archive feed, whose items
+                 are summaries linking to the archive pages (see ARCHIVE_FEED_FIELDS)
+    """
+    title = f'Kissimmee {category_name} - Public Notices'
+    description = f'Public notices for Kissimmee {category_name} meetings and proceedings'
+    if archive:
+        title += ' (Full Archive)'
+        description = f'Every archived public notice for Kissimmee {category_name} meetings and proceedings'
 
-    # Write to file
-    xml_string = prettify_xml(rss)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(xml_string)
+    feed = {
+        'title': title,
+        'link': SITE_URL,
+        'description': description,
+        'updated': updated_time,
+        'urls': {fmt: f"{SITE_URL}/{os.path.relpath(path, DOCS_DIR)}" for fmt, path in output_paths.items()},
+    }
+    archive_url = None
+    if archive:
+        category_dir = os.path.dirname(next(iter(output_paths.values())))
+        archive_url = f"{SITE_URL}/{os.path.relpath(category_dir, DOCS_DIR)}/archive"
+    items = (notice_feed_item(notice, include_thumbnails, archive_url) for notice in notices)
+    return feeds.write_feeds(feed, items, output_paths)
 
 
 def classify_meeting_body(text):
@@ -549,8 +690,6 @@ def classify_meeting_body(text):
         ('board-name', 'Detected Board Name')  # For other boards/committees
         ('other', 'Other Notices')  # Catch-all
     """
-    import re
-
     if not text:
         return ('other', 'Other Notices')
 
@@ -558,60 +697,88 @@ def classify_meeting_body(text):
     text_lower = text.lower()
 
     # Check for Planning Advisory Board
-    # PAB notices typically say "Planning Advisory Board will make a recommendation"
-    pab_patterns = [
-        r'planning\s+advisory\s+board\s+will\s+(hold|make\s+a\s+recommendation)',
-        r'pab\s+will\s+(hold|make\s+a\s+recommendation)',
-    ]
-    for pattern in pab_patterns:
-        if re.search(pattern, text_lower):
-            return ('pab', 'Planning Advisory Board')
+    if PAB_PATTERN.search(text_lower):
+        return ('pab', 'Planning Advisory Board')
 
     # Check for City Commission
-    # City Commission notices say "City Commission will/to consider/hold"
-    commission_patterns = [
-        r'city\s+commission\s+(will|to)\s+(hold|consider)',
-        r'city\s+commission\s+of\s+the\s+city\s+of\s+kissimmee',
-        r'reference\s*#\s*[^\s]*\s+city\s+commission',  # "Reference # ... CITY COMMISSION"
-    ]
-    for pattern in commission_patterns:
-        if re.search(pattern, text_lower):
-            # Filter out other cities (Casselberry, etc.)
-            if re.search(r'casselberry|city\s+of\s+casselberry', text_lower):
-                return ('other-boards', 'Other Boards & Committees')
-            # Ensure it's Kissimmee City Commission (check for Kissimmee indicators)
-            if re.search(r'kissimmee|101\s+church\s+street', text_lower):
-                return ('city-commission', 'City Commission')
-            # If neither, send to other-boards (safety net for other cities)
+    if COMMISSION_PATTERN.search(text_lower):
+        # Filter out other cities (Casselberry, etc.)
+        if OTHER_CITY_PATTERN.search(text_lower):
             return ('other-boards', 'Other Boards & Committees')
+        # Ensure it's Kissimmee City Commission (check for Kissimmee indicators)
+        if KISSIMMEE_PATTERN.search(text_lower):
+            return ('city-commission', 'City Commission')
+        # If neither, send to other-boards (safety net for other cities)
+        return ('other-boards', 'Other Boards & Committees')
 
     # Check for Osceola County Board of County Commissioners
-    osceola_bcc_patterns = [
-        r'osceola\s+county\s+board\s+of\s+county\s+commissioners',
-        r'osceola\s+(?:county\s+)?(?:bcc|bocc)',
-    ]
-    for pattern in osceola_bcc_patterns:
-        if re.search(pattern, text_lower):
-            return ('osceola-bcc', 'Osceola County Board of County Commissioners')
+    if OSCEOLA_BCC_PATTERN.search(text_lower):
+        return ('osceola-bcc', 'Osceola County Board of County Commissioners')
 
     # Check if this is any kind of board/committee/commission meeting notice
-    # Generic patterns to catch any board/committee/commission meetings not explicitly listed above
-    generic_board_indicators = [
-        r'\b(?:board|committee|commission)\s+(?:will|to|shall)\s+(?:meet|hold|consider)',
-        r'(?:meeting|hearing)\s+of\s+the\s+.+?\s+(?:board|committee|commission)',
-        r'public\s+(?:hearing|meeting)\s+.+?\s+(?:board|committee|commission)',
-        r'notice\s+of\s+(?:public\s+)?(?:hearing|meeting)',
-        r'(?:the\s+)?[a-z\s]+?\s+(?:board|committee)\s+(?:of\s+the\s+city\s+of\s+kissimmee\s+)?will\s+(?:hold|consider|make)',
-    ]
-    for pattern in generic_board_indicators:
-        if re.search(pattern, text_lower):
-            return ('other-boards', 'Other Boards & Committees')
+    if GENERIC_BOARD_PATTERN.search(text_lower):
+        return ('other-boards', 'Other Boards & Committees')
 
     # Default: Miscellaneous
     return ('other', 'Miscellaneous Notices')
 
 
-def parse_notice(notice_data):
+# Field extractors run over each normalized notice text, in order.
+# Each entry is (name, function, output fields); a function with several
+# output fields returns a tuple.
+EXTRACTORS = [
+    ('meeting_date', extract_meeting_date, ('meeting_date',)),
+    ('property_address', extract_property_address, ('property_address',)),
+    ('zoning_change', extract_zoning_change, ('zoning_change',)),
+    ('reference_num', extract_reference_number, ('reference_num',)),
+    ('parcel_id', extract_parcel_id, ('parcel_id',)),
+    ('meeting_body', classify_meeting_body, ('meeting_body_key', 'meeting_body_name')),
+]
+
+
+def extract_notice_fields(text, timings=None):
+    """
+    Run every registered extractor over a normalized notice text.
+
+    Args:
+        text: Normalized (HTML-unescaped) notice text
+        timings: Optional dict of {extractor name: seconds}, accumulated in place
+
+    Returns:
+        dict: Extracted fields; missing values are None
+    """
+    fields = {}
+    for name, extractor, outputs in EXTRACTORS:
+        if timings is None:
+            value = extractor(text) if text else None
+        else:
+            start = time.perf_counter()
+            value = extractor(text) if text else None
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+        if len(outputs) == 1:
+            fields[outputs[0]] = value
+        else:
+            for output, output_value in zip(outputs, value or (None,) * len(outputs)):
+                fields[output] = output_value
+    return fields
+
+
+def parse_notices(raw_notices, timings=None):
+    """
+    Parse a batch of notices from the API response.
+
+    Args:
+        raw_notices: Iterable of raw notice dictionaries (e.g. from iter_kissimmee_notices)
+        timings: Optional dict of {extractor name: seconds}, accumulated in place
+
+    Returns:
+        list: Parsed notice dictionaries
+    """
+    return [parse_notice(notice_data, timings) for notice_data in raw_notices]
+
+
+def parse_notice(notice_data, timings=None):
     """Parse a single notice from the API response."""
     # Debug: Print the first notice structure
     if not hasattr(parse_notice, 'debug_printed'):
@@ -634,16 +801,16 @@ def parse_notice(notice_data):
             prev_text = normalized_text
             normalized_text = html.unescape(normalized_text)
 
-    # Extract structured fields from notice text
-    meeting_date = extract_meeting_date(normalized_text) if normalized_text else None
-    property_address = extract_property_address(normalized_text) if normalized_text else None
-    zoning_change = extract_zoning_change(normalized_text) if normalized_text else None
-    reference_num = extract_reference_number(normalized_text) if normalized_text else None
-    parcel_id = extract_parcel_id(normalized_text) if normalized_text else None
+    # Extract structured fields (and the meeting body) from notice text
+    fields = extract_notice_fields(normalized_text, timings)
+    meeting_date = fields['meeting_date']
+    property_address = fields['property_address']
+    zoning_change = fields['zoning_change']
+    reference_num = fields['reference_num']
+    parcel_id = fields['parcel_id']
     amendment_type = extract_amendment_type(reference_num) if reference_num else None
-
-    # Classify which meeting body this notice is for
-    meeting_body_key, meeting_body_name = classify_meeting_body(normalized_text) if normalized_text else ('other', 'Other Notices')
+    meeting_body_key = fields['meeting_body_key'] or 'other'
+    meeting_body_name = fields['meeting_body_name'] or 'Other Notices'
 
     # Generate concise description
     short_desc = generate_short_description(normalized_text, property_address, zoning_change, reference_num)
@@ -716,12 +883,21 @@ def parse_notice(notice_data):
         parsed['pub_date_rfc822'] = None
         parsed['pub_date_formatted'] = None
 
+    parsed.update(normalized_date_fields(parsed['pub_date'], meeting_date))
+
     return parsed
 
 
-def generate_notice_html(notice):
-    """Generate HTML for a single notice."""
-    html_parts = ['<div class="notice">']
+def generate_notice_html(notice, full_text_src=None):
+    """Generate HTML for a single notice.
+
+    Args:
+        notice: Notice dictionary
+        full_text_src: Optional URL of a JSON file holding `{id: notice_text}`.
+                       When given, the full text is left out of the page and
+                       fetched from there the first time it is shown.
+    """
+    html_parts = [f'<div class="notice" id="notice-{html.escape(str(notice.get("id", "")))}">']
 
     # Thumbnail (if available)
     if notice.get('thumbnail_url'):
@@ -774,6 +950,8 @@ def generate_notice_html(notice):
     if notice.get('parcel_id'):
         parcel_links = generate_parcel_links(notice['parcel_id'])
         details.append(f'🗂️ Parcel: {parcel_links}')
+    for case in case_index.notice_case_numbers(notice):
+        details.append(f'🧭 <a href="/cases/{case}.html">Case {case} timeline</a>')
 
     if details:
         html_parts.append('<div class="notice-details">')
@@ -799,7 +977,11 @@ def generate_notice_html(notice):
         html_parts.append('</div>')
 
     # Full text section (hidden by default)
-    if notice.get('notice_text'):
+    if notice.get('notice_text') and full_text_src:
+        html_parts.append(f'<div id="full-text-{notice["id"]}" class="notice-full-text" data-src="{html.escape(full_text_src)}" style="display: none;">')
+        html_parts.append('<div class="full-text-content"></div>')
+        html_parts.append('</div>')
+    elif notice.get('notice_text'):
         html_parts.append(f'<div id="full-text-{notice["id"]}" class="notice-full-text" style="display: none;">')
         html_parts.append(f'<div class="full-text-content">{html.escape(notice["notice_text"])}</div>')
         html_parts.append('</div>')
@@ -810,7 +992,16 @@ def generate_notice_html(notice):
     return '\n'.join(html_parts)
 
 
-def generate_static_html(notices, template_path, output_path, updated_time, category_name=None):
+def iter_notices_html(notices, full_text_src=None):
+    """Yield the HTML of each notice in turn, newline-separated (see generate_notice_html)."""
+    for i, notice in enumerate(notices):
+        if i:
+            yield '\n'
+        yield generate_notice_html(notice, full_text_src)
+
+
+def generate_static_html(notices, template_path, output_path, updated_time, category_name=None,
+                         full_text_src=None, placeholders=None):
     """Generate static HTML from template.
 
     Args:
@@ -819,77 +1010,444 @@ def generate_static_html(notices, template_path, output_path, updated_time, cate
         output_path: Path to write generated HTML
         updated_time: Datetime of last update
         category_name: Optional category name to replace in template (e.g. "Planning Advisory Board")
+        full_text_src: Optional JSON file to lazy-load full notice texts from (see generate_notice_html)
+        placeholders: Optional dict of extra {slot name: html} values (see write_page)
     """
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template = f.read()
-
-    # Generate HTML for all notices
+    # Notices are rendered one at a time as the page is written, never joined into one string
     if notices:
-        notices_html = '\n'.join(generate_notice_html(notice) for notice in notices)
+        notices_html = iter_notices_html(notices, full_text_src)
     else:
         notices_html = '<p>No notices found.</p>'
 
+    write_page(notices_html, template_path, output_path, updated_time, category_name, placeholders)
+
+
+def write_page(body_html, template_path, output_path, updated_time, category_name=None, placeholders=None):
+    """Fill a page template's placeholders and write the result.
+
+    Args:
+        body_html: HTML (a string or an iterable of strings) for the NOTICES_PLACEHOLDER slot
+        template_path: Path to HTML template file
+        output_path: Path to write generated HTML
+        updated_time: Datetime of last update
+        category_name: Optional category name to replace in template
+        placeholders: Optional dict of extra {slot name: html} values (e.g. {'PERIOD': ...})
+    """
+    template = templating.load_template(template_path)
+
     # Generate updated timestamp in Eastern time
-    from zoneinfo import ZoneInfo
-    eastern_time = updated_time.astimezone(ZoneInfo('America/New_York'))
+    eastern_time = updated_time.astimezone(EASTERN)
     # %Z gives EST or EDT automatically
     updated_html = f'Last updated: {eastern_time.strftime("%B %d, %Y at %I:%M %p %Z")}'
 
-    # Replace placeholders
-    html_output = template.replace('<!-- NOTICES_PLACEHOLDER -->', notices_html)
-    html_output = html_output.replace('<!-- UPDATED_PLACEHOLDER -->', updated_html)
+    values = {'NOTICES': body_html, 'UPDATED': updated_html}
 
     # Replace category name if provided
     if category_name:
-        html_output = html_output.replace('<!-- CATEGORY_NAME_PLACEHOLDER -->', category_name)
+        values['CATEGORY_NAME'] = category_name
 
-    # Write output
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_output)
+    values.update(placeholders or {})
 
+    # Write output, streaming the template's pieces through a large write buffer
+    with atomic_write(output_path, buffering=PAGE_WRITE_BUFFER) as f:
+        template.render_to(f, values)
 
-def main():
-    """Main function to fetch notices and generate output files."""
-    print("Fetching public notices...")
 
-    try:
-        response = get_kissimmee_planning_advisory_board_docs(limit=500)
-        response.raise_for_status()
+def archive_shard_key(notice):
+    """Return the archive shard (publication month, "YYYY-MM") a notice belongs to."""
+    pub_date = notice.get('pub_date') or ''
+    return pub_date[:7] if ARCHIVE_MONTH_PATTERN.match(pub_date) else 'undated'
 
-        data = response.json()
-        print(f"Received response: {response.status_code}")
 
-        # Debug: Print response structure
-        print(f"Response keys: {list(data.keys()) if isinstance(data, dict) else 'Response is a list'}")
+def archive_shard_label(shard_key):
+    """Return a display label such as "November 2025" for an archive shard."""
+    if shard_key == 'undated':
+        return 'Undated'
+    return datetime.strptime(shard_key, '%Y-%m').strftime('%B %Y')
 
-        # Parse notices from response
-        # The actual structure may vary - adjust based on API response
-        raw_notices = data.get('_embedded', {}).get('notices', [])
-        if not raw_notices:
-            raw_notices = data.get('results', [])
-        if not raw_notices and isinstance(data, list):
-            raw_notices = data
 
-        notices = [parse_notice(n) for n in raw_notices]
-        print(f"Parsed {len(notices)} notices")
+def shard_archive_notices(notices):
+    """
+    Split archived notices into monthly shards.
 
-        # Group notices by category (meeting body)
-        categories = group_notices_by_category(notices)
-        print(f"Found {len(categories)} notice categories: {', '.join(categories.keys())}")
+    Returns:
+        list: [(shard_key, [notice, ...]), ...] newest month first, 'undated' last;
+              notices keep their order within each shard
+    """
+    shards = {}
+    for notice in notices:
+        shards.setdefault(archive_shard_key(notice), []).append(notice)
+    keys = sorted((k for k in shards if k != 'undated'), reverse=True)
+    if 'undated' in shards:
+        keys.append('undated')
+    return [(key, shards[key]) for key in keys]
+
+
+def generate_archive_nav_html(newer_key, older_key):
+    """Generate the newer/older links shown above and below an archive shard."""
+    newer = (f'<a href="{newer_key}.html">← {html.escape(archive_shard_label(newer_key))}</a>'
+             if newer_key else '<span></span>')
+    older = (f'<a href="{older_key}.html">{html.escape(archive_shard_label(older_key))} →</a>'
+             if older_key else '<span></span>')
+    return f'{newer}\n{older}'
+
+
+def generate_archive_index_html(shards):
+    """Generate the list of monthly archive pages for a category's archive.html."""
+    if not shards:
+        return '<p>No notices found.</p>'
+
+    items = ['<ul class="archive-months">']
+    for shard_key, shard_notices in shards:
+        count = len(shard_notices)
+        items.append(
+            f'<li><a href="archive/{shard_key}.html">{html.escape(archive_shard_label(shard_key))}</a>'
+            f'<span class="archive-count">{count} notice{"s" if count != 1 else ""}</span></li>'
+        )
+    items.append('</ul>')
+    return '\n'.join(items)
+
+
+def generate_archive_pages(all_notices, category_dir, templates_dir, updated_time, category_name, manifest):
+    """
+    Generate a category's sharded archive.
 
-        # Ensure all known categories are present (even with no current notices)
-        # so pages are always regenerated and stale HTML doesn't reference deleted thumbnails
-        known_categories = {
-            'pab': 'Planning Advisory Board',
-            'city-commission': 'City Commission',
-            'osceola-bcc': 'Osceola County BCC',
-            'other-boards': 'Other Boards & Committees',
-            'other': 'Other Notices',
+    Writes `archive.html` (an index of months), one `archive/YYYY-MM.html` page
+    per month with newer/older links, and an `archive/YYYY-MM.json` fragment
+    per month holding the full notice texts that page loads on demand. Pages
+    and fragments whose inputs are unchanged are skipped, and shards that no
+    longer exist are deleted.
+
+    Returns:
+        list: Input digests of every generated file (for the landing page digest)
+    """
+    archive_dir = os.path.join(category_dir, 'archive')
+    os.makedirs(archive_dir, exist_ok=True)
+    index_template_path = os.path.join(templates_dir, 'pab_archive.html')
+    shard_template_path = os.path.join(templates_dir, 'pab_archive_page.html')
+
+    # Archived notices are shown without thumbnails
+    archive_notices = []
+    for notice in all_notices:
+        notice_copy = notice.copy()
+        notice_copy['thumbnail_url'] = None
+        archive_notices.append(notice_copy)
+
+    shards = shard_archive_notices(archive_notices)
+    digests = []
+    expected_files = set()
+
+    for i, (shard_key, shard_notices) in enumerate(shards):
+        newer_key = shards[i - 1][0] if i > 0 else None
+        older_key = shards[i + 1][0] if i + 1 < len(shards) else None
+        period = archive_shard_label(shard_key)
+
+        # Full texts for this month, fetched by the page when expanded
+        fragment_name = f'{shard_key}.json'
+        fragment_path = os.path.join(archive_dir, fragment_name)
+        full_texts = {str(n['id']): n['notice_text'] for n in shard_notices if n.get('notice_text')}
+        digest = hash_inputs(CODE_VERSION, 'fragment', full_texts)
+        digests.append(digest)
+        expected_files.add(fragment_name)
+
+        build_if_changed(manifest, fragment_path, digest, lambda: atomic_write_json(
+            fragment_path, full_texts, ensure_ascii=False, separators=(',', ':')))
+
+        page_name = f'{shard_key}.html'
+        page_path = os.path.join(archive_dir, page_name)
+        placeholders = {
+            'PERIOD': html.escape(period),
+            'ARCHIVE_NAV': generate_archive_nav_html(newer_key, older_key),
         }
-        for cat_key, cat_name in known_categories.items():
-            if cat_key not in categories:
-                categories[cat_key] = {'name': cat_name, 'notices': []}
+        digest = page_digest(shard_notices, shard_template_path, category_name, newer_key, older_key)
+        digests.append(digest)
+        expected_files.add(page_name)
+        build_if_changed(manifest, page_path, digest, lambda: generate_static_html(
+            shard_notices, shard_template_path, page_path, updated_time, category_name,
+            full_text_src=fragment_name, placeholders=placeholders))
+
+    # Archive index listing every month
+    index_path = os.path.join(category_dir, 'archive.html')
+    shard_counts = [(shard_key, len(shard_notices)) for shard_key, shard_notices in shards]
+    digest = hash_inputs(CODE_VERSION, file_digest(index_template_path), category_name, shard_counts)
+    digests.append(digest)
+    build_if_changed(manifest, index_path, digest, lambda: write_page(
+        generate_archive_index_html(shards), index_template_path, index_path, updated_time, category_name))
+
+    # Remove shards for months that no longer have notices
+    for filename in os.listdir(archive_dir):
+        if filename not in expected_files:
+            stale_path = os.path.join(archive_dir, filename)
+            os.remove(stale_path)
+            forget(manifest, stale_path)
+            print(f"  Deleted stale archive shard {stale_path}")
+
+    return digests
+
+
+def generate_archived_notice_html(notice_id, summary):
+    """Generate the HTML of one notice on a parcel or case page, linking to its archive page."""
+    category = summary['category']
+    url = f'../notices/{category}/archive/{archive_shard_key(summary)}.html#notice-{notice_id}'
+    html_parts = [
+        f'<div class="notice" id="notice-{html.escape(notice_id)}">',
+        '<div class="notice-content">',
+        f'<div class="notice-title"><a href="{html.escape(url)}">{wrap_codes_with_abbr(html.escape(summary["title"] or "Public Notice"))}</a></div>',
+        f'<div class="notice-category">{html.escape(KNOWN_CATEGORIES.get(category, category))}</div>',
+    ]
+    if summary.get('meeting_date'):
+        html_parts.append(f'<div class="notice-meeting-date">📅 Meeting: {html.escape(summary["meeting_date"])}</div>')
+    if summary.get('description'):
+        html_parts.append(f'<div class="notice-description">{wrap_codes_with_abbr(html.escape(summary["description"]))}</div>')
+    if summary.get('property_address'):
+        html_parts.append(f'<div class="notice-details">📍 {html.escape(summary["property_address"])}</div>')
+    if summary.get('pub_date'):
+        html_parts.append(f'<div class="notice-pub-date">Published: {html.escape(summary["pub_date"])}</div>')
+    html_parts.append('</div>')
+    html_parts.append('</div>')
+    return '\n'.join(html_parts)
 
+
+def generate_parcel_pages(index, parcels_dir, templates_dir, updated_time, manifest):
+    """
+    Generate a history page for every parcel in the property index, plus a page listing them.
+
+    A parcel's page shows every notice naming it, oldest first, followed by
+    other notices about the same street address. Pages are rebuilt only
+    when their notices change, and pages of parcels no longer in the index
+    are removed.
+    """
+    os.makedirs(parcels_dir, exist_ok=True)
+    template_path = os.path.join(templates_dir, 'parcel.html')
+    template_digest = file_digest(template_path)
+    expected_files = set()
+    listing = []
+
+    for parcel in sorted(index['parcels']):
+        history = property_index.parcel_history(index, parcel)
+        related = property_index.related_by_address(index, parcel)
+        page_name = f'{parcel}.html'
+        page_path = os.path.join(parcels_dir, page_name)
+        expected_files.add(page_name)
+        listing.append((parcel, history))
+
+        digest = hash_inputs(CODE_VERSION, template_digest, parcel, history, related)
+
+        def body(history=history, related=related):
+            for notice_id, summary in history:
+                yield generate_archived_notice_html(notice_id, summary) + '\n'
+            if related:
+                yield '<h2>Other notices at this address</h2>\n'
+                for notice_id, summary in related:
+                    yield generate_archived_notice_html(notice_id, summary) + '\n'
+
+        build_if_changed(manifest, page_path, digest, lambda: write_page(
+            body(), template_path, page_path, updated_time, placeholders={
+                'PARCEL': html.escape(parcel),
+                'APPRAISER_URL': html.escape(property_appraiser_url(parcel)),
+            }))
+
+    # Most recently noticed parcels first
+    listing.sort(key=lambda item: (item[1][-1][1]['pub_epoch'] or 0, item[0]), reverse=True)
+    items = []
+    for parcel, history in listing:
+        addresses = list(dict.fromkeys(s['property_address'] for _, s in history if s['property_address']))
+        meta = [f'{len(history)} notice{"s" if len(history) != 1 else ""}']
+        if history[-1][1]['pub_date']:
+            meta.append(f'latest {history[-1][1]["pub_date"]}')
+        items.append(
+            f'<li><a href="{parcel}.html">{html.escape(parcel)}</a>'
+            f'{" — " + html.escape("; ".join(addresses)) if addresses else ""}'
+            f'<div class="parcel-meta">{" · ".join(meta)}</div></li>'
+        )
+    index_template_path = os.path.join(templates_dir, 'parcels.html')
+    index_path = os.path.join(parcels_dir, 'index.html')
+    expected_files.add('index.html')
+    digest = hash_inputs(CODE_VERSION, file_digest(index_template_path), items)
+    build_if_changed(manifest, index_path, digest, lambda: write_page(
+        '\n'.join(items) or '<li>No parcels found.</li>', index_template_path, index_path, updated_time))
+
+    for filename in os.listdir(parcels_dir):
+        if filename not in expected_files:
+            stale_path = os.path.join(parcels_dir, filename)
+            os.remove(stale_path)
+            forget(manifest, stale_path)
+    print(f"  {len(index['parcels'])} parcel pages")
+
+
+def generate_case_meeting_html(event):
+    """Generate the HTML of a CivicClerk hearing on a case timeline."""
+    html_parts = [
+        '<div class="notice">',
+        '<div class="notice-content">',
+        f'<div class="notice-title">{html.escape(event["name"])}</div>',
+        f'<div class="notice-meeting-date">📅 Hearing: {html.escape(event["date"])}</div>',
+    ]
+    links = [
+        f'<a href="{html.escape(url)}" target="_blank">{html.escape(name)}</a>'
+        for name, url in event['files']
+    ]
+    if event['video_url']:
+        links.append(f'<a href="{html.escape(event["video_url"])}" target="_blank">Video</a>')
+    if links:
+        html_parts.append(f'<div class="notice-links">{"".join(links)}</div>')
+    html_parts.append('</div>')
+    html_parts.append('</div>')
+    return '\n'.join(html_parts)
+
+
+def generate_case_transcript_html(item):
+    """Generate the HTML of a case's mentions in one meeting transcript, linking each to the video."""
+    cues = []
+    for start_ms, text in item['cues']:
+        timestamp = html.escape(format_timestamp(start_ms))
+        if item['video_url']:
+            timestamp = f'<a href="{html.escape(item["video_url"])}#t={start_ms // 1000}" target="_blank">{timestamp}</a>'
+        cues.append(f'<li>{timestamp} {html.escape(text)}</li>')
+    return '\n'.join([
+        '<div class="notice">',
+        '<div class="notice-content">',
+        f'<div class="notice-title">Discussed at the Planning Advisory Board meeting of {html.escape(item["date"])}</div>',
+        f'<ul class="transcript-cues">{"".join(cues)}</ul>',
+        '</div>',
+        '</div>',
+    ])
+
+
+CASE_TIMELINE_RENDERERS = {
+    'notice': lambda item: generate_archived_notice_html(item['id'], item),
+    'meeting': generate_case_meeting_html,
+    'transcript': generate_case_transcript_html,
+}
+
+
+def generate_case_pages(index, cases_dir, templates_dir, updated_time, manifest):
+    """
+    Generate a timeline page for every case in the case index, plus a page listing them.
+
+    A case's timeline interleaves its notices, the CivicClerk events of its
+    hearings and its mentions in meeting transcripts (see
+    case_index.case_timeline). A page is rebuilt only when its timeline
+    changes, and pages of cases no longer in the index are removed.
+    """
+    os.makedirs(cases_dir, exist_ok=True)
+    template_path = os.path.join(templates_dir, 'case.html')
+    template_digest = file_digest(template_path)
+    events = case_index.events_by_day()
+    mentions = case_index.transcript_mentions(index)
+    expected_files = set()
+    listing = []
+
+    for case in case_index.all_cases(index):
+        timeline = case_index.case_timeline(index, case, events, mentions)
+        page_path = os.path.join(cases_dir, f'{case}.html')
+        expected_files.add(f'{case}.html')
+        listing.append((case, timeline))
+
+        digest = hash_inputs(CODE_VERSION, template_digest, case, timeline)
+        build_if_changed(manifest, page_path, digest, lambda timeline=timeline: write_page(
+            (CASE_TIMELINE_RENDERERS[item['kind']](item) + '\n' for item in timeline),
+            template_path, page_path, updated_time, placeholders={'CASE': html.escape(case)}))
+
+    # Most recently active cases first
+    listing.sort(key=lambda item: (item[1][-1]['date'], item[0]), reverse=True)
+    items = []
+    for case, timeline in listing:
+        kinds = [item['kind'] for item in timeline]
+        meta = [
+            f'{count} {label}{"s" if count != 1 else ""}'
+            for label, count in (
+                ('notice', kinds.count('notice')),
+                ('hearing', kinds.count('meeting')),
+                ('meeting transcript', kinds.count('transcript')),
+            )
+            if count
+        ]
+        titles = [item['description'] for item in timeline if item['kind'] == 'notice' and item['description']]
+        items.append(
+            f'<li><a href="{case}.html">{html.escape(case)}</a>'
+            f'{" — " + html.escape(titles[-1]) if titles else ""}'
+            f'<div class="case-meta">{" · ".join(meta)} · latest {html.escape(timeline[-1]["date"])}</div></li>'
+        )
+    index_template_path = os.path.join(templates_dir, 'cases.html')
+    index_path = os.path.join(cases_dir, 'index.html')
+    expected_files.add('index.html')
+    digest = hash_inputs(CODE_VERSION, file_digest(index_template_path), items)
+    build_if_changed(manifest, index_path, digest, lambda: write_page(
+        '\n'.join(items) or '<li>No cases found.</li>', index_template_path, index_path, updated_time))
+
+    for filename in os.listdir(cases_dir):
+        if filename not in expected_files:
+            stale_path = os.path.join(cases_dir, filename)
+            os.remove(stale_path)
+            forget(manifest, stale_path)
+    print(f"  {len(listing)} case pages")
+
+
+def notice_search_document(notice, category_key, category_name):
+    """Convert an archived notice into a search_index document linking to its archive page."""
+    fields = [
+        notice.get('description'),
+        notice.get('reference_num'),
+        notice.get('parcel_id'),
+        notice.get('property_address'),
+        notice.get('zoning_change'),
+        notice.get('meeting_date'),
+        notice.get('notice_text'),
+    ]
+    return {
+        'kind': 'notice',
+        'key': str(notice['id']),
+        'title': f"{notice.get('title', 'Untitled Notice')} ({category_name})",
+        'url': f"notices/{category_key}/archive/{archive_shard_key(notice)}.html#notice-{notice['id']}",
+        'date': notice.get('pub_date'),
+        'snippet': search_index.snippet(notice.get('description') or notice.get('notice_text') or ''),
+        'text': ' '.join(field for field in fields if field),
+    }
+
+
+def notices_digest(notices):
+    """Hash the rendered content of a list of notices (ignoring volatile fields)."""
+    return hash_inputs([
+        {k: v for k, v in notice.items() if k not in VOLATILE_NOTICE_FIELDS}
+        for notice in notices
+    ])
+
+
+def page_digest(notices, template_path, *extra):
+    """Hash everything a generated page depends on: code, template, notices and `extra`."""
+    return hash_inputs(CODE_VERSION, file_digest(template_path), *extra, notices_digest(notices))
+
+
+def build_if_changed(manifest, output_path, digest, build):
+    """
+    Run `build()` to write `output_path` unless it was already built from the same inputs.
+
+    `output_path` may also be a list of paths that `build()` writes together;
+    they are rebuilt unless every one of them is current.
+
+    Returns:
+        bool: True if the output was (re)built
+    """
+    output_paths = [output_path] if isinstance(output_path, str) else list(output_path)
+    if all(is_current(manifest, path, digest) for path in output_paths):
+        for path in output_paths:
+            print(f"  Unchanged {path}")
+        instrumentation.count('outputs_unchanged', len(output_paths))
+        return False
+
+    build()
+    instrumentation.count('outputs_built', len(output_paths))
+    for path in output_paths:
+        record(manifest, path, digest)
+        print(f"  Generated {path}")
+    return True
+
+
+def main():
+    """Main function to fetch notices and generate output files."""
+    error = None
+    try:
         # Get the script directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.join(script_dir, '..')
@@ -897,26 +1455,75 @@ def main():
         data_dir = os.path.join(project_root, 'data')
         templates_dir = os.path.join(project_root, 'templates')
         thumbnails_dir = os.path.join(docs_dir, 'thumbnails')
+        thumbnail_cache_path = os.path.join(data_dir, 'thumbnail_cache.json')
+        notices_data_dir = os.path.join(data_dir, 'notices')
+
+        # Open every category store up front so the fetch can stop as soon
+        # as it reaches notices that were archived on a previous run
+        os.makedirs(notices_data_dir, exist_ok=True)
+        stores = {}
+        known_ids = set()
+        with instrumentation.span('open_stores'):
+            for category_key in KNOWN_CATEGORIES:
+                stores[category_key] = open_store(notices_data_dir, category_key)
+                known_ids.update(stores[category_key].ids())
+                backfilled = backfill_normalized_dates(stores[category_key])
+                if backfilled:
+                    print(f"Backfilled normalized dates of {backfilled} {category_key} notices")
+            # Parcel and address lookups, kept up to date by each merge below
+            property_idx = property_index.load_index()
+            property_idx_changed = property_idx is None
+            if property_idx is None:
+                property_idx = property_index.rebuild(stores)
+            case_idx = case_index.load_index()
+            case_idx_changed = case_idx is None
+            if case_idx is None:
+                case_idx = case_index.rebuild(stores)
+
+        print(f"Fetching public notices ({len(known_ids)} already archived)...")
+        # The feed is paged lazily, so its time is recorded separately as fetch_and_parse/fetch
+        with instrumentation.span('fetch_and_parse'):
+            raw_notices = iter_kissimmee_notices(known_ids=known_ids, max_notices=MAX_FETCHED_NOTICES)
+            extractor_timings = {}
+            notices = parse_notices(instrumentation.timed(raw_notices, 'fetch'), extractor_timings)
+        instrumentation.count('notices_parsed', len(notices))
+        print(f"Parsed {len(notices)} notices")
+        for name, seconds in extractor_timings.items():
+            print(f"  {name}: {seconds * 1000:.1f} ms")
+
+        # Group notices by category (meeting body)
+        categories = group_notices_by_category(notices)
+        print(f"Found {len(categories)} notice categories: {', '.join(categories.keys())}")
+
+        # Ensure all known categories are present (even with no current notices)
+        # so pages are always regenerated and stale HTML doesn't reference deleted thumbnails
+        for cat_key, cat_name in KNOWN_CATEGORIES.items():
+            if cat_key not in categories:
+                categories[cat_key] = {'name': cat_name, 'notices': []}
 
         # Ensure directories exist
         os.makedirs(docs_dir, exist_ok=True)
         os.makedirs(data_dir, exist_ok=True)
 
-        # Generate thumbnails for ALL current notices first (before merging into archive)
+        # Generate thumbnails for ALL current notices first (before merging into archive).
+        # Unchanged PDFs are served from the thumbnail cache without rasterizing.
         print("Generating PDF thumbnails...")
+        thumbnail_cache = load_thumbnail_cache(thumbnail_cache_path)
+        with instrumentation.span('thumbnails'):
+            thumbnail_report = generate_thumbnails(notices, thumbnails_dir, cache=thumbnail_cache)
+        for entry in thumbnail_report.values():
+            instrumentation.count(f"thumbnails_{entry['status']}")
+            if entry['bytes']:
+                instrumentation.count('pdfs_fetched')
+                instrumentation.count('pdf_bytes_fetched', entry['bytes'])
         for notice in notices:
-            if notice.get('pdf_url'):
-                thumbnail_url = generate_pdf_thumbnail(
-                    notice['pdf_url'],
-                    notice['id'],
-                    thumbnails_dir
-                )
-                if thumbnail_url:
-                    notice['thumbnail_url'] = thumbnail_url
-                    print(f"  Generated thumbnail for notice {notice['id']}")
+            entry = thumbnail_report.get(notice['id'])
+            if entry and entry['thumbnail_url']:
+                notice['thumbnail_url'] = entry['thumbnail_url']
+        summarize_thumbnail_report(thumbnail_report)
         print(f"Thumbnail generation complete")
 
-        # Process each category: load archive, merge, save, prepare for page generation
+        # Process each category: merge into its store, prepare for page generation
         category_archives = {}  # Store archives and notices for each category
         for category_key, category_data in categories.items():
             category_name = category_data['name']
@@ -925,36 +1532,55 @@ def main():
             print(f"\nProcessing category: {category_name} ({category_key})")
             print(f"  Found {len(category_notices)} current notices")
 
-            # Archive path for this category (in data/notices/ subdirectory)
-            notices_data_dir = os.path.join(data_dir, 'notices')
-            os.makedirs(notices_data_dir, exist_ok=True)
-            archive_path = os.path.join(notices_data_dir, f'{category_key}.json')
-
-            # Load category-specific archive
-            archive = load_archive(archive_path)
-            print(f"  Archive contains {len(archive.get('notices', {}))} notices before merge")
-
-            # Merge and save
-            archive = merge_notices(archive, category_notices)
-            save_archive(archive, archive_path)
-
-            # Get all archived notices as a list (sorted by date, newest first)
-            all_notices = list(archive['notices'].values())
-            all_notices.sort(key=lambda n: n.get('pub_date', ''), reverse=True)
+            # Category-specific store in data/notices/ (already open unless the category is new)
+            if category_key not in stores:
+                stores[category_key] = open_store(notices_data_dir, category_key)
+            store = stores[category_key]
+            print(f"  Archive contains {len(store)} notices before merge")
+
+            # Merge (only new or changed notices are appended to the store)
+            with instrumentation.span('merge', category=category_key):
+                counts = merge_notices(store, category_notices)
+                print(f"  Merged {counts['new']} new, {counts['updated']} updated, {counts['unchanged']} unchanged notices")
+                if property_index.update(property_idx, category_key, category_notices):
+                    property_idx_changed = True
+                if case_index.update(case_idx, category_key, category_notices):
+                    case_idx_changed = True
+
+                # Get all archived notices as a list (sorted by date, newest first; undated last)
+                all_notices = list(store.iter_notices())
+                all_notices.sort(key=lambda n: n.get('pub_epoch') or 0, reverse=True)
+            for status, n in counts.items():
+                instrumentation.count(f'notices_{status}', n)
 
             # Store for page generation
             category_archives[category_key] = {
                 'name': category_name,
-                'current_notices': category_notices,
                 'all_notices': all_notices
             }
 
+        # The current pages and feeds show the newest archived notices, not just
+        # those fetched this run (a steady-state run only fetches the first page)
+        current_by_category = current_notices_by_category(stores)
+        current_window = [notice for notices in current_by_category.values() for notice in notices]
+        for notice in current_window:
+            # Thumbnails of notices that left the window earlier may have been evicted
+            if notice.get('thumbnail_url') and not os.path.exists(os.path.join(docs_dir, notice['thumbnail_url'])):
+                notice['thumbnail_url'] = None
+        for category_key, archive_data in category_archives.items():
+            archive_data['current_notices'] = current_by_category.get(category_key, [])
+        print(f"\nCurrent window: {len(current_window)} newest archived notices")
+
         updated_time = datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else None)
         if updated_time.tzinfo is None:
             # Fallback for older Python versions
             from datetime import timezone
             updated_time = datetime.now(timezone.utc)
 
+        # Pages whose inputs are unchanged since the last build are skipped entirely
+        manifest = load_manifest()
+        page_digests = []
+
         # Generate pages for each category
         for category_key, archive_data in category_archives.items():
             category_name = archive_data['name']
@@ -986,43 +1612,105 @@ def main():
             # Generate current notices page (index.html)
             current_template_path = os.path.join(templates_dir, 'pab.html')
             current_html_path = os.path.join(category_dir, 'index.html')
-            generate_static_html(display_notices_adjusted, current_template_path, current_html_path, updated_time, category_name)
-            print(f"  Generated {current_html_path}")
-
-            # Generate archive page from all historical notices (without thumbnails)
-            archive_notices_no_thumbs = []
-            for notice in all_notices:
-                notice_copy = notice.copy()
-                notice_copy['thumbnail_url'] = None
-                archive_notices_no_thumbs.append(notice_copy)
-
-            archive_template_path = os.path.join(templates_dir, 'pab_archive.html')
-            archive_html_path = os.path.join(category_dir, 'archive.html')
-            generate_static_html(archive_notices_no_thumbs, archive_template_path, archive_html_path, updated_time, category_name)
-            print(f"  Generated {archive_html_path} with {len(all_notices)} total notices")
-
-            # Generate RSS feed
-            rss_path = os.path.join(category_dir, 'rss.xml')
-            generate_rss(current_notices, rss_path)
-            print(f"  Generated {rss_path}")
-
-        # Generate landing page
+            with instrumentation.span('html', category=category_key):
+                digest = page_digest(display_notices_adjusted, current_template_path, category_name)
+                page_digests.append(digest)
+                build_if_changed(manifest, current_html_path, digest, lambda: generate_static_html(
+                    display_notices_adjusted, current_template_path, current_html_path, updated_time, category_name))
+
+            # Generate monthly archive pages from all historical notices (without thumbnails)
+            with instrumentation.span('archive', category=category_key, notices=len(all_notices)):
+                page_digests.extend(generate_archive_pages(
+                    all_notices, category_dir, templates_dir, updated_time, category_name, manifest))
+            print(f"  Archive has {len(all_notices)} total notices")
+
+            # Generate RSS/Atom/JSON feeds of current notices, and of the full archive
+            with instrumentation.span('feeds', category=category_key):
+                feed_paths = {fmt: os.path.join(category_dir, name) for fmt, name in FEED_FILES.items()}
+                digest = hash_inputs(CODE_VERSION, 'feed', category_name, notices_digest(current_notices))
+                build_if_changed(manifest, list(feed_paths.values()), digest, lambda: generate_rss(
+                    current_notices, feed_paths, updated_time, category_name))
+
+                archive_feed_paths = {fmt: os.path.join(category_dir, name) for fmt, name in ARCHIVE_FEED_FILES.items()}
+                digest = hash_inputs(CODE_VERSION, 'archive-feed', category_name, [
+                    [notice.get(field) for field in ARCHIVE_FEED_FIELDS] for notice in all_notices
+                ])
+                build_if_changed(manifest, list(archive_feed_paths.values()), digest, lambda: generate_rss(
+                    all_notices, archive_feed_paths, updated_time, category_name,
+                    include_thumbnails=False, archive=True))
+
+        if property_idx_changed:
+            property_index.save_index(property_idx)
+
+        # Generate a history page for every parcel named in a notice
+        print("\nGenerating parcel pages")
+        with instrumentation.span('parcels', parcels=len(property_idx['parcels'])):
+            generate_parcel_pages(
+                property_idx, os.path.join(docs_dir, 'parcels'), templates_dir, updated_time, manifest)
+
+        # Generate a timeline page for every case, rescanning only transcripts that changed
+        print("\nGenerating case pages")
+        with instrumentation.span('cases'):
+            if case_index.update_transcripts(case_idx):
+                case_idx_changed = True
+            if case_idx_changed:
+                case_index.save_index(case_idx)
+            generate_case_pages(case_idx, os.path.join(docs_dir, 'cases'), templates_dir, updated_time, manifest)
+
+        # Rebuild the static search index over every archived notice and meeting transcript
+        print("\nGenerating search index")
+        search_dir = os.path.join(docs_dir, 'search')
+        os.makedirs(search_dir, exist_ok=True)
+        with instrumentation.span('search_index'):
+            transcripts = search_index.discover_transcripts()
+            digest = hash_inputs(
+                SEARCH_CODE_VERSION,
+                [(key, notices_digest(data['all_notices'])) for key, data in category_archives.items()],
+                [(t['file'], file_digest(os.path.join(search_index.TRANSCRIPTS_DIR, t['file'])), t['video_url'] or '')
+                 for t in transcripts],
+            )
+            build_if_changed(manifest, os.path.join(search_dir, 'meta.json'), digest, lambda: search_index.write_search_index(
+                [
+                    notice_search_document(notice, key, data['name'])
+                    for key, data in category_archives.items()
+                    for notice in data['all_notices']
+                ] + list(search_index.transcript_documents()),
+                search_dir,
+            ))
+
+        search_template_path = os.path.join(templates_dir, 'search.html')
+        search_html_path = os.path.join(search_dir, 'index.html')
+        digest = page_digest([], search_template_path)
+        build_if_changed(manifest, search_html_path, digest, lambda: generate_static_html(
+            [], search_template_path, search_html_path, updated_time))
+
+        # Generate landing page (its "Last updated" moves only when some category page changed)
+        print()
         landing_template_path = os.path.join(templates_dir, 'index.html')
         landing_html_path = os.path.join(docs_dir, 'index.html')
-        generate_static_html([], landing_template_path, landing_html_path, updated_time)
-        print(f"Generated {landing_html_path}")
+        digest = hash_inputs(CODE_VERSION, file_digest(landing_template_path), page_digests)
+        build_if_changed(manifest, landing_html_path, digest, lambda: generate_static_html(
+            [], landing_template_path, landing_html_path, updated_time))
+        save_manifest(manifest)
 
-        # Clean up orphaned thumbnails (only keep thumbnails for current notices)
-        cleanup_thumbnails(thumbnails_dir, notices)
+        # Evict thumbnails of notices that left the current window (archive pages show none)
+        with instrumentation.span('evict_thumbnails'):
+            evict_thumbnails(thumbnails_dir, thumbnail_cache, keep_ids=[n['id'] for n in current_window])
+            save_thumbnail_cache(thumbnail_cache, thumbnail_cache_path)
 
+        http_client.print_stats()
         print("Done!")
 
     except Exception as e:
+        error = e
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
         raise
 
+    finally:
+        instrumentation.write_report(error=error, http=http_client.get_client().stats())
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,55 @@
+"""Tests for the single-pass abbreviation tagger (update_notices.wrap_codes_with_abbr)."""
+import html
+import re
+
+import pytest
+
+from update_notices import ABBR_CODES, wrap_codes_with_abbr
+
+
+def abbr(code):
+    return f'<abbr title="{html.escape(ABBR_CODES[code])}">{code}</abbr>'
+
+
+def wrap_codes_one_at_a_time(text):
+    """The original implementation: one substitution per code, longest first."""
+    if not text:
+        return text
+    for code in sorted(ABBR_CODES, key=len, reverse=True):
+        pattern = r'\b(' + re.escape(code) + r')(?=\s|\(|\)|,|$|-(?!\w))'
+        text = re.sub(pattern, abbr(code), text)
+    return text
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Rezone to MU-FR', f'Rezone to {abbr("MU-FR")}'),
+    ('MU and MU-D', f'{abbr("MU")} and {abbr("MU-D")}'),
+    ('(PUD)', f'({abbr("PUD")})'),
+    ('RA-1, RA-2', f'{abbr("RA-1")}, {abbr("RA-2")}'),
+    ('PAB - hearing', f'{abbr("PAB")} - hearing'),
+    ('SF-LDR → MF-MDR', f'{abbr("SF-LDR")} → {abbr("MF-MDR")}'),
+])
+def test_tags_codes(text, expected):
+    assert wrap_codes_with_abbr(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    'MUST', 'ORANGE', 'MU-X', 'T4', 'PUDS', 'in the city', 'XMU',
+])
+def test_leaves_other_words_alone(text):
+    assert wrap_codes_with_abbr(text) == text
+
+
+@pytest.mark.parametrize('text', [None, ''])
+def test_empty_text(text):
+    assert wrap_codes_with_abbr(text) == text
+
+
+@pytest.mark.parametrize('text', [
+    'Rezoning from RA-1 to MU-FR (PAB) and PUD',
+    'SF-MDR/MH-MDR, T5-M, T5-U; MUPUD-',
+    'AC AE AI AO B-2 B-3 B-5 BP CF CG CONS HC HF IB IN INST MMTD OR OS REC RPB SD T1 T3 T6 TD UT',
+    'MU-T, MU-V (MU) MU-D-',
+])
+def test_matches_one_code_at_a_time(text):
+    assert wrap_codes_with_abbr(text) == wrap_codes_one_at_a_time(text)
@@ -0,0 +1,85 @@
+"""Tests for crash-safe file writes."""
+import json
+import os
+import stat
+
+import pytest
+
+import atomic_io
+from atomic_io import atomic_write, atomic_write_json
+
+
+def test_replaces_the_file_when_the_block_completes(tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text('old')
+
+    with atomic_write(path) as f:
+        f.write('new')
+        assert path.read_text() == 'old'
+
+    assert path.read_text() == 'new'
+    assert os.listdir(tmp_path) == ['page.html']
+
+
+def test_leaves_the_file_untouched_when_the_block_raises(tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text('old')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write('partial')
+            raise RuntimeError('killed')
+
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['page.html']
+
+
+def test_writes_binary_files(tmp_path):
+    path = tmp_path / 'thumb.png'
+
+    with atomic_write(path, 'wb') as f:
+        f.write(b'\x89PNG')
+
+    assert path.read_bytes() == b'\x89PNG'
+
+
+def test_new_files_get_umask_permissions(tmp_path):
+    path = tmp_path / 'new.json'
+
+    atomic_write_json(path, {})
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == atomic_io.NEW_FILE_MODE
+
+
+def test_keeps_the_permissions_of_the_replaced_file(tmp_path):
+    path = tmp_path / 'script.sh'
+    path.write_text('old')
+    os.chmod(path, 0o750)
+
+    with atomic_write(path) as f:
+        f.write('new')
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o750
+
+
+def test_atomic_write_json_passes_dump_options(tmp_path):
+    path = tmp_path / 'data.json'
+
+    atomic_write_json(path, {'b': 1, 'a': 'é'}, sort_keys=True, ensure_ascii=False)
+
+    assert path.read_text(encoding='utf-8') == '{"a": "é", "b": 1}'
+    assert json.loads(path.read_text(encoding='utf-8')) == {'a': 'é', 'b': 1}
+
+
+def test_write_hooks_see_completed_writes_only(tmp_path, monkeypatch):
+    writes = []
+    monkeypatch.setattr(atomic_io, '_write_hooks', [])
+    atomic_io.add_write_hook(lambda path, size: writes.append((path, size)))
+
+    atomic_write_json(tmp_path / 'a.json', [1, 2])
+    with pytest.raises(ValueError):
+        with atomic_write(tmp_path / 'b.json') as f:
+            f.write('x')
+            raise ValueError
+
+    assert writes == [(tmp_path / 'a.json', 6)]
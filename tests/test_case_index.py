@@ -0,0 +1,95 @@
+"""Tests for the land-use case index."""
+import pytest
+
+import case_index
+from case_index import case_numbers, case_timeline, notice_case_numbers
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('ZMA-25-0009', ['ZMA-25-0009']),
+    ('zma 25-009 and LUPA-25-3', ['ZMA-25-0009', 'LUPA-25-0003']),
+    ('CUP-24-0001, CU-24-0002', ['CUP-24-0001', 'CU-24-0002']),
+    ('ZMA-25-0009 (ZMA 25-9)', ['ZMA-25-0009']),
+    ('DRC', []),
+    ('MAZMA-25-0009', []),
+    (None, []),
+])
+def test_case_numbers(text, expected):
+    assert case_numbers(text) == expected
+
+
+def test_notice_case_numbers_read_the_notice_text():
+    assert notice_case_numbers({
+        'reference_num': 'DRC',
+        'notice_text': 'Land Use Plan Amendment LUPA-25-0003, related to ZMA-25-0009',
+    }) == ['LUPA-25-0003', 'ZMA-25-0009']
+    assert notice_case_numbers({'reference_num': 'ZMA-25-0009', 'notice_text': 'LUPA-25-0003'}) == [
+        'ZMA-25-0009', 'LUPA-25-0003',
+    ]
+    assert notice_case_numbers({}) == []
+
+
+def notice(notice_id, reference_num, notice_text='', pub_date='2025-11-24', meeting_iso=None):
+    return {
+        'id': notice_id, 'reference_num': reference_num, 'notice_text': notice_text,
+        'title': f'Notice {notice_id}', 'pub_date': pub_date, 'meeting_iso': meeting_iso,
+    }
+
+
+def test_files_a_notice_under_every_case_it_names():
+    index = case_index.empty_index()
+
+    case_index.update(index, 'city-commission', [
+        notice(2, 'DRC', 'LUPA-25-0003 and ZMA-25-0009'),
+        notice(1, 'LUPA-25-0003'),
+        notice(3, 'DRC', 'No case here'),
+    ])
+
+    assert index['cases'] == {'LUPA-25-0003': ['1', '2'], 'ZMA-25-0009': ['2']}
+    assert set(index['notices']) == {'1', '2'}
+
+    assert case_index.update(index, 'city-commission', [notice(2, 'DRC', 'ZMA-25-0009')]) == 1
+    assert index['cases'] == {'LUPA-25-0003': ['1'], 'ZMA-25-0009': ['2']}
+
+
+@pytest.fixture
+def transcripts_dir(tmp_path):
+    (tmp_path / '2025-12-03.srt').write_text(
+        '1\n00:00:01,000 --> 00:00:04,000\nNext item, ZMA 25-009,\non Fortune Road.\n\n'
+        '2\n00:01:00,500 --> 00:01:03,000\nNothing to see here.\n',
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+def test_scans_transcripts_for_spoken_case_numbers(transcripts_dir):
+    index = case_index.empty_index()
+
+    assert case_index.update_transcripts(index, transcripts_dir) == 1
+    assert index['transcripts']['2025-12-03.srt']['mentions'] == {
+        'ZMA-25-0009': [[1000, 'Next item, ZMA 25-009, on Fortune Road.']],
+    }
+    assert case_index.update_transcripts(index, transcripts_dir) == 0
+
+    (transcripts_dir / '2025-12-03.srt').unlink()
+    assert case_index.update_transcripts(index, transcripts_dir) == 1
+    assert index['transcripts'] == {}
+
+
+def test_case_timeline(transcripts_dir):
+    index = case_index.empty_index()
+    case_index.update(index, 'pab', [notice(1, 'ZMA-25-0009', pub_date='2025-11-24',
+                                            meeting_iso='2025-12-03T18:00:00-05:00')])
+    case_index.update_transcripts(index, transcripts_dir)
+    events = {'2025-12-03': [
+        {'id': 7, 'name': 'Planning Advisory Board', 'date': '2025-12-03', 'files': [], 'video_url': None},
+        {'id': 8, 'name': 'City Commission', 'date': '2025-12-03', 'files': [], 'video_url': None},
+    ]}
+
+    timeline = case_timeline(index, 'ZMA-25-0009', events, case_index.transcript_mentions(index))
+
+    assert [(item['date'], item['kind']) for item in timeline] == [
+        ('2025-11-24', 'notice'), ('2025-12-03', 'meeting'), ('2025-12-03', 'transcript'),
+    ]
+    assert timeline[1]['id'] == 7
+    assert case_index.all_cases(index) == ['ZMA-25-0009']
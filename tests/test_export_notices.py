@@ -0,0 +1,120 @@
+"""Tests for the columnar notice export and the parcel number extractor it shares with the parcel index."""
+from datetime import date, datetime, timezone
+
+import pytest
+
+import export_notices
+from notice_store import NoticeStore
+from property_index import parcel_numbers
+
+
+@pytest.mark.parametrize('parcel_id, expected', [
+    ('19-25-29-00U0-0120-0000', ['19-25-29-00U0-0120-0000']),
+    ('19-25-29-00U0-0120-0000.', ['19-25-29-00U0-0120-0000']),
+    ('19- 25-30-00u0-0050- 0000', ['19-25-30-00U0-0050-0000']),
+    ('12-22-30-3378-01-6802 and 12-22-30-3378-01-6803', ['12-22-30-3378-01-6802', '12-22-30-3378-01-6803']),
+    ('19-25-29-00U0-0120-0000, 19-25-29-00U0-0120-0000', ['19-25-29-00U0-0120-0000']),
+    ('19-25-29-00U0-0120-0000 The property is generally located north of', ['19-25-29-00U0-0120-0000']),
+    ('See attached legal description', []),
+    (None, []),
+])
+def test_parcel_numbers(parcel_id, expected):
+    assert parcel_numbers(parcel_id) == expected
+
+
+NOTICE = {
+    'id': '11366058',
+    'pub_date': '2025-11-24',
+    'meeting_date': 'Wednesday, December 3, 2025 at 6:00 p.m.',
+    'amendment_type': {'code': 'ZMA', 'name': 'Zoning Map Amendment'},
+    'reference_num': 'ZMA-25-0009',
+    'parcel_id': '19-25-29-00U0-0120-0000. Legal description on file',
+    'property_address': '2220 Fortune Road',
+    'zoning_change': 'RC-2 (Multiple Family Residential) → MU-FR (Mixed Use)',
+    'first_seen': '2025-11-24T18:21:09+00:00',
+    'last_seen': '2025-11-25T18:21:09',
+}
+
+
+def test_notice_row():
+    row = export_notices.notice_row(NOTICE, 'pab')
+
+    assert row == {
+        'id': 11366058,
+        'category': 'pab',
+        'pub_date': date(2025, 11, 24),
+        'pub_month': '2025-11',
+        'meeting_datetime': datetime(2025, 12, 3, 18, 0),
+        'amendment_type': 'ZMA',
+        'reference_num': 'ZMA-25-0009',
+        'parcel_ids': ['19-25-29-00U0-0120-0000'],
+        'property_address': '2220 Fortune Road',
+        'zoning_from': 'RC-2 (Multiple Family Residential)',
+        'zoning_to': 'MU-FR (Mixed Use)',
+        'zoning_from_district': 'RC-2',
+        'zoning_to_district': 'MU-FR',
+        'first_seen': datetime(2025, 11, 24, 18, 21, 9, tzinfo=timezone.utc),
+        'last_seen': datetime(2025, 11, 25, 18, 21, 9, tzinfo=timezone.utc),
+    }
+    assert set(row) == {name for name, _ in export_notices.COLUMNS}
+
+
+def test_notice_row_of_a_sparse_notice():
+    row = export_notices.notice_row({'id': 1, 'pub_date': 'not a date'}, 'other')
+
+    assert row['pub_date'] is None and row['pub_month'] is None
+    assert row['parcel_ids'] == []
+    assert row['zoning_from_district'] is None and row['zoning_to'] is None
+
+
+@pytest.fixture
+def notices_dir(tmp_path):
+    store = NoticeStore(str(tmp_path), 'pab')
+    store.upsert(NOTICE)
+    store.upsert({'id': 5, 'pub_date': '2025-01-02', 'parcel_id': '12-22-30-3378-01-6802 and 12-22-30-3378-01-6803'})
+    store.flush()
+    return str(tmp_path)
+
+
+def test_export_npz(notices_dir, tmp_path):
+    numpy = pytest.importorskip('numpy')
+    output_path = tmp_path / 'notices.npz'
+
+    export_notices.export_notices('npz', str(output_path), notices_dir)
+
+    data = numpy.load(output_path)
+    assert data['id'].tolist() == [5, 11366058]
+    assert data['parcel_ids.offsets'].tolist() == [0, 2, 3]
+    assert data['parcel_ids.values'][2] == '19-25-29-00U0-0120-0000'
+    assert data['zoning_to_district.categories'].tolist() == ['MU-FR']
+    assert data['zoning_to_district'].tolist() == [-1, 0]
+    assert data['pub_date'].astype(str).tolist() == ['2025-01-02', '2025-11-24']
+
+
+def test_export_parquet(notices_dir, tmp_path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    output_path = tmp_path / 'notices.parquet'
+
+    export_notices.export_notices('parquet', str(output_path), notices_dir)
+
+    table = pyarrow_parquet.read_table(output_path)
+    assert table.column_names == [name for name, _ in export_notices.COLUMNS]
+    assert table.column('parcel_ids').to_pylist() == [
+        ['12-22-30-3378-01-6802', '12-22-30-3378-01-6803'], ['19-25-29-00U0-0120-0000'],
+    ]
+    assert table.column('meeting_datetime').to_pylist() == [None, datetime(2025, 12, 3, 18, 0)]
+
+
+def test_export_rejects_unknown_formats(notices_dir, monkeypatch):
+    monkeypatch.setattr(export_notices, 'numpy', object())
+
+    with pytest.raises(ValueError):
+        export_notices.export_notices('csv', None, notices_dir)
+
+
+def test_export_needs_pyarrow_or_numpy(notices_dir, monkeypatch):
+    monkeypatch.setattr(export_notices, 'pyarrow', None)
+    monkeypatch.setattr(export_notices, 'numpy', None)
+
+    with pytest.raises(RuntimeError):
+        export_notices.export_notices(None, None, notices_dir)
@@ -0,0 +1,136 @@
+"""Tests for the streaming RSS, Atom and JSON Feed writers."""
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+import pytest
+
+from feeds import ATOM_NAMESPACE, write_feeds
+
+
+EASTERN = timezone(timedelta(hours=-5))
+
+FEED = {
+    'title': 'Kissimmee PAB & City Commission',
+    'link': 'https://kissimmee.fyi/notices/pab/',
+    'description': 'Public notices <unofficial>',
+    'language': 'en-us',
+    'updated': datetime(2025, 11, 25, 13, 0, tzinfo=timezone.utc),
+    'urls': {'atom': 'https://kissimmee.fyi/notices/pab/atom.xml', 'json': 'https://kissimmee.fyi/notices/pab/feed.json'},
+}
+
+ITEMS = [
+    {
+        'id': '11366058',
+        'title': 'Rezoning <RC-2> & MU-FR',
+        'link': 'https://kissimmee.fyi/notices/pab/archive/2025-11.html#notice-11366058',
+        'description': 'Hearing on 2220 Fortune Rd. & more',
+        'pub_date': datetime(2025, 11, 24, 0, 0, tzinfo=EASTERN),
+        'image': 'https://kissimmee.fyi/thumbnails/11366058.jpg',
+    },
+    {
+        'id': 'https://kissimmee.fyi/blog/welcome.html',
+        'title': 'Welcome',
+        'link': 'https://kissimmee.fyi/blog/welcome.html',
+        'description': 'Plain text',
+        'pub_date': datetime(2025, 11, 20, 12, 30),
+        'permalink': True,
+    },
+]
+
+
+@pytest.fixture
+def feed_files(tmp_path):
+    paths = {fmt: tmp_path / name for fmt, name in (('rss', 'rss.xml'), ('atom', 'atom.xml'), ('json', 'feed.json'))}
+    assert write_feeds(FEED, iter(ITEMS), paths) == 2
+    return paths
+
+
+def test_rss(feed_files):
+    channel = ET.parse(feed_files['rss']).getroot().find('channel')
+
+    assert channel.findtext('title') == FEED['title']
+    assert channel.findtext('description') == FEED['description']
+    assert channel.findtext('language') == 'en-us'
+    assert channel.findtext('lastBuildDate') == 'Tue, 25 Nov 2025 13:00:00 GMT'
+
+    first, second = channel.findall('item')
+    assert first.findtext('title') == 'Rezoning <RC-2> & MU-FR'
+    assert first.findtext('link') == ITEMS[0]['link']
+    assert first.findtext('description') == ITEMS[0]['description']
+    assert first.findtext('pubDate') == 'Mon, 24 Nov 2025 00:00:00 -0500'
+    assert parsedate_to_datetime(first.findtext('pubDate')) == ITEMS[0]['pub_date']
+    assert first.find('guid').text == '11366058'
+    assert first.find('guid').get('isPermaLink') == 'false'
+    assert first.find('enclosure').attrib == {'url': ITEMS[0]['image'], 'type': 'image/jpeg'}
+
+    assert second.find('guid').get('isPermaLink') is None
+    assert second.findtext('pubDate') == 'Thu, 20 Nov 2025 12:30:00 +0000'
+    assert second.find('enclosure') is None
+
+
+def test_rss_escapes_markup(feed_files):
+    raw = feed_files['rss'].read_text(encoding='utf-8')
+
+    assert 'Rezoning &lt;RC-2&gt; &amp; MU-FR' in raw
+    assert '<RC-2>' not in raw
+
+
+def test_atom(feed_files):
+    ns = {'atom': ATOM_NAMESPACE}
+    root = ET.parse(feed_files['atom']).getroot()
+
+    assert root.tag == f'{{{ATOM_NAMESPACE}}}feed'
+    assert root.findtext('atom:title', namespaces=ns) == FEED['title']
+    assert root.findtext('atom:id', namespaces=ns) == FEED['urls']['atom']
+    assert root.findtext('atom:updated', namespaces=ns) == '2025-11-25T13:00:00+00:00'
+    assert root.findtext('atom:author/atom:name', namespaces=ns) == 'kissimmee.fyi'
+    assert root.find('atom:link[@rel="self"]', ns).get('href') == FEED['urls']['atom']
+
+    first, second = root.findall('atom:entry', ns)
+    assert first.findtext('atom:title', namespaces=ns) == 'Rezoning <RC-2> & MU-FR'
+    assert first.findtext('atom:id', namespaces=ns) == 'tag:kissimmee.fyi,2025:11366058'
+    assert first.findtext('atom:published', namespaces=ns) == '2025-11-24T00:00:00-05:00'
+    assert datetime.fromisoformat(first.findtext('atom:updated', namespaces=ns)) == ITEMS[0]['pub_date']
+    assert first.find('atom:summary', ns).get('type') == 'text'
+    assert first.find('atom:link[@rel="enclosure"]', ns).get('href') == ITEMS[0]['image']
+
+    assert second.findtext('atom:id', namespaces=ns) == ITEMS[1]['id']
+    assert second.findtext('atom:published', namespaces=ns) == '2025-11-20T12:30:00+00:00'
+
+
+def test_json_feed(feed_files):
+    feed = json.loads(feed_files['json'].read_text(encoding='utf-8'))
+
+    assert feed['version'] == 'https://jsonfeed.org/version/1.1'
+    assert feed['title'] == FEED['title']
+    assert feed['home_page_url'] == FEED['link']
+    assert feed['feed_url'] == FEED['urls']['json']
+    assert feed['items'] == [
+        {
+            'id': '11366058',
+            'url': ITEMS[0]['link'],
+            'title': 'Rezoning <RC-2> & MU-FR',
+            'content_text': ITEMS[0]['description'],
+            'date_published': '2025-11-24T00:00:00-05:00',
+            'image': ITEMS[0]['image'],
+        },
+        {
+            'id': ITEMS[1]['id'],
+            'url': ITEMS[1]['link'],
+            'title': 'Welcome',
+            'content_text': 'Plain text',
+            'date_published': '2025-11-20T12:30:00+00:00',
+        },
+    ]
+
+
+def test_empty_feeds_are_valid(tmp_path):
+    paths = {'rss': tmp_path / 'rss.xml', 'atom': tmp_path / 'atom.xml', 'json': tmp_path / 'feed.json'}
+
+    assert write_feeds({'title': 'Empty', 'link': 'https://kissimmee.fyi/', 'description': ''}, [], paths) == 0
+
+    assert ET.parse(paths['rss']).getroot().find('channel').findall('item') == []
+    assert ET.parse(paths['atom']).getroot().findall(f'{{{ATOM_NAMESPACE}}}entry') == []
+    assert json.loads(paths['json'].read_text(encoding='utf-8'))['items'] == []
@@ -0,0 +1,181 @@
+"""Tests for http_client against a local HTTP server."""
+import socket
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from http_client import HttpClient, TokenBucket, retry_after_seconds
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, headers) of the server's script, then 200."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(time.monotonic())
+            status, headers = self.server.script.pop(0) if self.server.script else (200, {})
+        body = b'ok' if status == 200 else b'error'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    server.script = []
+    server.requests = []
+    server.lock = threading.Lock()
+    server.host = f'127.0.0.1:{server.server_address[1]}'
+    server.url = f'http://{server.host}/'
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(max_retries=3)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, 'BACKOFF_BASE', 0)
+
+
+def test_returns_successful_response(server, client):
+    response = client.get(server.url)
+
+    assert response.status_code == 200
+    assert response.text == 'ok'
+    stats = client.stats()[server.host]
+    assert stats['requests'] == 1
+    assert stats['retries'] == 0
+    assert stats['bytes'] == 2
+
+
+def test_retries_server_errors(server, client, no_backoff):
+    server.script = [(503, {}), (502, {})]
+
+    response = client.get(server.url)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+    stats = client.stats()[server.host]
+    assert stats['retries'] == 2
+    assert stats['errors'] == 2
+
+
+def test_returns_last_error_when_retries_run_out(server, client, no_backoff):
+    server.script = [(503, {})] * 5
+
+    response = client.get(server.url)
+
+    assert response.status_code == 503
+    assert len(server.requests) == client.max_retries + 1
+
+
+def test_does_not_retry_client_errors(server, client):
+    server.script = [(404, {})]
+
+    assert client.get(server.url).status_code == 404
+    assert len(server.requests) == 1
+
+
+def test_retry_false_returns_first_response(server, client):
+    server.script = [(503, {})]
+
+    assert client.get(server.url, retry=False).status_code == 503
+    assert len(server.requests) == 1
+
+
+def test_honors_retry_after(server, client):
+    server.script = [(429, {'Retry-After': '1'})]
+
+    response = client.get(server.url)
+
+    assert response.status_code == 200
+    first, second = server.requests
+    assert second - first >= 0.9
+
+
+def test_retries_connection_errors_then_raises(no_backoff):
+    # A port nothing is listening on
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    client = HttpClient(max_retries=2)
+
+    with pytest.raises(http_client.requests.ConnectionError):
+        client.get(f'http://127.0.0.1:{port}/')
+
+    stats = client.stats()[f'127.0.0.1:{port}']
+    assert stats['requests'] == 3
+    assert stats['errors'] == 3
+    assert stats['retries'] == 2
+
+
+def test_rate_limits_requests_per_host(server):
+    client = HttpClient(rate_limits={server.host: (10, 1)})
+
+    for _ in range(4):
+        client.get(server.url)
+
+    # One request in the burst, then one every 0.1s
+    assert server.requests[-1] - server.requests[0] >= 0.25
+    assert client.stats()[server.host]['throttled_seconds'] >= 0.25
+    client.close()
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    bucket = TokenBucket(rate=20, capacity=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == pytest.approx(0.05, abs=0.02)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+
+    time.sleep(0.05)
+
+    assert bucket.acquire() == 0
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('3', 3.0),
+    ('-5', 0.0),
+    ('soon', None),
+])
+def test_retry_after_seconds(value, expected):
+    assert retry_after_seconds(FakeResponse({'Retry-After': value})) == expected
+
+
+def test_retry_after_http_date():
+    value = formatdate(time.time() + 60, usegmt=True)
+
+    assert retry_after_seconds(FakeResponse({'Retry-After': value})) == pytest.approx(60, abs=2)
+
+
+def test_retry_after_missing():
+    assert retry_after_seconds(FakeResponse({})) is None
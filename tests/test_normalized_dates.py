@@ -0,0 +1,51 @@
+"""Tests for the normalized publication and meeting dates stored with each notice."""
+from datetime import datetime
+
+import pytest
+
+from notice_store import NoticeStore
+from update_notices import backfill_normalized_dates, normalized_date_fields, parse_meeting_datetime
+
+
+@pytest.mark.parametrize('meeting_date, expected', [
+    ('Wednesday, November 19, 2025 at 6:00 p.m.', datetime(2025, 11, 19, 18, 0)),
+    ('Tuesday, Dec. 2, 2025 at 9 a.m.', datetime(2025, 12, 2, 9, 0)),
+    ('Monday, Sept. 8, 2025 at 12:30 p.m.', datetime(2025, 9, 8, 12, 30)),
+    ('Monday, September 8, 2025 at 12:15 a.m.', datetime(2025, 9, 8, 0, 15)),
+    ('Friday, Smarch 1, 2025 at 6:00 p.m.', None),
+    ('Friday, February 30, 2025 at 6:00 p.m.', None),
+    ('TBD', None),
+    (None, None),
+])
+def test_parse_meeting_datetime(meeting_date, expected):
+    assert parse_meeting_datetime(meeting_date) == expected
+
+
+def test_normalized_date_fields_use_eastern_time():
+    # Standard time (UTC-5) for the meeting, daylight time (UTC-4) for publication
+    assert normalized_date_fields('2025-10-01', 'Wednesday, November 19, 2025 at 6:00 p.m.') == {
+        'pub_epoch': 1759291200,
+        'meeting_iso': '2025-11-19T18:00:00-05:00',
+        'meeting_epoch': 1763593200,
+    }
+
+
+def test_normalized_date_fields_of_unparseable_dates():
+    assert normalized_date_fields('soon', 'TBD') == {'pub_epoch': None, 'meeting_iso': None, 'meeting_epoch': None}
+    assert normalized_date_fields(None, None)['pub_epoch'] is None
+
+
+def test_backfill_adds_fields_to_old_notices_once(tmp_path):
+    store = NoticeStore(str(tmp_path), 'pab')
+    store.upsert({'id': 1, 'pub_date': '2025-11-24', 'meeting_date': 'Wednesday, December 3, 2025 at 6:00 p.m.'},
+                 seen_at='t1')
+    store.upsert({'id': 2, 'pub_date': '2025-11-25', **normalized_date_fields('2025-11-25', None)}, seen_at='t1')
+    store.flush()
+
+    assert backfill_normalized_dates(store) == 1
+
+    notice = store.get(1)
+    assert notice['meeting_iso'] == '2025-12-03T18:00:00-05:00'
+    assert notice['last_seen'] == 't1'
+    assert store.index_entries()['1']['pub_epoch'] == notice['pub_epoch']
+    assert backfill_normalized_dates(NoticeStore(str(tmp_path), 'pab')) == 0
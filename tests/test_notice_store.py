@@ -0,0 +1,122 @@
+"""Tests for the append-only notice store."""
+import json
+import os
+
+import pytest
+
+from notice_store import NoticeStore, open_store
+
+
+def notice(notice_id, title='Notice', pub_date='2025-11-01', **fields):
+    return {'id': notice_id, 'title': title, 'pub_date': pub_date, **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NoticeStore(str(tmp_path), 'pab')
+
+
+def test_upsert_reports_new_updated_and_unchanged(store):
+    assert store.upsert(notice(1), seen_at='t1') == 'new'
+    assert store.upsert(notice(1), seen_at='t2') == 'unchanged'
+    assert store.upsert(notice(1, title='Amended'), seen_at='t3') == 'updated'
+
+    assert store.get(1) == notice(1, title='Amended', last_seen='t3')
+    assert store.get(2) is None
+    assert len(store) == 1 and 1 in store and '1' in store
+
+
+def test_reseen_notice_only_updates_the_index(store):
+    store.upsert(notice(1), seen_at='t1')
+    log_size = os.path.getsize(store.log_path)
+
+    store.upsert(notice(1), seen_at='t2')
+
+    assert os.path.getsize(store.log_path) == log_size
+    assert store.get(1)['last_seen'] == 't2'
+    assert store.index_entries()['1']['last_seen'] == 't2'
+
+
+def test_flushed_store_reopens_from_its_index(tmp_path, store):
+    store.upsert(notice(2, pub_date='2025-10-01'), seen_at='t1')
+    store.upsert(notice(1, pub_date='2025-11-01'), seen_at='t1')
+    store.flush('2025-11-02')
+
+    reopened = NoticeStore(str(tmp_path), 'pab')
+
+    assert reopened.last_updated == '2025-11-02'
+    assert reopened.ids() == {'1', '2'}
+    assert [n['id'] for n in reopened.iter_notices()] == [2, 1]
+    assert [n['id'] for n in reopened.iter_by_date('2025-11-01')] == [1]
+    assert [n['id'] for n in reopened.iter_by_date(end='2025-11-01')] == [2]
+
+
+def test_index_is_written_one_notice_per_line_in_id_order(store):
+    for notice_id in (10, 9, 100):
+        store.upsert(notice(notice_id), seen_at='t1')
+    store.flush()
+
+    with open(store.index_path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert [line.split(':')[0] for line in lines[4:7]] == ['"9"', '"10"', '"100"']
+    with open(store.index_path, encoding='utf-8') as f:
+        assert json.load(f)['log_size'] == os.path.getsize(store.log_path)
+
+
+def test_stale_index_is_rebuilt_and_torn_record_dropped(tmp_path, store):
+    store.upsert(notice(1), seen_at='t1')
+    store.flush()
+    store.upsert(notice(2), seen_at='t1')
+    with open(store.log_path, 'ab') as f:
+        f.write(b'{"id": 3, "tit')
+
+    reopened = NoticeStore(str(tmp_path), 'pab')
+
+    assert reopened.ids() == {'1', '2'}
+    assert reopened.get(2) == notice(2, last_seen='t1')
+    with open(reopened.log_path, 'rb') as f:
+        assert f.read().endswith(b'}\n')
+
+
+def test_compact_drops_superseded_records(store):
+    store.upsert(notice(1), seen_at='t1')
+    store.upsert(notice(1, title='Amended'), seen_at='t2')
+    store.upsert(notice(2), seen_at='t2')
+    before = list(store.iter_notices())
+    assert store.garbage_bytes() > 0
+
+    store.compact()
+
+    assert store.garbage_bytes() == 0
+    assert list(store.iter_notices()) == before
+
+
+def test_apply_journals_the_batch_and_removes_the_journal(store):
+    counts = store.apply([notice(1), notice(2)], seen_at='t1', last_updated='t1')
+
+    assert counts == {'new': 2, 'updated': 0, 'unchanged': 0}
+    assert not os.path.exists(store.journal_path)
+    assert store.apply([notice(1)], seen_at='t2') == {'new': 0, 'updated': 0, 'unchanged': 1}
+
+
+def test_open_store_replays_an_interrupted_merge(tmp_path, store):
+    store.apply([notice(1)], seen_at='t1')
+    with open(store.journal_path, 'w', encoding='utf-8') as f:
+        json.dump({'seen_at': 't2', 'last_updated': 't2', 'records': [notice(1, title='Amended'), notice(2)]}, f)
+
+    reopened = open_store(str(tmp_path), 'pab')
+
+    assert not os.path.exists(reopened.journal_path)
+    assert reopened.get(1)['title'] == 'Amended'
+    assert reopened.get(2) == notice(2, last_seen='t2')
+    assert reopened.last_updated == 't2'
+
+
+def test_open_store_imports_a_legacy_archive(tmp_path):
+    archive = {'last_updated': 't1', 'notices': {'1': notice(1, last_seen='t1'), '2': notice(2, last_seen='t1')}}
+    with open(tmp_path / 'pab.json', 'w', encoding='utf-8') as f:
+        json.dump(archive, f)
+
+    store = open_store(str(tmp_path), 'pab')
+
+    assert store.to_archive() == archive
@@ -0,0 +1,133 @@
+"""Tests for the incremental CivicClerk sync."""
+import json
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+import pab_meetings
+from pab_meetings import merge_records, sync_window_start, updated_sync_state
+
+
+def event(event_id, name="Planning Advisory Board", start="2025-11-05T18:00:00Z", created="2025-10-01T12:00:00Z", **fields):
+    return {"id": event_id, "eventName": name, "startDateTime": start, "eventDate": start, "createdOn": created, **fields}
+
+
+@pytest.mark.parametrize("state, expected", [
+    # The latest event starts in the future: look back from today
+    ({"max_start_date_time": "2026-01-14T18:00:00Z"}, date(2025, 9, 16)),
+    # No event since long ago: look back from the latest one
+    ({"max_start_date_time": "2025-03-01T18:00:00Z"}, date(2024, 12, 31)),
+    ({"max_start_date_time": None}, date(2025, 9, 16)),
+    ({}, date(2025, 9, 16)),
+])
+def test_sync_window_start(state, expected):
+    assert sync_window_start(state, today=date(2025, 11, 15)) == expected
+
+
+def test_updated_sync_state():
+    assert updated_sync_state({
+        "1": event(1, start="2025-11-05T18:00:00Z", created="2025-10-01T12:00:00Z"),
+        "2": event(2, start="2025-12-03T18:00:00Z", created="2025-09-01T12:00:00Z"),
+    }) == {"max_start_date_time": "2025-12-03T18:00:00Z", "max_created_on": "2025-10-01T12:00:00Z"}
+    assert updated_sync_state({}) == {"max_start_date_time": None, "max_created_on": None}
+
+
+def test_merge_records_counts_new_and_updated(tmp_path):
+    path = tmp_path / "events.json"
+    path.write_text(json.dumps({"1": event(1), "2": event(2)}))
+
+    merged, new, updated = merge_records(path, {1: event(1, name="Cancelled"), 3: event(3)})
+
+    assert (new, updated) == (1, 1)
+    assert set(merged) == {"1", "2", "3"}
+    assert json.loads(path.read_text()) == merged
+    assert merged["1"]["eventName"] == "Cancelled"
+
+
+def test_merge_records_ignores_volatile_fields(tmp_path):
+    path = tmp_path / "events.json"
+    stored = event(1, mediaTotalPlay=10, isLive=False, streamingStatus="ended")
+    path.write_text(json.dumps({"1": stored}))
+    mtime = os.stat(path).st_mtime_ns
+
+    merged, new, updated = merge_records(path, {"1": event(1, mediaTotalPlay=11, isLive=True, streamingStatus="live")})
+
+    assert (new, updated) == (0, 0)
+    assert merged["1"] == stored
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_merge_records_creates_the_file(tmp_path):
+    path = tmp_path / "events.json"
+
+    assert merge_records(path, {}) == ({}, 0, 0)
+    assert not path.exists()
+    assert merge_records(path, {"1": event(1)})[1:] == (1, 0)
+    assert path.exists()
+
+
+class FakeEvent(SimpleNamespace):
+    def __init__(self, raw):
+        super().__init__(raw=raw, event_name=raw["eventName"])
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    """Run pab_meetings.main() against fake harvests; returns the calls made."""
+    calls = {"harvest": [], "saved": []}
+    events = {"1": FakeEvent(event(1)), "2": FakeEvent(event(2, name="City Commission"))}
+    media = {"1": SimpleNamespace(raw={"id": 1, "closedCaptionUrl": "https://example.com/1.srt"})}
+
+    def harvest_events(start, end):
+        calls["harvest"].append(("full", start))
+        return events, media
+
+    def harvest_changed_events(window_start, created_after):
+        calls["harvest"].append(("changed", window_start, created_after))
+        return events, media
+
+    monkeypatch.setattr(pab_meetings, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(pab_meetings, "harvest_events", harvest_events)
+    monkeypatch.setattr(pab_meetings, "harvest_changed_events", harvest_changed_events)
+    monkeypatch.setattr(pab_meetings, "fetch_transcripts", lambda jobs: calls.update(jobs=jobs))
+    monkeypatch.setattr(pab_meetings, "build_index", lambda: None)
+    monkeypatch.setattr(pab_meetings, "save_sync_state", lambda state: calls["saved"].append(state))
+    monkeypatch.setattr(pab_meetings.http_client, "print_stats", lambda: None)
+
+    def run(state, *args):
+        monkeypatch.setattr(pab_meetings, "load_sync_state", lambda: state)
+        monkeypatch.setattr(pab_meetings.sys, "argv", ["pab_meetings.py", *args])
+        pab_meetings.main()
+        return calls
+    return run
+
+
+def test_sync_fetches_the_window_and_new_events(sync, tmp_path):
+    state = {"max_start_date_time": "2025-03-01T18:00:00Z", "max_created_on": "2025-10-01T12:00:00Z"}
+
+    calls = sync(state)
+
+    assert calls["harvest"] == [("changed", date(2024, 12, 31), "2025-10-01T12:00:00Z")]
+    assert set(json.loads((tmp_path / "events.json").read_text())) == {"1", "2"}
+    assert set(json.loads((tmp_path / "pab_meetings.json").read_text())) == {"1"}
+    assert calls["jobs"] == [{"event_id": 1, "event_date": "2025-11-05T18:00:00Z", "url": "https://example.com/1.srt"}]
+    assert calls["saved"] == [{"max_start_date_time": "2025-11-05T18:00:00Z", "max_created_on": "2025-10-01T12:00:00Z"}]
+
+
+def test_sync_without_a_created_on_mark(sync):
+    calls = sync({"max_start_date_time": "2025-03-01T18:00:00Z"})
+
+    assert calls["harvest"] == [("changed", date(2024, 12, 31), None)]
+
+
+@pytest.mark.parametrize("state, args", [
+    (None, []),
+    ({"max_start_date_time": "2025-03-01T18:00:00Z", "max_created_on": "2025-10-01T12:00:00Z"}, ["--full"]),
+])
+def test_full_backfill(sync, state, args):
+    calls = sync(state, *args)
+
+    assert calls["harvest"] == [("full", pab_meetings.START_DATE)]
+    assert len(calls["saved"]) == 1
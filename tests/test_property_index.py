@@ -0,0 +1,72 @@
+"""Tests for the parcel and address index."""
+import pytest
+
+import property_index
+from property_index import normalize_address, parcel_history, related_by_address
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('2220 Fortune Road', '2220 FORTUNE RD'),
+    ('211 E. Dakin Avenue', '211 E DAKIN AVE'),
+    ('or about 1000 North John Young Parkway', '1000 N JOHN YOUNG PKWY'),
+    ('8 Broadway', '8 BROADWAY'),
+    ('211 E', None),
+    ('174 W.', None),
+    ('12201 South', None),
+    ('12201 S NW', None),
+    ('Fortune Road', None),
+    ('', None),
+    (None, None),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+def notice(notice_id, pub_epoch, parcel_id=None, property_address=None):
+    return {'id': notice_id, 'pub_epoch': pub_epoch, 'parcel_id': parcel_id, 'property_address': property_address}
+
+
+PARCEL = '19-25-29-00U0-0120-0000'
+
+
+def test_files_notices_under_parcels_and_addresses():
+    index = property_index.empty_index()
+
+    property_index.update(index, 'pab', [
+        notice(3, 300, PARCEL, '2220 Fortune Road'),
+        notice(1, 100, f'{PARCEL}.', None),
+        notice(2, 200, None, '2220 Fortune Rd'),
+        notice(4, 400, None, '211 E'),
+    ])
+
+    assert index['parcels'] == {PARCEL: ['1', '3']}
+    assert index['addresses'] == {'2220 FORTUNE RD': ['2', '3']}
+    assert set(index['notices']) == {'1', '2', '3'}
+    assert [notice_id for notice_id, _ in parcel_history(index, PARCEL)] == ['1', '3']
+    assert [notice_id for notice_id, _ in related_by_address(index, PARCEL)] == ['2']
+
+
+def test_updated_notices_move_between_keys():
+    index = property_index.empty_index()
+    property_index.update(index, 'pab', [notice(1, 100, PARCEL, '2220 Fortune Road')])
+
+    assert property_index.update(index, 'pab', [notice(1, 100, None, '8 Broadway')]) == 1
+    assert index['parcels'] == {}
+    assert index['addresses'] == {'8 BROADWAY': ['1']}
+
+    assert property_index.update(index, 'pab', [notice(1, 100, None, '8 Broadway')]) == 0
+    assert property_index.update(index, 'pab', [notice(1, 100)]) == 1
+    assert index['notices'] == {} and index['addresses'] == {}
+
+
+def test_index_round_trips_and_is_dropped_when_the_code_changes(tmp_path, monkeypatch):
+    index_path = tmp_path / 'property_index.json'
+    index = property_index.empty_index()
+    property_index.update(index, 'pab', [notice(1, 100, PARCEL)])
+    property_index.save_index(index, index_path)
+
+    assert property_index.load_index(index_path) == index
+
+    monkeypatch.setattr(property_index, 'CODE_VERSION', 'other')
+    assert property_index.load_index(index_path) is None
+    assert property_index.load_index(tmp_path / 'missing.json') is None
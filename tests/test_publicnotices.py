@@ -0,0 +1,94 @@
+"""Tests for the paginated Florida Public Notices fetch."""
+import pytest
+
+import http_client
+from publicnotices import extract_raw_notices, iter_kissimmee_notices
+
+
+class FakeResponse:
+    status_code = 200
+    content = b'{}'
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """A newest-first feed of notices 1000, 999, ... 1; records the offsets requested."""
+    feed = {'ids': list(range(1000, 0, -1)), 'offsets': []}
+
+    def post(url, headers=None, json=None):
+        feed['offsets'].append(json['offset'])
+        page = feed['ids'][json['offset']:json['offset'] + json['limit']]
+        return FakeResponse({'_embedded': {'notices': [{'id': notice_id} for notice_id in page]}})
+
+    monkeypatch.setattr(http_client, 'post', post)
+    return feed
+
+
+def ids(notices):
+    return [notice['id'] for notice in notices]
+
+
+def test_stops_after_a_page_that_is_entirely_known(feed):
+    known = {str(notice_id) for notice_id in range(1, 991)}
+
+    notices = list(iter_kissimmee_notices(known, page_size=10))
+
+    assert ids(notices) == list(range(1000, 980, -1))
+    assert feed['offsets'] == [0, 10]
+
+
+def test_yields_a_partly_known_page_and_fetches_the_next(feed):
+    known = {str(notice_id) for notice_id in range(1, 996)}
+
+    notices = list(iter_kissimmee_notices(known, page_size=10))
+
+    # The first page is partly known, so all of it is yielded and the next one checked
+    assert ids(notices) == list(range(1000, 980, -1))
+    assert feed['offsets'] == [0, 10]
+
+
+def test_stops_at_max_notices(feed):
+    notices = list(iter_kissimmee_notices(page_size=10, max_notices=25))
+
+    assert ids(notices) == list(range(1000, 975, -1))
+    assert feed['offsets'] == [0, 10, 20]
+
+
+def test_stops_after_a_short_last_page(feed):
+    feed['ids'] = list(range(25, 0, -1))
+
+    notices = list(iter_kissimmee_notices(page_size=10))
+
+    assert ids(notices) == list(range(25, 0, -1))
+    assert feed['offsets'] == [0, 10, 20]
+
+
+def test_stops_at_an_empty_page(feed):
+    feed['ids'] = list(range(20, 0, -1))
+
+    assert len(list(iter_kissimmee_notices(page_size=10))) == 20
+    assert feed['offsets'] == [0, 10, 20]
+
+
+def test_without_known_ids_a_page_is_never_all_known(feed):
+    feed['ids'] = list(range(30, 0, -1))
+
+    assert len(list(iter_kissimmee_notices(set(), page_size=10))) == 30
+
+
+@pytest.mark.parametrize('data', [
+    {'_embedded': {'notices': [{'id': 1}]}},
+    {'results': [{'id': 1}]},
+    [{'id': 1}],
+])
+def test_extract_raw_notices(data):
+    assert extract_raw_notices(data) == [{'id': 1}]
@@ -0,0 +1,105 @@
+"""Tests for the static search index."""
+import itertools
+import json
+import os
+
+from search_index import DOCS_PER_CHUNK, index_terms, snippet, write_search_index
+
+
+def document(key, date, text, kind='notice'):
+    return {
+        'kind': kind, 'key': key, 'title': f'Notice {key}', 'url': f'/notices/{key}',
+        'date': date, 'snippet': text, 'text': text,
+    }
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def postings(search_dir, term):
+    """Return the decoded document IDs of `term`."""
+    shard = read_json(os.path.join(search_dir, 'terms', f'{term[:2]}.json'))
+    return list(itertools.accumulate(shard.get(term, [])))
+
+
+def rows(search_dir):
+    """Return every document row, by ID."""
+    meta = read_json(os.path.join(search_dir, 'meta.json'))
+    return [
+        row
+        for chunk in range(-(-meta['doc_count'] // DOCS_PER_CHUNK))
+        for row in read_json(os.path.join(search_dir, 'docs', f'{chunk}.json'))
+    ]
+
+
+def test_index_terms_drops_stopwords_and_single_characters():
+    assert index_terms('The ZMA-25-0009 rezoning of a parcel, at 2220 Fortune Rd.') == {
+        'zma', '25', '0009', 'rezoning', 'parcel', '2220', 'fortune', 'rd',
+    }
+
+
+def test_snippet_collapses_whitespace_and_cuts_at_a_word():
+    assert snippet('a  b\n c') == 'a b c'
+    assert snippet('alpha beta gamma', length=12) == 'alpha beta…'
+
+
+def test_documents_are_numbered_in_date_order(tmp_path):
+    write_search_index([
+        document('2', '2025-11-02', 'rezoning on fortune road'),
+        document('1', '2025-11-01', 'annexation of fortune road'),
+    ], str(tmp_path))
+
+    assert [row[2] for row in rows(tmp_path)] == ['/notices/1', '/notices/2']
+    assert postings(tmp_path, 'fortune') == [0, 1]
+    assert postings(tmp_path, 'rezoning') == [1]
+    assert read_json(tmp_path / 'ids.json') == {'next_id': 2, 'ids': {'notice:1': 0, 'notice:2': 1}}
+
+
+def test_ids_are_stable_when_older_documents_are_added(tmp_path):
+    write_search_index([document('2', '2025-11-02', 'rezoning')], str(tmp_path))
+
+    write_search_index([
+        document('1', '2025-10-01', 'backfilled rezoning'),
+        document('2', '2025-11-02', 'rezoning'),
+    ], str(tmp_path))
+
+    assert read_json(tmp_path / 'ids.json')['ids'] == {'notice:1': 1, 'notice:2': 0}
+    assert postings(tmp_path, 'rezoning') == [0, 1]
+    assert postings(tmp_path, 'backfilled') == [1]
+
+
+def test_ranks_order_documents_by_date_whatever_their_ids(tmp_path):
+    write_search_index([document('3', '2025-11-03', 'three'), document('1', '2025-11-01', 'one')], str(tmp_path))
+
+    write_search_index([
+        document('1', '2025-11-01', 'one'),
+        document('2', '2025-11-02', 'backfilled'),
+        document('3', '2025-11-03', 'three'),
+    ], str(tmp_path))
+
+    # IDs 0 and 1 were taken by 1 and 3; the backfilled notice got ID 2 but sits between them by date
+    assert read_json(tmp_path / 'ranks.json') == [0, 2, 1]
+
+
+def test_removed_documents_leave_a_gap_that_is_not_reused(tmp_path):
+    write_search_index([document('1', '2025-11-01', 'one'), document('2', '2025-11-02', 'two')], str(tmp_path))
+
+    write_search_index([document('2', '2025-11-02', 'two'), document('3', '2025-11-03', 'three')], str(tmp_path))
+
+    assert rows(tmp_path)[0] is None
+    assert [row[2] for row in rows(tmp_path)[1:]] == ['/notices/2', '/notices/3']
+    assert read_json(tmp_path / 'meta.json')['doc_count'] == 3
+    assert read_json(tmp_path / 'ranks.json') == [None, 0, 1]
+    assert not os.path.exists(tmp_path / 'terms' / 'on.json')
+
+
+def test_unchanged_index_is_not_rewritten(tmp_path):
+    documents = [document(str(n), f'2025-11-{n:02d}', f'notice number {n}') for n in range(1, 6)]
+    write_search_index(documents, str(tmp_path))
+    mtimes = {path: os.stat(path).st_mtime_ns for path in tmp_path.rglob('*.json')}
+
+    write_search_index(documents, str(tmp_path))
+
+    assert {path: os.stat(path).st_mtime_ns for path in tmp_path.rglob('*.json')} == mtimes
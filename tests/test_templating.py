@@ -0,0 +1,67 @@
+"""Tests for the precompiled page templates."""
+import io
+import os
+
+import pytest
+
+from templating import Template, load_template
+
+
+SOURCE = (
+    '<title>{{TITLE}}</title>\n'
+    '<h1>{{TITLE}}</h1>\n'
+    '<main><!-- NOTICES_PLACEHOLDER --></main>\n'
+    '<footer><!-- UPDATED_PLACEHOLDER --></footer>\n'
+)
+
+
+def test_fills_comment_and_brace_slots():
+    page = Template(SOURCE).render({'TITLE': 'PAB', 'NOTICES': '<p>1</p>', 'UPDATED': 'today'})
+
+    assert page == '<title>PAB</title>\n<h1>PAB</h1>\n<main><p>1</p></main>\n<footer>today</footer>\n'
+
+
+def test_iterable_values_are_written_piece_by_piece():
+    page = Template(SOURCE).render({'TITLE': iter(['P', 'AB']), 'NOTICES': (f'<p>{n}</p>' for n in range(3))})
+
+    # A generator in a repeated slot is joined once and used for every occurrence
+    assert '<title>PAB</title>\n<h1>PAB</h1>' in page
+    assert '<main><p>0</p><p>1</p><p>2</p></main>' in page
+
+
+def test_render_and_render_to_give_the_same_output():
+    template = Template(SOURCE)
+    f = io.StringIO()
+
+    template.render_to(f, {'TITLE': 'PAB', 'NOTICES': iter(['<p>1</p>', '<p>2</p>'])})
+
+    assert f.getvalue() == template.render({'TITLE': 'PAB', 'NOTICES': ['<p>1</p>', '<p>2</p>']})
+
+
+def test_missing_slots_keep_their_placeholder_and_unknown_values_are_ignored():
+    page = Template(SOURCE).render({'TITLE': 'PAB', 'SIDEBAR': 'unused'})
+
+    assert '<main><!-- NOTICES_PLACEHOLDER --></main>' in page
+    assert '<footer><!-- UPDATED_PLACEHOLDER --></footer>' in page
+    assert 'unused' not in page
+
+
+@pytest.mark.parametrize('source', ['', 'no slots here', '{{lowercase}} <!-- NOTICES -->'])
+def test_text_without_slots_is_returned_unchanged(source):
+    assert Template(source).render({'NOTICES': 'x', 'lowercase': 'x'}) == source
+
+
+def test_load_template_reloads_when_the_file_changes(tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text('<h1>{{TITLE}}</h1>', encoding='utf-8')
+
+    first = load_template(path)
+    assert load_template(str(path)) is first
+
+    path.write_text('<h2>{{TITLE}}</h2>', encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = load_template(path)
+    assert second is not first
+    assert second.render({'TITLE': 'PAB'}) == '<h2>PAB</h2>'
@@ -0,0 +1,109 @@
+"""Tests for the transcript inverted index."""
+import json
+import os
+
+import pytest
+
+import transcript_index
+from transcript_index import TranscriptIndex, build_index
+
+
+FIRST_MEETING = """1
+00:00:01,000 --> 00:00:03,000
+Good evening, welcome to the Planning Advisory Board.
+
+2
+00:00:04,500 --> 00:00:07,000
+Our first item is the rezoning on Fortune
+
+3
+00:00:07,000 --> 00:00:09,000
+Road near the lake. Fortune Road is busy.
+
+4
+00:01:00,000 --> 00:01:03,000
+It cost a fortune.
+
+5
+00:01:05,000 --> 00:01:08,000
+Fortune Road again.
+"""
+
+SECOND_MEETING = """1
+00:00:02,000 --> 00:00:04,000
+Item two is on Fortune
+
+2
+00:00:04,000 --> 00:00:06,000
+Lakes Boulevard.
+"""
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "pab_meetings_media.json").write_text(json.dumps({"101": {"videoUrl": "https://example.com/101"}}))
+    monkeypatch.setattr(transcript_index, "DATA_DIR", data_dir)
+
+    transcripts_dir = tmp_path / "transcripts"
+    transcripts_dir.mkdir()
+    (transcripts_dir / "2025-06-04-101.srt").write_text(FIRST_MEETING, encoding="utf-8")
+    (transcripts_dir / "2025-06-18.srt").write_text(SECOND_MEETING, encoding="utf-8")
+    (transcripts_dir / "notes.md").write_text("not a transcript")
+
+    index_dir = tmp_path / "index"
+    assert build_index(transcripts_dir, index_dir)
+    assert not build_index(transcripts_dir, index_dir)
+    return index_dir
+
+
+def test_single_term_hits(index_dir):
+    hits = TranscriptIndex(index_dir).search("Rezoning")
+
+    assert len(hits) == 1
+    hit = hits[0]
+    assert (hit["event_id"], hit["date"], hit["start_ms"], hit["timestamp"]) == (101, "2025-06-04", 4500, "0:00:04")
+    assert hit["text"] == "Our first item is the rezoning on Fortune"
+    assert hit["link"] == "https://example.com/101#t=4"
+
+
+def test_phrase_split_across_two_cues(index_dir):
+    hits = TranscriptIndex(index_dir).search("fortune lakes")
+
+    assert [(hit["date"], hit["start_ms"], hit["link"]) for hit in hits] == [("2025-06-18", 2000, None)]
+
+
+def test_phrase_is_reported_once_at_the_cue_where_it_starts(index_dir):
+    hits = TranscriptIndex(index_dir).search("fortune road")
+
+    # Cue 2 starts a match that ends in cue 3, and cue 3 has its own. Cue 4 ends
+    # in "fortune" too, but the match after it lies wholly in cue 5: cue 5's hit.
+    assert [hit["start_ms"] for hit in hits] == [4500, 7000, 65000]
+
+
+def test_phrase_does_not_span_meetings(index_dir):
+    assert TranscriptIndex(index_dir).search("fortune road again item two") == []
+    assert TranscriptIndex(index_dir).search("again item") == []
+
+
+def test_unknown_and_empty_queries(index_dir):
+    assert TranscriptIndex(index_dir).search("annexation") == []
+    assert TranscriptIndex(index_dir).search("...") == []
+
+
+def test_postings_and_times_round_trip(index_dir):
+    index = TranscriptIndex(index_dir)
+
+    assert list(index.times) == [1000, 4500, 7000, 60000, 65000, 2000, 4000]
+    assert list(index.postings("fortune")) == [1, 2, 3, 4, 5]
+    assert list(index.postings("lakes")) == [6]
+    assert list(index.postings("annexation")) == []
+    assert os.path.getsize(index_dir / "postings.bin") == 4 * sum(count for _, count in index.terms.values())
+    assert [index.meeting_of(cue_id) for cue_id in (4, 5)] == [(0, 4), (1, 0)]
+    assert index.cue_text(6) == "Lakes Boulevard."
+
+
+def test_missing_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TranscriptIndex(tmp_path)